@@ -1,26 +1,127 @@
 import requests
 import json
 import os
+import random
+import threading
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import time
 
+import numpy as np
+
+
+# Tekrar denemeye değer HTTP durum kodları
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class CircuitBreaker:
+    """
+    Backend sağlıksızken istekleri hızlıca reddeden devre kesici
+
+    Ardışık hata sayısı eşiği aşınca devre açılır (OPEN) ve reset süresi boyunca
+    istek gönderilmez. Süre dolunca tek bir deneme isteğine izin verilir (HALF_OPEN);
+    başarılı olursa devre kapanır, başarısız olursa tekrar açılır.
+    """
+
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Args:
+            failure_threshold: Devreyi açacak ardışık hata sayısı
+            reset_timeout: Açık devrenin deneme isteğine izin vermeden önce bekleyeceği süre (saniye)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.open_count = 0
+        self.lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """İstek gönderilebilir mi?"""
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self.trial_in_flight = False
+
+            # HALF_OPEN: aynı anda sadece tek deneme isteği
+            if self.trial_in_flight:
+                return False
+            self.trial_in_flight = True
+            return True
+
+    def record_success(self):
+        """Başarılı yanıtı kaydet"""
+        with self.lock:
+            if self.state != self.CLOSED:
+                print("🟢 Devre kapandı, backend tekrar sağlıklı")
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        """Başarısız yanıtı kaydet"""
+        with self.lock:
+            self.consecutive_failures += 1
+            self.trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.open_count += 1
+                    print(f"🔴 Devre açıldı ({self.consecutive_failures} ardışık hata), "
+                          f"{self.reset_timeout}s boyunca istekler reddedilecek")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
 
 class FraudDetectionAPIClient:
     """
     Fraud Detection API'sine istek atan client sınıfı
+
+    Idempotent çağrılar (GET, tahmin, karşılaştırma) geçici hatalarda jitter'lı
+    üstel backoff ile tekrar denenir; tahmin istekleri gecikme yüzdeliğini aşarsa
+    yedek (hedged) istek gönderilir. Model eğitimi idempotent olmadığından tek denemedir.
     """
 
-    def __init__(self, base_url: str = "http://localhost:5000", timeout: int = 300):
+    def __init__(self, base_url: str = "http://localhost:5000", timeout: int = 300,
+                 connect_timeout: float = 5.0,
+                 max_retries: int = 3,
+                 backoff_base: float = 0.5,
+                 backoff_max: float = 30.0,
+                 hedge_percentile: float = 95.0,
+                 hedge_min_samples: int = 20,
+                 circuit_failure_threshold: int = 5,
+                 circuit_reset_timeout: float = 30.0):
         """
         API Client'ı başlat
 
         Args:
             base_url: API'nin base URL'i
-            timeout: İstek timeout süresi (saniye)
+            timeout: İstek (okuma) timeout süresi (saniye)
+            connect_timeout: Bağlantı kurma timeout süresi (saniye)
+            max_retries: Idempotent çağrılar için maksimum tekrar sayısı
+            backoff_base: Backoff başlangıç süresi (saniye)
+            backoff_max: Backoff üst sınırı (saniye)
+            hedge_percentile: Bu gecikme yüzdeliği aşılınca yedek tahmin isteği gönderilir
+            hedge_min_samples: Hedging'in devreye girmesi için gereken minimum gecikme örneği
+            circuit_failure_threshold: Devreyi açacak ardışık hata sayısı
+            circuit_reset_timeout: Devrenin açık kalacağı süre (saniye)
         """
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
+        self.connect_timeout = connect_timeout
         self.session = requests.Session()
 
         # Default headers
@@ -29,9 +130,29 @@ class FraudDetectionAPIClient:
             'Accept': 'application/json'
         })
 
+        # Retry ayarları
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        # Hedging ayarları
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.predict_latencies = deque(maxlen=200)
+        # Yedek istek havuzu ilk hedging'de oluşturulur; close() veya client toplanınca kapatılır
+        self.hedge_executor = None
+        self._executor_lock = threading.Lock()
+
+        self.circuit_breaker = CircuitBreaker(circuit_failure_threshold, circuit_reset_timeout)
+
+        # İstatistikler
+        self.stats = {"requests": 0, "retries": 0, "hedged": 0, "hedge_wins": 0, "circuit_rejections": 0}
+        self.stats_lock = threading.Lock()
+
         print(f"API Client başlatıldı: {self.base_url}")
 
-    def _make_request(self, method: str, endpoint: str, data: Dict = None, params: Dict = None) -> Dict:
+    def _make_request(self, method: str, endpoint: str, data: Dict = None, params: Dict = None,
+                      idempotent: Optional[bool] = None, hedge: bool = False) -> Dict:
         """
         API'ye istek gönder
 
@@ -40,41 +161,197 @@ class FraudDetectionAPIClient:
             endpoint: API endpoint
             data: POST data
             params: Query parameters
+            idempotent: Tekrar denenebilir mi? (None ise sadece GET)
+            hedge: Yavaş yanıtlarda yedek istek gönderilsin mi?
 
         Returns:
             API response dict
         """
         url = f"{self.base_url}/api/model{endpoint}"
+        if method.upper() not in ('GET', 'POST'):
+            raise ValueError(f"Desteklenmeyen HTTP method: {method}")
+        if idempotent is None:
+            idempotent = method.upper() == 'GET'
+
+        attempts = self.max_retries + 1 if idempotent else 1
+        result = None
+
+        for attempt in range(attempts):
+            if not self.circuit_breaker.allow_request():
+                self._bump("circuit_rejections")
+                print(f"⛔ Devre açık, istek gönderilmedi: {url}")
+                return {"error": "Circuit open", "status_code": 503, "circuit_open": True}
+
+            if attempt > 0:
+                self._bump("retries")
 
-        try:
             print(f"🌐 {method} isteği gönderiliyor: {url}")
+            if hedge:
+                result, retryable, retry_after = self._send_hedged(method, url, data, params)
+            else:
+                result, retryable, retry_after = self._send_once(method, url, data, params)
+
+            if not retryable or attempt == attempts - 1:
+                break
 
+            delay = self._backoff_delay(attempt, retry_after)
+            print(f"🔁 Tekrar denenecek ({attempt + 1}/{self.max_retries}), {delay:.1f}s bekleniyor...")
+            time.sleep(delay)
+
+        return result
+
+    def _send_once(self, method: str, url: str, data: Dict = None, params: Dict = None,
+                   track_latency: bool = False) -> Tuple[Dict, bool, Optional[float]]:
+        """
+        Tek bir HTTP isteği gönder
+
+        Args:
+            track_latency: Başarılı yanıt süresi hedging eşiği için kaydedilsin mi?
+
+        Returns:
+            (sonuç dict, tekrar denenebilir mi, Retry-After saniye)
+        """
+        self._bump("requests")
+        timeout = (self.connect_timeout, self.timeout)
+        start = time.monotonic()
+        # Devre kesiciye her istekte tam bir sonuç bildirilmeli (HALF_OPEN denemesi açık kalmasın)
+        recorded = False
+
+        try:
             if method.upper() == 'GET':
-                response = self.session.get(url, params=params, timeout=self.timeout)
-            elif method.upper() == 'POST':
-                response = self.session.post(url, json=data, params=params, timeout=self.timeout)
+                response = self.session.get(url, params=params, timeout=timeout)
             else:
-                raise ValueError(f"Desteklenmeyen HTTP method: {method}")
+                response = self.session.post(url, json=data, params=params, timeout=timeout)
 
             # Response kontrolü
             if response.status_code == 200:
+                self.circuit_breaker.record_success()
+                recorded = True
+                if track_latency:
+                    self.predict_latencies.append(time.monotonic() - start)
                 result = response.json()
                 print(f"✅ İstek başarılı: {response.status_code}")
-                return result
+                return result, False, None
+
+            print(f"❌ İstek başarısız: {response.status_code}")
+            print(f"Hata: {response.text}")
+            if response.status_code >= 500:
+                self.circuit_breaker.record_failure()
             else:
-                print(f"❌ İstek başarısız: {response.status_code}")
-                print(f"Hata: {response.text}")
-                return {"error": response.text, "status_code": response.status_code}
+                self.circuit_breaker.record_success()
+            recorded = True
+
+            retry_after = None
+            header = response.headers.get('Retry-After')
+            if header and header.isdigit():
+                retry_after = float(header)
+
+            return ({"error": response.text, "status_code": response.status_code},
+                    response.status_code in RETRYABLE_STATUS_CODES, retry_after)
 
+        except requests.exceptions.ConnectTimeout:
+            self.circuit_breaker.record_failure()
+            print(f"⏰ Bağlantı timeout oldu ({self.connect_timeout}s)")
+            return {"error": "Connect timeout", "status_code": 408}, True, None
         except requests.exceptions.Timeout:
+            self.circuit_breaker.record_failure()
             print(f"⏰ İstek timeout oldu ({self.timeout}s)")
-            return {"error": "Request timeout", "status_code": 408}
+            return {"error": "Request timeout", "status_code": 408}, True, None
         except requests.exceptions.ConnectionError:
+            self.circuit_breaker.record_failure()
             print(f"🔌 Bağlantı hatası: {url}")
-            return {"error": "Connection error", "status_code": 503}
+            return {"error": "Connection error", "status_code": 503}, True, None
         except Exception as e:
+            # ChunkedEncodingError, bozuk JSON vb. - sonuç henüz bildirilmediyse hata say
+            if not recorded:
+                self.circuit_breaker.record_failure()
             print(f"🚨 Beklenmeyen hata: {str(e)}")
-            return {"error": str(e), "status_code": 500}
+            return {"error": str(e), "status_code": 500}, False, None
+
+    def _send_hedged(self, method: str, url: str, data: Dict = None,
+                     params: Dict = None) -> Tuple[Dict, bool, Optional[float]]:
+        """
+        Gecikme yüzdeliğini aşan isteğe yedek istek ekle, ilk başarılı yanıtı kullan
+
+        Yeterli gecikme örneği yoksa normal istek gönderilir.
+        """
+        threshold = self._hedge_threshold()
+        if threshold is None:
+            return self._send_once(method, url, data, params, track_latency=True)
+
+        executor = self._get_hedge_executor()
+        primary = executor.submit(self._send_once, method, url, data, params, True)
+        done, _ = wait([primary], timeout=threshold)
+        if done:
+            return primary.result()
+
+        self._bump("hedged")
+        print(f"🪃 Yanıt {threshold:.2f}s'yi aştı, yedek istek gönderiliyor")
+        backup = executor.submit(self._send_once, method, url, data, params, True)
+        pending = {primary, backup}
+        result = None
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if "error" not in result[0]:
+                    if future is backup:
+                        self._bump("hedge_wins")
+                    # Kalan istek arka planda tamamlanır, sonucu yok sayılır
+                    return result
+
+        return result
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        """Yedek istek havuzu (ilk kullanımda oluşturulur)"""
+        with self._executor_lock:
+            if self.hedge_executor is None:
+                self.hedge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hedge")
+                # close() çağrılmadan bırakılan client'ların thread'leri de kapanır
+                weakref.finalize(self, self.hedge_executor.shutdown, wait=False)
+            return self.hedge_executor
+
+    def close(self):
+        """Yedek istek havuzunu ve HTTP oturumunu kapat"""
+        with self._executor_lock:
+            if self.hedge_executor is not None:
+                self.hedge_executor.shutdown(wait=False)
+                self.hedge_executor = None
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _hedge_threshold(self) -> Optional[float]:
+        """Hedging için gecikme eşiği (yeterli örnek yoksa None)"""
+        if len(self.predict_latencies) < self.hedge_min_samples:
+            return None
+        return float(np.percentile(list(self.predict_latencies), self.hedge_percentile))
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Full jitter'lı üstel backoff süresi"""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max))
+        return delay
+
+    def _bump(self, key: str):
+        """İstatistik sayacını artır"""
+        with self.stats_lock:
+            self.stats[key] += 1
+
+    def get_resilience_stats(self) -> Dict:
+        """Retry, hedging ve devre kesici istatistikleri"""
+        with self.stats_lock:
+            stats = dict(self.stats)
+        stats["circuit_state"] = self.circuit_breaker.state
+        stats["circuit_open_count"] = self.circuit_breaker.open_count
+        stats["hedge_threshold_seconds"] = self._hedge_threshold()
+        return stats
 
     # Model Eğitimi Metodları
     def train_lightgbm(self, config: Dict = None) -> Dict:
@@ -107,21 +384,100 @@ class FraudDetectionAPIClient:
 
     def compare_models(self, model_names: List[str]) -> Dict:
         """Modelleri karşılaştır"""
-        return self._make_request("POST", "/compare", data=model_names)
+        return self._make_request("POST", "/compare", data=model_names, idempotent=True)
 
     # Model Aktivasyonu
     def activate_model_version(self, model_name: str, version: str) -> Dict:
         """Model versiyonunu aktifleştir"""
-        return self._make_request("POST", f"/{model_name}/versions/{version}/activate")
+        return self._make_request("POST", f"/{model_name}/versions/{version}/activate", idempotent=True)
 
     # Tahmin
     def predict(self, transaction_data: Dict) -> Dict:
         """Genel tahmin yap"""
-        return self._make_request("POST", "/predict", data=transaction_data)
+        return self._make_request("POST", "/predict", data=transaction_data, idempotent=True, hedge=True)
 
     def predict_with_model(self, model_name: str, transaction_data: Dict) -> Dict:
         """Belirli bir modelle tahmin yap"""
-        return self._make_request("POST", f"/{model_name}/predict", data=transaction_data)
+        return self._make_request("POST", f"/{model_name}/predict", data=transaction_data,
+                                  idempotent=True, hedge=True)
+
+    def predict_many(self, transactions: List[Dict], chunk_size: int = 100,
+                     model_name: Optional[str] = None) -> Dict:
+        """
+        Çok sayıda transaction'ı toplu tahmin endpoint'i ile tahmin et
+
+        Transaction'lar chunk'lar halinde tek istekte gönderilir. Sunucu toplu
+        endpoint'i desteklemiyorsa (404/405) o chunk tek tek tahmin edilir.
+
+        Args:
+            transactions: Transaction listesi
+            chunk_size: Tek istekte gönderilecek transaction sayısı
+            model_name: Model adı (None ise varsayılan model)
+
+        Returns:
+            {"results": [...girdi sırasıyla...], "succeeded", "failed", "failed_indices", "chunks"}
+        """
+        results = [None] * len(transactions)
+        chunk_size = max(1, chunk_size)
+        chunk_count = 0
+        bulk_supported = True
+
+        for start in range(0, len(transactions), chunk_size):
+            chunk = transactions[start:start + chunk_size]
+            chunk_count += 1
+
+            response = None
+            if bulk_supported:
+                payload = {"transactions": chunk}
+                if model_name:
+                    payload["modelType"] = model_name
+                response = self._make_request("POST", "/predict/batch", data=payload, idempotent=True)
+
+                if response.get("status_code") in (404, 405):
+                    print("⚠️ Toplu tahmin endpoint'i yok, tek tek tahmine geçiliyor")
+                    bulk_supported = False
+
+            if not bulk_supported:
+                for offset, transaction in enumerate(chunk):
+                    if model_name:
+                        result = self.predict_with_model(model_name, transaction)
+                    else:
+                        result = self.predict(transaction)
+                    results[start + offset] = result
+                continue
+
+            if "error" in response and "results" not in response:
+                # Chunk bütünüyle başarısız - her elemana aynı hatayı yaz
+                for offset in range(len(chunk)):
+                    results[start + offset] = {"error": response["error"],
+                                               "status_code": response.get("status_code")}
+                continue
+
+            for offset, item in enumerate(response.get("results", [])):
+                index = item.get("index", offset)
+                if 0 <= index < len(chunk):
+                    if item.get("success", True):
+                        results[start + index] = item
+                    else:
+                        results[start + index] = {"error": item.get("error", "Unknown error"),
+                                                  "status_code": item.get("status_code", 500)}
+
+            # Sunucu bazı elemanları döndürmediyse eksik olarak işaretle
+            for offset in range(len(chunk)):
+                if results[start + offset] is None:
+                    results[start + offset] = {"error": "Missing result in batch response", "status_code": 500}
+
+        failed_indices = [i for i, r in enumerate(results) if "error" in r]
+        print(f"📦 Toplu tahmin: {len(transactions) - len(failed_indices)}/{len(transactions)} başarılı "
+              f"({chunk_count} chunk)")
+
+        return {
+            "results": results,
+            "succeeded": len(transactions) - len(failed_indices),
+            "failed": len(failed_indices),
+            "failed_indices": failed_indices,
+            "chunks": chunk_count
+        }
 
     # Yardımcı Metodlar
     def health_check(self) -> bool:
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Asenkron Fraud Detection API Client
+Tek process içinden yüzlerce isteği aynı anda yürütmek için asyncio tabanlı client
+"""
+
+import asyncio
+import codecs
+import json
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+try:
+    import aiohttp
+
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    print("⚠️  aiohttp not available. AsyncFraudDetectionAPIClient will be disabled.")
+    AIOHTTP_AVAILABLE = False
+
+
+class JSONArrayStreamDecoder:
+    """
+    Parça parça gelen JSON yanıtını artımlı olarak çözen yardımcı sınıf
+
+    Üst seviye bir dizi (array) geldiğinde her eleman tamamlandığı anda döndürülür;
+    böylece büyük yanıtlar belleğe tek parça olarak alınmadan işlenebilir.
+    Üst seviye bir nesne gelirse yanıt sonunda tek seferde çözülür.
+    """
+
+    def __init__(self):
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ""
+        self.is_array = None
+        self.finished = False
+
+    def feed(self, chunk: bytes, final: bool = False) -> List[Any]:
+        """
+        Yeni bir byte parçası ekle ve tamamlanan elemanları döndür
+
+        Args:
+            chunk: Yanıttan okunan byte parçası
+            final: Son parça mı?
+
+        Returns:
+            Tamamlanan JSON elemanları
+        """
+        self.buffer += self.text_decoder.decode(chunk, final=final)
+        items = []
+
+        if self.is_array is None:
+            stripped = self.buffer.lstrip()
+            if not stripped:
+                return items
+            self.is_array = stripped[0] == '['
+            self.buffer = stripped[1:] if self.is_array else stripped
+
+        if not self.is_array:
+            # Nesne yanıtları tek parça halinde çözülür
+            if final and self.buffer.strip():
+                items.append(json.loads(self.buffer))
+                self.buffer = ""
+            return items
+
+        idx = 0
+        length = len(self.buffer)
+        while idx < length and not self.finished:
+            # Boşluk ve virgülleri atla
+            while idx < length and self.buffer[idx] in ' \t\r\n,':
+                idx += 1
+            if idx >= length:
+                break
+            if self.buffer[idx] == ']':
+                self.finished = True
+                idx += 1
+                break
+
+            try:
+                item, end = self.decoder.raw_decode(self.buffer, idx)
+            except json.JSONDecodeError:
+                # Eleman henüz tamamlanmadı, daha fazla veri bekle
+                break
+
+            # Buffer sonuna dayanan sayı/literal yarım gelmiş olabilir
+            if end >= length and not final and not isinstance(item, (dict, list, str)):
+                break
+
+            items.append(item)
+            idx = end
+
+        self.buffer = self.buffer[idx:]
+        return items
+
+
+class AsyncFraudDetectionAPIClient:
+    """
+    Fraud Detection API'sine asenkron istek atan client sınıfı
+
+    FraudDetectionAPIClient ile aynı metod yüzeyine sahiptir; metodlar
+    coroutine olarak çağrılır. Bağlantı havuzu ve eşzamanlılık sınırlıdır.
+
+    Örnek:
+        async with AsyncFraudDetectionAPIClient("http://localhost:5000") as client:
+            results = await client.predict_concurrently(transactions)
+    """
+
+    def __init__(self,
+                 base_url: str = "http://localhost:5000",
+                 timeout: float = 300,
+                 max_connections: int = 100,
+                 max_concurrency: int = 200,
+                 chunk_size: int = 64 * 1024,
+                 verbose: bool = False):
+        """
+        Async API Client'ı başlat
+
+        Args:
+            base_url: API'nin base URL'i
+            timeout: Varsayılan istek timeout süresi (saniye)
+            max_connections: Bağlantı havuzundaki maksimum TCP bağlantısı
+            max_concurrency: Aynı anda uçuşta olabilecek maksimum istek
+            chunk_size: Streaming okuma parça boyutu (byte)
+            verbose: Her istek için log yazdır
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("AsyncFraudDetectionAPIClient için aiohttp gerekli: pip install aiohttp")
+
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.chunk_size = chunk_size
+        self.verbose = verbose
+
+        # Session ve semaphore event loop içinde oluşturulur
+        self.session = None
+        self.semaphore = None
+
+        # İstatistikler
+        self.request_count = 0
+        self.error_count = 0
+        self.total_latency = 0.0
+
+        print(f"Async API Client başlatıldı: {self.base_url} "
+              f"(havuz: {max_connections}, eşzamanlılık: {max_concurrency})")
+
+    async def __aenter__(self):
+        await self._ensure_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _ensure_session(self):
+        """Session'ı çalışan event loop içinde tembel olarak oluştur"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections,
+                                             limit_per_host=self.max_connections)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers={
+                    'Content-Type': 'application/json',
+                    'Accept': 'application/json'
+                }
+            )
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def close(self):
+        """Bağlantı havuzunu kapat"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    def _build_timeout(self, timeout: Optional[float]):
+        """Çağrı bazında timeout nesnesi oluştur"""
+        return aiohttp.ClientTimeout(total=timeout if timeout is not None else self.timeout)
+
+    async def _make_request(self, method: str, endpoint: str, data: Any = None,
+                            params: Dict = None, timeout: Optional[float] = None) -> Dict:
+        """
+        API'ye asenkron istek gönder
+
+        Args:
+            method: HTTP method (GET, POST)
+            endpoint: API endpoint
+            data: POST data
+            params: Query parameters
+            timeout: Bu çağrıya özel timeout (saniye)
+
+        Returns:
+            API response dict
+        """
+        url = f"{self.base_url}/api/model{endpoint}"
+        await self._ensure_session()
+
+        if method.upper() not in ('GET', 'POST'):
+            raise ValueError(f"Desteklenmeyen HTTP method: {method}")
+
+        async with self.semaphore:
+            start = time.monotonic()
+            try:
+                if self.verbose:
+                    print(f"🌐 {method} isteği gönderiliyor: {url}")
+
+                async with self.session.request(method.upper(), url, json=data, params=params,
+                                                timeout=self._build_timeout(timeout)) as response:
+                    if response.status == 200:
+                        result = await self._decode_stream(response)
+                        if self.verbose:
+                            print(f"✅ İstek başarılı: {response.status}")
+                        return result
+
+                    text = await response.text()
+                    self.error_count += 1
+                    if self.verbose:
+                        print(f"❌ İstek başarısız: {response.status}")
+                    return {"error": text, "status_code": response.status}
+
+            except asyncio.TimeoutError:
+                self.error_count += 1
+                print(f"⏰ İstek timeout oldu ({timeout or self.timeout}s): {url}")
+                return {"error": "Request timeout", "status_code": 408}
+            except aiohttp.ClientConnectionError:
+                self.error_count += 1
+                print(f"🔌 Bağlantı hatası: {url}")
+                return {"error": "Connection error", "status_code": 503}
+            except Exception as e:
+                self.error_count += 1
+                print(f"🚨 Beklenmeyen hata: {str(e)}")
+                return {"error": str(e), "status_code": 500}
+            finally:
+                self.request_count += 1
+                self.total_latency += time.monotonic() - start
+
+    async def _decode_stream(self, response) -> Any:
+        """Yanıt gövdesini parça parça okuyup JSON olarak çöz"""
+        decoder = JSONArrayStreamDecoder()
+        items = []
+        async for chunk in response.content.iter_chunked(self.chunk_size):
+            items.extend(decoder.feed(chunk))
+        items.extend(decoder.feed(b"", final=True))
+
+        if decoder.is_array:
+            return items
+        return items[0] if items else {}
+
+    async def stream_request(self, method: str, endpoint: str, data: Any = None,
+                             params: Dict = None, timeout: Optional[float] = None) -> AsyncIterator[Any]:
+        """
+        Dizi döndüren endpoint'lerin elemanlarını geldikçe üret
+
+        Büyük yanıtlarda (ör. toplu tahmin) tüm gövdeyi beklemeden işlemeye başlamak için kullanılır.
+        """
+        url = f"{self.base_url}/api/model{endpoint}"
+        await self._ensure_session()
+
+        async with self.semaphore:
+            async with self.session.request(method.upper(), url, json=data, params=params,
+                                            timeout=self._build_timeout(timeout)) as response:
+                if response.status != 200:
+                    text = await response.text()
+                    yield {"error": text, "status_code": response.status}
+                    return
+
+                decoder = JSONArrayStreamDecoder()
+                async for chunk in response.content.iter_chunked(self.chunk_size):
+                    for item in decoder.feed(chunk):
+                        yield item
+                for item in decoder.feed(b"", final=True):
+                    yield item
+
+    # Model Eğitimi Metodları
+    async def train_lightgbm(self, config: Dict = None, timeout: Optional[float] = None) -> Dict:
+        """LightGBM modeli eğit"""
+        endpoint = "/train/lightgbm" if config is None else "/train/lightgbm-config"
+        return await self._make_request("POST", endpoint, data=config, timeout=timeout)
+
+    async def train_pca(self, config: Dict = None, timeout: Optional[float] = None) -> Dict:
+        """PCA modeli eğit"""
+        endpoint = "/train/pca" if config is None else "/train/pca-config"
+        return await self._make_request("POST", endpoint, data=config, timeout=timeout)
+
+    async def train_ensemble(self, config: Dict = None, timeout: Optional[float] = None) -> Dict:
+        """Ensemble modeli eğit"""
+        endpoint = "/train/ensemble" if config is None else "/train/ensemble-config"
+        return await self._make_request("POST", endpoint, data=config, timeout=timeout)
+
+    # Model Bilgileri
+    async def get_model_metrics(self, model_name: str, timeout: Optional[float] = None) -> Dict:
+        """Model metriklerini al"""
+        return await self._make_request("GET", f"/{model_name}/metrics", timeout=timeout)
+
+    async def get_performance_summary(self, model_name: str, timeout: Optional[float] = None) -> Dict:
+        """Model performans özetini al"""
+        return await self._make_request("GET", f"/{model_name}/performance-summary", timeout=timeout)
+
+    async def get_model_versions(self, model_name: str, timeout: Optional[float] = None) -> Dict:
+        """Model versiyonlarını al"""
+        return await self._make_request("GET", f"/{model_name}/versions", timeout=timeout)
+
+    async def compare_models(self, model_names: List[str], timeout: Optional[float] = None) -> Dict:
+        """Modelleri karşılaştır"""
+        return await self._make_request("POST", "/compare", data=model_names, timeout=timeout)
+
+    # Model Aktivasyonu
+    async def activate_model_version(self, model_name: str, version: str,
+                                     timeout: Optional[float] = None) -> Dict:
+        """Model versiyonunu aktifleştir"""
+        return await self._make_request("POST", f"/{model_name}/versions/{version}/activate", timeout=timeout)
+
+    # Tahmin
+    async def predict(self, transaction_data: Dict, timeout: Optional[float] = None) -> Dict:
+        """Genel tahmin yap"""
+        return await self._make_request("POST", "/predict", data=transaction_data, timeout=timeout)
+
+    async def predict_with_model(self, model_name: str, transaction_data: Dict,
+                                 timeout: Optional[float] = None) -> Dict:
+        """Belirli bir modelle tahmin yap"""
+        return await self._make_request("POST", f"/{model_name}/predict", data=transaction_data, timeout=timeout)
+
+    async def predict_concurrently(self, transactions: List[Dict], model_name: Optional[str] = None,
+                                   timeout: Optional[float] = None) -> List[Dict]:
+        """
+        Çok sayıda transaction'ı aynı anda tahmin et
+
+        Eşzamanlılık semaphore ile sınırlıdır; sonuçlar girdi sırasıyla döner.
+        """
+        if model_name:
+            tasks = [self.predict_with_model(model_name, tx, timeout=timeout) for tx in transactions]
+        else:
+            tasks = [self.predict(tx, timeout=timeout) for tx in transactions]
+        return await asyncio.gather(*tasks)
+
+    async def predict_many(self, transactions: List[Dict], chunk_size: int = 100,
+                           model_name: Optional[str] = None,
+                           timeout: Optional[float] = None) -> Dict:
+        """
+        Çok sayıda transaction'ı toplu tahmin endpoint'i ile tahmin et
+
+        Chunk'lar eşzamanlı gönderilir. Sunucu toplu endpoint'i desteklemiyorsa
+        (404/405) transaction'lar tek tek tahmin edilir.
+
+        Returns:
+            {"results": [...girdi sırasıyla...], "succeeded", "failed", "failed_indices", "chunks"}
+        """
+        chunk_size = max(1, chunk_size)
+        starts = list(range(0, len(transactions), chunk_size))
+
+        async def send_chunk(start: int) -> Dict:
+            payload = {"transactions": transactions[start:start + chunk_size]}
+            if model_name:
+                payload["modelType"] = model_name
+            return await self._make_request("POST", "/predict/batch", data=payload, timeout=timeout)
+
+        responses = await asyncio.gather(*[send_chunk(start) for start in starts])
+
+        if any(isinstance(r, dict) and r.get("status_code") in (404, 405) for r in responses):
+            print("⚠️ Toplu tahmin endpoint'i yok, tek tek tahmine geçiliyor")
+            results = await self.predict_concurrently(transactions, model_name=model_name, timeout=timeout)
+        else:
+            results = [None] * len(transactions)
+            for start, response in zip(starts, responses):
+                size = min(chunk_size, len(transactions) - start)
+                if "results" not in response:
+                    for offset in range(size):
+                        results[start + offset] = {"error": response.get("error", "Unknown error"),
+                                                   "status_code": response.get("status_code")}
+                    continue
+
+                for offset, item in enumerate(response["results"]):
+                    index = item.get("index", offset)
+                    if 0 <= index < size:
+                        if item.get("success", True):
+                            results[start + index] = item
+                        else:
+                            results[start + index] = {"error": item.get("error", "Unknown error"),
+                                                      "status_code": item.get("status_code", 500)}
+
+                for offset in range(size):
+                    if results[start + offset] is None:
+                        results[start + offset] = {"error": "Missing result in batch response", "status_code": 500}
+
+        failed_indices = [i for i, r in enumerate(results) if "error" in r]
+        return {
+            "results": results,
+            "succeeded": len(transactions) - len(failed_indices),
+            "failed": len(failed_indices),
+            "failed_indices": failed_indices,
+            "chunks": len(starts)
+        }
+
+    # Yardımcı Metodlar
+    async def health_check(self) -> bool:
+        """API'nin sağlıklı olup olmadığını kontrol et"""
+        await self._ensure_session()
+        try:
+            async with self.session.get(f"{self.base_url}/health", timeout=self._build_timeout(5)) as response:
+                return response.status == 200
+        except Exception:
+            return False
+
+    def get_stats(self) -> Dict:
+        """İstek istatistikleri"""
+        return {
+            "request_count": self.request_count,
+            "error_count": self.error_count,
+            "avg_latency_seconds": self.total_latency / self.request_count if self.request_count else 0.0
+        }
+
+
+# Test fonksiyonu
+async def _test_async_client():
+    """Async API Client'ı test et"""
+    async with AsyncFraudDetectionAPIClient("http://localhost:5000") as client:
+        if not await client.health_check():
+            print("❌ API'ye bağlanılamıyor!")
+            return
+
+        print("✅ API bağlantısı başarılı!")
+
+        metrics = await asyncio.gather(
+            client.get_model_metrics("LightGBM"),
+            client.get_model_metrics("PCA"),
+            client.get_model_metrics("Ensemble")
+        )
+        for name, result in zip(["LightGBM", "PCA", "Ensemble"], metrics):
+            status = "❌" if "error" in result else "✅"
+            print(f"{status} {name} metrikleri alındı")
+
+        print(f"📊 İstatistikler: {client.get_stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(_test_async_client())
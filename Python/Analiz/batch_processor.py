@@ -5,6 +5,7 @@ Batch Model Processor - Toplu model eğitimi ve analizi
 """
 
 import os
+import sys
 import json
 import time
 import pandas as pd
@@ -19,6 +20,14 @@ import warnings
 warnings.filterwarnings('ignore')
 
 from api_client import FraudDetectionAPIClient, ConfigurationGenerator
+from rate_limiter import AdaptiveRateLimiter
+
+# Ortak modüller (thread_budget) Python/ kökünde
+PYTHON_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PYTHON_ROOT not in sys.path:
+    sys.path.append(PYTHON_ROOT)
+
+from thread_budget import get_thread_budget, with_lightgbm_threads
 
 
 class BatchModelProcessor:
@@ -29,21 +38,34 @@ class BatchModelProcessor:
     def __init__(self, api_client: FraudDetectionAPIClient,
                  output_dir: str = "batch_results",
                  max_workers: int = 3,
-                 delay_between_requests: float = 5.0):
+                 delay_between_requests: float = 5.0,
+                 max_concurrency: int = 8):
         """
         Batch Processor'ı başlat
 
         Args:
             api_client: API client instance
             output_dir: Sonuçların kaydedileceği dizin
-            max_workers: Maksimum paralel worker sayısı
-            delay_between_requests: İstekler arası bekleme süresi (saniye)
+            max_workers: Başlangıç paralel worker sayısı (adaptif olarak artıp azalır)
+            delay_between_requests: Başlangıç istek aralığı (saniye), token bucket hızını belirler
+            max_concurrency: Adaptif kontrolcünün çıkabileceği maksimum eşzamanlılık
         """
         self.api_client = api_client
         self.output_dir = output_dir
         self.max_workers = max_workers
         self.delay = delay_between_requests
 
+        # Sabit bekleme yerine sunucu yüküne göre ayarlanan kontrolcü
+        self.rate_limiter = AdaptiveRateLimiter(
+            initial_concurrency=max_workers,
+            max_concurrency=max(max_workers, max_concurrency),
+            initial_rate=(1.0 / delay_between_requests) if delay_between_requests > 0 else None
+        )
+        self.pool_size = self.rate_limiter.max_concurrency
+
+        # Eşzamanlı eğitimler thread bütçesini paylaşır; her biri LightGBM'e kendi payını geçirir
+        self.threads_per_training = get_thread_budget().split(self.pool_size).total
+
         # Thread-safe queue for results
         self.results_queue = queue.Queue()
         self.lock = threading.Lock()
@@ -60,8 +82,8 @@ class BatchModelProcessor:
 
         print(f"🚀 Batch Model Processor başlatıldı")
         print(f"📁 Çıktı dizini: {output_dir}")
-        print(f"👥 Max workers: {max_workers}")
-        print(f"⏱️ İstek gecikme: {delay}s")
+        print(f"👥 Workers: {max_workers} (adaptif, max {self.pool_size}), eğitim başına {self.threads_per_training} thread")
+        print(f"⏱️ Başlangıç istek aralığı: {delay_between_requests}s")
 
     def run_lightgbm_experiments(self, experiment_configs: List[Dict]) -> Dict:
         """
@@ -102,7 +124,10 @@ class BatchModelProcessor:
         """
         print(f"\n🎯 {len(experiments)} karışık model deneyi başlatılıyor...")
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+        start_time = time.time()
+        self.rate_limiter.reset_stats()
+
+        with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
             future_to_experiment = {}
 
             for i, experiment in enumerate(experiments):
@@ -138,8 +163,12 @@ class BatchModelProcessor:
                         })
                         completed_count += 1
 
+        elapsed_time = time.time() - start_time
+
         # Sonuçları analiz et ve kaydet
         summary = self._create_batch_summary("mixed", self.batch_results, self.failed_experiments)
+        summary["total_time_seconds"] = elapsed_time
+        summary["experiments_per_minute"] = (len(experiments) / elapsed_time) * 60 if elapsed_time > 0 else 0
 
         return summary
 
@@ -148,8 +177,9 @@ class BatchModelProcessor:
         Toplu deneyim çalıştırma ana fonksiyonu
         """
         start_time = time.time()
+        self.rate_limiter.reset_stats()
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+        with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
             future_to_config = {}
 
             # Tüm deneyleri gönder
@@ -200,6 +230,7 @@ class BatchModelProcessor:
         print(f"⏱️ Toplam süre: {elapsed_time:.1f}s")
         print(f"🏆 Başarılı: {len(self.batch_results)}")
         print(f"❌ Başarısız: {len(self.failed_experiments)}")
+        print(f"📈 Son eşzamanlılık limiti: {summary['throughput_analysis']['final_concurrency_limit']}")
 
         return summary
 
@@ -216,15 +247,8 @@ class BatchModelProcessor:
         }
 
         try:
-            # API isteği gönder
-            if model_type == "lightgbm":
-                api_result = self.api_client.train_lightgbm(config)
-            elif model_type == "pca":
-                api_result = self.api_client.train_pca(config)
-            elif model_type == "ensemble":
-                api_result = self.api_client.train_ensemble(config)
-            else:
-                raise ValueError(f"Bilinmeyen model tipi: {model_type}")
+            # API isteği gönder (adaptif rate limiter üzerinden)
+            api_result = self._train_via_api(model_type, config)
 
             if api_result and "error" not in api_result:
                 result["training_result"] = api_result
@@ -240,9 +264,6 @@ class BatchModelProcessor:
             else:
                 result["error"] = api_result.get("error", "Bilinmeyen API hatası")
 
-            # Rate limiting için bekleme
-            time.sleep(self.delay)
-
         except Exception as e:
             result["error"] = str(e)
 
@@ -266,15 +287,8 @@ class BatchModelProcessor:
         }
 
         try:
-            # API isteği gönder
-            if model_type == "lightgbm":
-                api_result = self.api_client.train_lightgbm(config)
-            elif model_type == "pca":
-                api_result = self.api_client.train_pca(config)
-            elif model_type == "ensemble":
-                api_result = self.api_client.train_ensemble(config)
-            else:
-                raise ValueError(f"Bilinmeyen model tipi: {model_type}")
+            # API isteği gönder (adaptif rate limiter üzerinden)
+            api_result = self._train_via_api(model_type, config)
 
             if api_result and "error" not in api_result:
                 result["training_result"] = api_result
@@ -289,13 +303,38 @@ class BatchModelProcessor:
             else:
                 result["error"] = api_result.get("error", "Bilinmeyen API hatası")
 
-            time.sleep(self.delay)
-
         except Exception as e:
             result["error"] = str(e)
 
         return result
 
+    def _train_via_api(self, model_type: str, config: Dict) -> Dict:
+        """
+        Eğitim isteğini rate limiter slotu içinde gönder
+
+        Slot, eşzamanlılık limiti ve token bucket izin verene kadar bekler;
+        yanıt süresi ve durum kodu limiter'a geri bildirilir.
+        """
+        if model_type not in ("lightgbm", "pca", "ensemble"):
+            raise ValueError(f"Bilinmeyen model tipi: {model_type}")
+
+        config = with_lightgbm_threads(model_type, config, self.threads_per_training)
+
+        with self.rate_limiter.slot() as outcome:
+            if model_type == "lightgbm":
+                api_result = self.api_client.train_lightgbm(config)
+            elif model_type == "pca":
+                api_result = self.api_client.train_pca(config)
+            else:
+                api_result = self.api_client.train_ensemble(config)
+
+            outcome["success"] = bool(api_result) and "error" not in api_result
+            if api_result and "error" in api_result:
+                outcome["status_code"] = api_result.get("status_code")
+                outcome["error"] = str(api_result.get("error"))
+
+        return api_result
+
     def _save_individual_result(self, result: Dict):
         """
         Bireysel sonucu kaydet
@@ -338,6 +377,10 @@ class BatchModelProcessor:
         if failed_results:
             summary["failure_analysis"] = self._analyze_failures(failed_results)
 
+        # Pencere bazlı throughput ve gecikme (adaptif kontrolcüden)
+        summary["throughput_analysis"] = self.rate_limiter.get_report()
+        summary["resilience"] = self.api_client.get_resilience_stats()
+
         # Özeti kaydet
         summary_file = os.path.join(self.output_dir, "summary", f"batch_summary_{model_type}_{timestamp}.json")
         with open(summary_file, 'w') as f:
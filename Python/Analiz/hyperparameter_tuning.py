@@ -7,6 +7,7 @@ import seaborn as sns
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 from itertools import product
+import threading
 import time
 import warnings
 
@@ -14,22 +15,28 @@ warnings.filterwarnings('ignore')
 
 from api_client import FraudDetectionAPIClient, ConfigurationGenerator
 
+# pyplot thread-safe değil - paralel tuning'lerde grafikler sırayla çizilir
+PLOT_LOCK = threading.Lock()
+
 
 class HyperparameterTuner:
     """
     Model hiperparametreleri optimize eden sınıf
     """
 
-    def __init__(self, api_client: FraudDetectionAPIClient, output_dir: str = "tuning_results"):
+    def __init__(self, api_client: FraudDetectionAPIClient, output_dir: str = "tuning_results",
+                 scheduler=None):
         """
         Hyperparameter Tuner'ı başlat
 
         Args:
             api_client: API client instance
             output_dir: Sonuçların kaydedileceği dizin
+            scheduler: OptimizationScheduler (varsa deneyler paralel ve önbellekli çalışır)
         """
         self.api_client = api_client
         self.output_dir = output_dir
+        self.scheduler = scheduler
 
         # Output dizinleri oluştur
         os.makedirs(output_dir, exist_ok=True)
@@ -64,58 +71,9 @@ class HyperparameterTuner:
 
         # Grid search veya random search
         param_combinations = self._generate_param_combinations(param_grid, max_experiments)
+        experiments = [(params, self._create_lightgbm_config(params)) for params in param_combinations]
 
-        results = []
-        best_score = -1
-        best_config = None
-
-        for i, params in enumerate(param_combinations):
-            print(f"\n🔄 Deneme {i + 1}/{len(param_combinations)}")
-            print(f"Parametreler: {params}")
-
-            try:
-                # Konfigürasyon oluştur
-                config = self._create_lightgbm_config(params)
-
-                # Model eğit
-                result = self.api_client.train_lightgbm(config)
-
-                if result and "error" not in result:
-                    # Skoru al
-                    score = self._extract_score(result, optimization_metric)
-
-                    # Gerçek model ismini al - response'da "modelName" field'ı var
-                    actual_model_name = result.get("modelName") or result.get("ModelName", f"lightgbm_exp_{i + 1}")
-
-                    # Sonucu kaydet
-                    experiment_result = {
-                        "experiment_id": i + 1,
-                        "parameters": params,
-                        "config": config,
-                        "training_result": result,
-                        "actual_model_name": actual_model_name,
-                        "score": score,
-                        "timestamp": datetime.now().isoformat()
-                    }
-
-                    results.append(experiment_result)
-
-                    print(f"✅ Skor: {score:.4f}")
-
-                    # En iyi skor kontrolü
-                    if score > best_score:
-                        best_score = score
-                        best_config = config
-                        print(f"🏆 Yeni en iyi skor: {best_score:.4f}")
-
-                else:
-                    print(f"❌ Eğitim başarısız: {result.get('error', 'Bilinmeyen hata')}")
-
-            except Exception as e:
-                print(f"🚨 Deneme {i + 1} hatası: {str(e)}")
-
-            # Kısa bekleme
-            time.sleep(2)
+        results = self._run_experiments("lightgbm", experiments, optimization_metric, delay=2)
 
         # Sonuçları analiz et ve kaydet
         tuning_summary = self._analyze_tuning_results(results, "LightGBM", optimization_metric)
@@ -138,44 +96,9 @@ class HyperparameterTuner:
             param_grid = self._get_pca_param_grid()
 
         param_combinations = self._generate_param_combinations(param_grid, max_experiments)
+        experiments = [(params, self._create_pca_config(params)) for params in param_combinations]
 
-        results = []
-        best_score = -1
-        best_config = None
-
-        for i, params in enumerate(param_combinations):
-            print(f"\n🔄 Deneme {i + 1}/{len(param_combinations)}")
-
-            try:
-                config = self._create_pca_config(params)
-                result = self.api_client.train_pca(config)
-
-                if result and "error" not in result:
-                    score = self._extract_score(result, optimization_metric)
-                    actual_model_name = result.get("modelName") or result.get("ModelName", f"pca_exp_{i + 1}")
-
-                    experiment_result = {
-                        "experiment_id": i + 1,
-                        "parameters": params,
-                        "config": config,
-                        "training_result": result,
-                        "actual_model_name": actual_model_name,
-                        "score": score,
-                        "timestamp": datetime.now().isoformat()
-                    }
-
-                    results.append(experiment_result)
-                    print(f"✅ Skor: {score:.4f}")
-
-                    if score > best_score:
-                        best_score = score
-                        best_config = config
-                        print(f"🏆 Yeni en iyi skor: {best_score:.4f}")
-
-            except Exception as e:
-                print(f"🚨 Deneme {i + 1} hatası: {str(e)}")
-
-            time.sleep(2)
+        results = self._run_experiments("pca", experiments, optimization_metric, delay=2)
 
         tuning_summary = self._analyze_tuning_results(results, "PCA", optimization_metric)
         self._create_tuning_visualizations(results, "PCA", optimization_metric)
@@ -186,9 +109,15 @@ class HyperparameterTuner:
                       lightgbm_grid: Dict = None,
                       pca_grid: Dict = None,
                       ensemble_grid: Dict = None,
-                      max_experiments: int = 25) -> Dict:
+                      max_experiments: int = 25,
+                      lightgbm_configs: List[Dict] = None,
+                      pca_configs: List[Dict] = None) -> Dict:
         """
         Ensemble hiperparametrelerini optimize et
+
+        Args:
+            lightgbm_configs: Hazır LightGBM alt konfigürasyonları (ör. LightGBM tuning'inin en iyileri)
+            pca_configs: Hazır PCA alt konfigürasyonları (ör. PCA tuning'inin en iyileri)
         """
         print(f"🔍 Ensemble hiperparametre optimizasyonu başlatılıyor...")
 
@@ -199,8 +128,10 @@ class HyperparameterTuner:
                 "threshold": [0.4, 0.45, 0.5, 0.55]
             }
 
-        # Alt model konfigürasyonları
-        if lightgbm_grid is None:
+        # Alt model konfigürasyonları - önceden tuning yapıldıysa en iyi sonuçlar kullanılır
+        if lightgbm_configs:
+            print(f"♻️ {len(lightgbm_configs)} tuning edilmiş LightGBM konfigürasyonu kullanılıyor")
+        elif lightgbm_grid is None:
             lightgbm_configs = [
                 ConfigurationGenerator.get_lightgbm_config("balanced"),
                 ConfigurationGenerator.get_lightgbm_config("accurate")
@@ -209,7 +140,9 @@ class HyperparameterTuner:
             lightgbm_configs = [self._create_lightgbm_config(params)
                                 for params in self._generate_param_combinations(lightgbm_grid, 3)]
 
-        if pca_grid is None:
+        if pca_configs:
+            print(f"♻️ {len(pca_configs)} tuning edilmiş PCA konfigürasyonu kullanılıyor")
+        elif pca_grid is None:
             pca_configs = [
                 ConfigurationGenerator.get_pca_config("default"),
                 ConfigurationGenerator.get_pca_config("sensitive")
@@ -221,32 +154,70 @@ class HyperparameterTuner:
         # Ensemble parametreleri
         ensemble_combinations = self._generate_param_combinations(ensemble_grid, max_experiments)
 
-        results = []
-        best_score = -1
-        best_config = None
-
+        experiments = []
         for i, ensemble_params in enumerate(ensemble_combinations):
-            print(f"\n🔄 Ensemble Deneme {i + 1}/{len(ensemble_combinations)}")
+            # Ensemble konfigürasyonu oluştur
+            config = {
+                "lightgbmWeight": ensemble_params["lightgbm_weight"],
+                "pcaWeight": ensemble_params["pca_weight"],
+                "threshold": ensemble_params["threshold"],
+                "lightgbm": lightgbm_configs[i % len(lightgbm_configs)],
+                "pca": pca_configs[i % len(pca_configs)]
+            }
+            experiments.append((ensemble_params, config))
 
-            try:
-                # Ensemble konfigürasyonu oluştur
-                config = {
-                    "lightgbmWeight": ensemble_params["lightgbm_weight"],
-                    "pcaWeight": ensemble_params["pca_weight"],
-                    "threshold": ensemble_params["threshold"],
-                    "lightgbm": lightgbm_configs[i % len(lightgbm_configs)],
-                    "pca": pca_configs[i % len(pca_configs)]
-                }
+        # Ensemble eğitimi daha uzun sürer
+        results = self._run_experiments("ensemble", experiments, "f1_score", delay=3)
+
+        tuning_summary = self._analyze_tuning_results(results, "Ensemble", "f1_score")
+        self._create_tuning_visualizations(results, "Ensemble", "f1_score")
+
+        return tuning_summary
+
+    def _run_experiments(self, model_type: str, experiments: List[Tuple[Dict, Dict]],
+                         optimization_metric: str, delay: float = 2) -> List[Dict]:
+        """
+        Deneyleri çalıştır
+
+        Scheduler varsa deneyler worker bütçesi kadar paralel çalışır, yoksa
+        sıralı çalışıp her denemeden sonra kısa süre beklenir.
+
+        Args:
+            model_type: lightgbm, pca veya ensemble
+            experiments: (parametreler, konfigürasyon) listesi
+            optimization_metric: Optimize edilecek metrik
+            delay: Sıralı modda denemeler arası bekleme (saniye)
+
+        Returns:
+            Başarılı deney sonuçları (experiment_id sırasıyla)
+        """
+        best = {"score": -1}
+        best_lock = threading.Lock()
 
-                result = self.api_client.train_ensemble(config)
+        def run_one(item):
+            i, (params, config) = item
+            print(f"\n🔄 {model_type} Deneme {i + 1}/{len(experiments)}")
+            print(f"Parametreler: {params}")
+
+            try:
+                result = self._train(model_type, config)
 
                 if result and "error" not in result:
-                    score = self._extract_score(result, "f1_score")
-                    actual_model_name = result.get("modelName") or result.get("ModelName", f"ensemble_exp_{i + 1}")
+                    score = self._extract_score(result, optimization_metric)
+
+                    # Gerçek model ismini al - response'da "modelName" field'ı var
+                    actual_model_name = result.get("modelName") or result.get("ModelName", f"{model_type}_exp_{i + 1}")
+
+                    print(f"✅ {model_type} Deneme {i + 1} skor: {score:.4f}")
 
-                    experiment_result = {
+                    with best_lock:
+                        if score > best["score"]:
+                            best["score"] = score
+                            print(f"🏆 Yeni en iyi {model_type} skoru: {score:.4f}")
+
+                    return {
                         "experiment_id": i + 1,
-                        "parameters": ensemble_params,
+                        "parameters": params,
                         "config": config,
                         "training_result": result,
                         "actual_model_name": actual_model_name,
@@ -254,23 +225,36 @@ class HyperparameterTuner:
                         "timestamp": datetime.now().isoformat()
                     }
 
-                    results.append(experiment_result)
-                    print(f"✅ F1-Score: {score:.4f}")
-
-                    if score > best_score:
-                        best_score = score
-                        best_config = config
-                        print(f"🏆 Yeni en iyi skor: {best_score:.4f}")
+                print(f"❌ Eğitim başarısız: {result.get('error', 'Bilinmeyen hata')}")
 
             except Exception as e:
                 print(f"🚨 Deneme {i + 1} hatası: {str(e)}")
 
-            time.sleep(3)  # Ensemble eğitimi daha uzun sürer
+            finally:
+                if self.scheduler is None:
+                    # Kısa bekleme
+                    time.sleep(delay)
 
-        tuning_summary = self._analyze_tuning_results(results, "Ensemble", "f1_score")
-        self._create_tuning_visualizations(results, "Ensemble", "f1_score")
+            return None
 
-        return tuning_summary
+        items = list(enumerate(experiments))
+        if self.scheduler is not None:
+            outcomes = self.scheduler.map(run_one, items)
+        else:
+            outcomes = [run_one(item) for item in items]
+
+        return [outcome for outcome in outcomes if outcome is not None]
+
+    def _train(self, model_type: str, config: Dict) -> Dict:
+        """Modeli eğit (scheduler varsa bütçe ve önbellek üzerinden)"""
+        if self.scheduler is not None:
+            return self.scheduler.train(model_type, config)
+
+        if model_type == "lightgbm":
+            return self.api_client.train_lightgbm(config)
+        elif model_type == "pca":
+            return self.api_client.train_pca(config)
+        return self.api_client.train_ensemble(config)
 
     def _get_lightgbm_param_grid(self) -> Dict[str, List]:
         """LightGBM parametre arama uzayı"""
@@ -457,17 +441,18 @@ class HyperparameterTuner:
             return
 
         try:
-            # Skor dağılımı
-            self._plot_score_distribution(results, model_type, metric)
+            with PLOT_LOCK:
+                # Skor dağılımı
+                self._plot_score_distribution(results, model_type, metric)
 
-            # Parametre önemleri
-            self._plot_parameter_importance(results, model_type)
+                # Parametre önemleri
+                self._plot_parameter_importance(results, model_type)
 
-            # Skor gelişimi
-            self._plot_score_evolution(results, model_type, metric)
+                # Skor gelişimi
+                self._plot_score_evolution(results, model_type, metric)
 
-            # Parametre scatter plots
-            self._plot_parameter_scatter(results, model_type, metric)
+                # Parametre scatter plots
+                self._plot_parameter_scatter(results, model_type, metric)
 
             print(f"✅ {model_type} tuning görselleştirmeleri oluşturuldu")
 
@@ -12,23 +12,35 @@ from datetime import datetime
 from typing import Dict, List, Optional
 import time
 
+# Ortak modüller (chart_renderer) Python/ kökünde
+PYTHON_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PYTHON_ROOT not in sys.path:
+    sys.path.append(PYTHON_ROOT)
+
 # Kendi modüllerimizi import et
 from api_client import FraudDetectionAPIClient, ConfigurationGenerator
 from model_reporter import ModelReporter
 from hyperparameter_tuning import HyperparameterTuner
+from optimization_scheduler import OptimizationScheduler
+from chart_renderer import DEFAULT_DPI, RENDER_MODES
 
 class FraudDetectionAnalyzer:
     """
     Fraud Detection Model Analiz ve Rapor Sistemi Ana Sınıfı
     """
 
-    def __init__(self, base_url: str = "http://localhost:5112", output_dir: str = "analysis_results"):
+    def __init__(self, base_url: str = "http://localhost:5112", output_dir: str = "analysis_results",
+                 max_workers: Optional[int] = None, render_mode: str = "process",
+                 chart_dpi: int = DEFAULT_DPI):
         """
         Analyzer'ı başlat
 
         Args:
             base_url: API base URL
             output_dir: Çıktı dizini
+            max_workers: Aynı anda çalışabilecek maksimum model eğitimi (None ise CPU sayısının yarısı)
+            render_mode: Rapor grafiklerinin çizimi - process (arka plan), inline veya skip
+            chart_dpi: Rapor grafiklerinin çözünürlüğü
         """
         self.base_url = base_url
         self.output_dir = output_dir
@@ -39,9 +51,13 @@ class FraudDetectionAnalyzer:
         # API Client
         self.api_client = FraudDetectionAPIClient(base_url)
 
+        # Tüm eğitimler ortak worker bütçesini ve sonuç önbelleğini paylaşır
+        self.scheduler = OptimizationScheduler(self.api_client, max_workers)
+
         # Modüller
-        self.reporter = ModelReporter(self.api_client, f"{output_dir}/reports")
-        self.tuner = HyperparameterTuner(self.api_client, f"{output_dir}/tuning")
+        self.reporter = ModelReporter(self.api_client, f"{output_dir}/reports", scheduler=self.scheduler,
+                                      render_mode=render_mode, chart_dpi=chart_dpi)
+        self.tuner = HyperparameterTuner(self.api_client, f"{output_dir}/tuning", scheduler=self.scheduler)
 
         print(f"🚀 Fraud Detection Analyzer başlatıldı")
         print(f"🌐 API: {base_url}")
@@ -153,31 +169,14 @@ class FraudDetectionAnalyzer:
         if model_types is None:
             model_types = ["lightgbm", "pca", "ensemble"]
 
-        results = {}
-
-        # LightGBM optimizasyonu
-        if "lightgbm" in model_types:
-            print("\n📊 LightGBM Optimizasyonu...")
-            lgbm_result = self.tuner.tune_lightgbm(
-                max_experiments=15,
-                optimization_metric="f1_score"
-            )
-            results["lightgbm"] = lgbm_result
-
-        # PCA optimizasyonu
-        if "pca" in model_types:
-            print("\n📊 PCA Optimizasyonu...")
-            pca_result = self.tuner.tune_pca(
-                max_experiments=10,
-                optimization_metric="accuracy"
-            )
-            results["pca"] = pca_result
-
-        # Ensemble optimizasyonu
-        if "ensemble" in model_types:
-            print("\n📊 Ensemble Optimizasyonu...")
-            ensemble_result = self.tuner.tune_ensemble(max_experiments=12)
-            results["ensemble"] = ensemble_result
+        # LightGBM ve PCA eşzamanlı, ensemble ise onların en iyi konfigürasyonlarıyla çalışır
+        print(f"\n📊 {', '.join(model_types)} optimizasyonu paralel çalıştırılıyor...")
+        results = self.scheduler.run_tuning(
+            self.tuner,
+            model_types,
+            experiment_counts={"lightgbm": 15, "pca": 10, "ensemble": 12},
+            metrics={"lightgbm": "f1_score", "pca": "accuracy"}
+        )
 
         # Sonuçları kaydet
         self._save_optimization_summary(results)
@@ -423,6 +422,12 @@ def main():
                        help="API base URL (default: http://localhost:5000)")
     parser.add_argument("--output-dir", default="analysis_results",
                        help="Çıktı dizini (default: analysis_results)")
+    parser.add_argument("--max-workers", type=int, default=None,
+                       help="Aynı anda çalışacak maksimum model eğitimi (default: CPU sayısının yarısı)")
+    parser.add_argument("--render-mode", default="process", choices=list(RENDER_MODES),
+                       help="Rapor grafikleri: arka plan process pool, inline veya skip (default: process)")
+    parser.add_argument("--chart-dpi", type=int, default=DEFAULT_DPI,
+                       help=f"Rapor grafiklerinin çözünürlüğü (default: {DEFAULT_DPI})")
 
     # Ana işlem tipleri
     parser.add_argument("--quick", action="store_true",
@@ -444,7 +449,8 @@ def main():
     args = parser.parse_args()
 
     # Analyzer'ı başlat
-    analyzer = FraudDetectionAnalyzer(args.api_url, args.output_dir)
+    analyzer = FraudDetectionAnalyzer(args.api_url, args.output_dir, args.max_workers,
+                                      args.render_mode, args.chart_dpi)
 
     # İşlem seçimi
     if args.quick:
@@ -1,5 +1,6 @@
 import json
 import os
+import sys
 
 import pandas as pd
 import numpy as np
@@ -11,8 +12,14 @@ import warnings
 
 warnings.filterwarnings('ignore')
 
+# Ortak modüller (chart_renderer) Python/ kökünde
+PYTHON_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PYTHON_ROOT not in sys.path:
+    sys.path.append(PYTHON_ROOT)
+
 # Kendi modüllerimizi import et
 from api_client import FraudDetectionAPIClient, ConfigurationGenerator
+from chart_renderer import ChartRenderQueue, DEFAULT_DPI
 
 
 class ModelReporter:
@@ -20,16 +27,23 @@ class ModelReporter:
     Model performansı raporlama ve görselleştirme sınıfı
     """
 
-    def __init__(self, api_client: FraudDetectionAPIClient, output_dir: str = "reports"):
+    def __init__(self, api_client: FraudDetectionAPIClient, output_dir: str = "reports", scheduler=None,
+                 render_mode: str = "process", chart_dpi: int = DEFAULT_DPI):
         """
         Model Reporter'ı başlat
 
         Args:
             api_client: API client instance
             output_dir: Raporların kaydedileceği dizin
+            scheduler: OptimizationScheduler (varsa modeller paralel eğitilir)
+            render_mode: Grafik çizimi - process (arka plan), inline veya skip
+            chart_dpi: Grafik çözünürlüğü
         """
         self.api_client = api_client
         self.output_dir = output_dir
+        self.scheduler = scheduler
+        self.render_queue = ChartRenderQueue(mode=render_mode, dpi=chart_dpi,
+                                             cache_dir=f"{output_dir}/.chart_cache")
 
         # Output dizini oluştur
         os.makedirs(output_dir, exist_ok=True)
@@ -67,12 +81,23 @@ class ModelReporter:
         # Her model için eğitim ve analiz
         trained_models = []
 
+        # Scheduler varsa tüm modeller önce paralel eğitilir, analiz sırayla yapılır
+        pretrained = {}
+        if self.scheduler is not None:
+            names = list(model_configs.keys())
+            print(f"🗓️ {len(names)} model paralel eğitiliyor (bütçe: {self.scheduler.max_workers})...")
+            outcomes = self.scheduler.map(lambda name: self._train_model(name, model_configs[name]), names)
+            pretrained = dict(zip(names, outcomes))
+
         for model_name, config in model_configs.items():
             print(f"\n📈 {model_name} modeli işleniyor...")
 
             try:
                 # Model eğit
-                model_result = self._train_model(model_name, config)
+                if model_name in pretrained:
+                    model_result = pretrained[model_name]
+                else:
+                    model_result = self._train_model(model_name, config)
 
                 if model_result and "error" not in model_result:
                     # Metrikleri al - artık model_result'ı geçiyoruz
@@ -123,6 +148,11 @@ class ModelReporter:
         # Raporu kaydet
         report_file = self._save_report(report_data)
 
+        # HTML raporu grafik dosyalarını listelediği için arka plandaki çizimleri bekle
+        render_stats = self.render_queue.wait()
+        print(f"🖼️ Grafikler: {render_stats['rendered']} çizildi, {render_stats['cache_hits']} önbellekten, "
+              f"{render_stats['failed']} hata")
+
         # HTML raporu oluştur
         html_report = self._create_html_report(report_data)
 
@@ -160,7 +190,9 @@ class ModelReporter:
         print(f"🔧 {model_name} eğitiliyor...")
 
         try:
-            if model_type == "lightgbm":
+            if self.scheduler is not None and model_type in ("lightgbm", "pca", "ensemble"):
+                result = self.scheduler.train(model_type, model_config)
+            elif model_type == "lightgbm":
                 result = self.api_client.train_lightgbm(model_config)
             elif model_type == "pca":
                 result = self.api_client.train_pca(model_config)
@@ -305,14 +337,8 @@ class ModelReporter:
             else:
                 print(f"⚠️ {model_name} için genişletilmiş metrikler bulunamadı")
 
-            # Grafiklerin oluşturulduğunu kontrol et
-            chart_files = [f for f in os.listdir(f"{self.output_dir}/charts") if model_name in f]
-            if chart_files:
-                print(f"✅ {model_name} için {len(chart_files)} grafik oluşturuldu:")
-                for chart in chart_files:
-                    print(f"   - {chart}")
-            else:
-                print(f"⚠️ {model_name} için hiç grafik oluşturulamadı")
+            # Grafikler arka planda çizilir, rapor öncesinde beklenir
+            print(f"🖼️ {model_name} grafikleri çizim kuyruğuna eklendi ({self.render_queue.mode})")
 
         except Exception as e:
             print(f"🚨 {model_name} görselleştirme hatası: {str(e)}")
@@ -321,193 +347,23 @@ class ModelReporter:
 
     def _plot_basic_metrics(self, model_name: str, basic_metrics: Dict):
         """Temel metrikler bar grafiği"""
-
-        # API response formatına uygun field isimleri
-        metrics = {
-            'Accuracy': basic_metrics.get('accuracy', 0),
-            'Precision': basic_metrics.get('precision', 0),
-            'Recall': basic_metrics.get('recall', 0),
-            'F1Score': basic_metrics.get('f1Score', 0),  # camelCase
-            'AUC': basic_metrics.get('auc', 0)
-        }
-
-        plt.figure(figsize=(10, 6))
-
-        bars = plt.bar(metrics.keys(), metrics.values(),
-                       color=['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd'])
-
-        # Değerleri bar'ların üzerine yaz
-        for bar, value in zip(bars, metrics.values()):
-            plt.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 0.01,
-                     f'{value:.3f}', ha='center', va='bottom', fontweight='bold')
-
-        plt.title(f'{model_name} - Temel Performans Metrikleri', fontsize=14, fontweight='bold')
-        plt.ylabel('Değer', fontsize=12)
-        plt.ylim(0, 1.1)
-        plt.grid(axis='y', alpha=0.3)
-
-        # Renk kodlaması için legend
-        performance_levels = []
-        for name, value in metrics.items():
-            if value >= 0.9:
-                level = "Mükemmel"
-            elif value >= 0.8:
-                level = "İyi"
-            elif value >= 0.7:
-                level = "Orta"
-            else:
-                level = "Zayıf"
-            performance_levels.append(f"{name}: {level}")
-
-        plt.figtext(0.02, 0.02, "\n".join(performance_levels), fontsize=8,
-                    bbox=dict(boxstyle="round,pad=0.3", facecolor="lightgray", alpha=0.7))
-
-        plt.tight_layout()
-        plt.savefig(f'{self.output_dir}/charts/{model_name}_basic_metrics.png',
-                    dpi=300, bbox_inches='tight')
-        plt.close()
+        self.render_queue.submit(render_basic_metrics, {'model_name': model_name, 'basic_metrics': basic_metrics},
+                                 f'{self.output_dir}/charts/{model_name}_basic_metrics.png')
 
     def _plot_confusion_matrix(self, model_name: str, confusion_data: Dict):
         """Confusion Matrix heatmap"""
-
-        # API response formatına uygun field isimleri (camelCase)
-        tp = confusion_data.get('truePositive', 0)
-        tn = confusion_data.get('trueNegative', 0)
-        fp = confusion_data.get('falsePositive', 0)
-        fn = confusion_data.get('falseNegative', 0)
-
-        # Confusion matrix oluştur
-        cm = np.array([[tn, fp], [fn, tp]])
-
-        plt.figure(figsize=(8, 6))
-
-        # Heatmap
-        sns.heatmap(cm, annot=True, fmt='d', cmap='Blues',
-                    xticklabels=['Normal', 'Fraud'],
-                    yticklabels=['Normal', 'Fraud'],
-                    cbar_kws={'label': 'Tahmin Sayısı'})
-
-        plt.title(f'{model_name} - Confusion Matrix', fontsize=14, fontweight='bold')
-        plt.xlabel('Tahmin Edilen', fontsize=12)
-        plt.ylabel('Gerçek', fontsize=12)
-
-        # Performans bilgileri ekle
-        total = tp + tn + fp + fn
-        accuracy = (tp + tn) / total if total > 0 else 0
-        precision = tp / (tp + fp) if (tp + fp) > 0 else 0
-        recall = tp / (tp + fn) if (tp + fn) > 0 else 0
-
-        info_text = f"""
-Toplam Örnek: {total}
-Accuracy: {accuracy:.3f}
-Precision: {precision:.3f}
-Recall: {recall:.3f}
-        """
-
-        plt.figtext(0.02, 0.02, info_text.strip(), fontsize=10,
-                    bbox=dict(boxstyle="round,pad=0.3", facecolor="lightblue", alpha=0.7))
-
-        plt.tight_layout()
-        plt.savefig(f'{self.output_dir}/charts/{model_name}_confusion_matrix.png',
-                    dpi=300, bbox_inches='tight')
-        plt.close()
+        self.render_queue.submit(render_confusion_matrix, {'model_name': model_name, 'confusion_data': confusion_data},
+                                 f'{self.output_dir}/charts/{model_name}_confusion_matrix.png')
 
     def _plot_roc_curve_simulation(self, model_name: str, basic_metrics: Dict):
         """ROC Curve simülasyonu (gerçek veri olmadığı için)"""
-
-        # API response formatına uygun field ismi
-        auc = basic_metrics.get('auc', 0.5)
-
-        # Simulated ROC curve points
-        if auc > 0.5:
-            # Good performance curve
-            fpr = np.linspace(0, 1, 100)
-            tpr = np.power(fpr, 0.5) * auc + fpr * (1 - auc)
-            tpr = np.minimum(tpr, 1.0)
-        else:
-            # Random classifier
-            fpr = np.linspace(0, 1, 100)
-            tpr = fpr
-
-        plt.figure(figsize=(8, 6))
-
-        # ROC Curve
-        plt.plot(fpr, tpr, 'b-', linewidth=2, label=f'ROC Curve (AUC = {auc:.3f})')
-        plt.plot([0, 1], [0, 1], 'r--', linewidth=2, label='Random Classifier (AUC = 0.5)')
-
-        plt.xlim([0.0, 1.0])
-        plt.ylim([0.0, 1.05])
-        plt.xlabel('False Positive Rate', fontsize=12)
-        plt.ylabel('True Positive Rate', fontsize=12)
-        plt.title(f'{model_name} - ROC Curve', fontsize=14, fontweight='bold')
-        plt.legend(loc="lower right")
-        plt.grid(True, alpha=0.3)
-
-        # AUC değerlendirmesi
-        if auc >= 0.9:
-            performance = "Mükemmel"
-            color = "green"
-        elif auc >= 0.8:
-            performance = "İyi"
-            color = "blue"
-        elif auc >= 0.7:
-            performance = "Orta"
-            color = "orange"
-        else:
-            performance = "Zayıf"
-            color = "red"
-
-        plt.text(0.6, 0.2, f'Performans: {performance}',
-                 bbox=dict(boxstyle="round,pad=0.3", facecolor=color, alpha=0.3),
-                 fontsize=12, fontweight='bold')
-
-        plt.tight_layout()
-        plt.savefig(f'{self.output_dir}/charts/{model_name}_roc_curve.png',
-                    dpi=300, bbox_inches='tight')
-        plt.close()
+        self.render_queue.submit(render_roc_curve, {'model_name': model_name, 'basic_metrics': basic_metrics},
+                                 f'{self.output_dir}/charts/{model_name}_roc_curve.png')
 
     def _plot_extended_metrics(self, model_name: str, extended_metrics: Dict):
         """Genişletilmiş metrikler radar chart"""
-
-        # API response formatına uygun field isimleri (camelCase)
-        metrics = {
-            'Sensitivity': extended_metrics.get('sensitivity', 0),
-            'Specificity': extended_metrics.get('specificity', 0),
-            'Balanced Accuracy': extended_metrics.get('balancedAccuracy', 0),
-            'Matthews Corr': extended_metrics.get('matthewsCorrCoef', 0)
-        }
-
-        # Matthews correlation'ı normalize et (-1,1) -> (0,1)
-        if 'Matthews Corr' in metrics:
-            metrics['Matthews Corr'] = (metrics['Matthews Corr'] + 1) / 2
-
-        # Radar chart
-        angles = np.linspace(0, 2 * np.pi, len(metrics), endpoint=False).tolist()
-        values = list(metrics.values())
-
-        # Döngüyü tamamla
-        angles += angles[:1]
-        values += values[:1]
-
-        fig, ax = plt.subplots(figsize=(8, 8), subplot_kw=dict(projection='polar'))
-
-        ax.plot(angles, values, 'o-', linewidth=2, color='blue')
-        ax.fill(angles, values, alpha=0.25, color='blue')
-
-        ax.set_xticks(angles[:-1])
-        ax.set_xticklabels(metrics.keys())
-        ax.set_ylim(0, 1)
-        ax.set_yticks([0.2, 0.4, 0.6, 0.8, 1.0])
-        ax.set_yticklabels(['0.2', '0.4', '0.6', '0.8', '1.0'])
-        ax.grid(True)
-
-        plt.title(f'{model_name} - Detaylı Performans Metrikleri',
-                  size=14, fontweight='bold', pad=20)
-
-        plt.tight_layout()
-        plt.savefig(f'{self.output_dir}/charts/{model_name}_extended_metrics.png',
-                    dpi=300, bbox_inches='tight')
-        plt.close()
+        self.render_queue.submit(render_extended_metrics, {'model_name': model_name, 'extended_metrics': extended_metrics},
+                                 f'{self.output_dir}/charts/{model_name}_extended_metrics.png')
 
     def _create_comparison_visualizations(self, comparison_data: Dict):
         """Model karşılaştırma görselleştirmeleri"""
@@ -554,43 +410,10 @@ Recall: {recall:.3f}
 
     def _plot_model_comparison(self, model_names: List[str], metrics: Dict[str, List[float]]):
         """Model karşılaştırma grafiği"""
-
-        # Veri hazırlama
-        df = pd.DataFrame(metrics, index=model_names)
-
-        # Grouped bar chart
-        ax = df.plot(kind='bar', figsize=(12, 8), width=0.8)
-
-        plt.title('Model Performans Karşılaştırması', fontsize=16, fontweight='bold')
-        plt.xlabel('Modeller', fontsize=12)
-        plt.ylabel('Performans Değeri', fontsize=12)
-        plt.legend(title='Metrikler', bbox_to_anchor=(1.05, 1), loc='upper left')
-        plt.xticks(rotation=45, ha='right')
-        plt.grid(axis='y', alpha=0.3)
-
-        # Değerleri bar'ların üzerine yaz
-        for container in ax.containers:
-            ax.bar_label(container, fmt='%.3f', rotation=90, fontsize=8)
-
-        plt.tight_layout()
-        plt.savefig(f'{self.output_dir}/charts/model_comparison.png',
-                    dpi=300, bbox_inches='tight')
-        plt.close()
-
-        # Heatmap versiyonu
-        plt.figure(figsize=(10, 6))
-
-        sns.heatmap(df.T, annot=True, fmt='.3f', cmap='RdYlBu_r',
-                    cbar_kws={'label': 'Performans Değeri'})
-
-        plt.title('Model Performans Heatmap', fontsize=14, fontweight='bold')
-        plt.xlabel('Modeller', fontsize=12)
-        plt.ylabel('Metrikler', fontsize=12)
-
-        plt.tight_layout()
-        plt.savefig(f'{self.output_dir}/charts/model_comparison_heatmap.png',
-                    dpi=300, bbox_inches='tight')
-        plt.close()
+        data = {'model_names': model_names, 'metrics': metrics}
+        self.render_queue.submit(render_model_comparison, data, f'{self.output_dir}/charts/model_comparison.png')
+        self.render_queue.submit(render_comparison_heatmap, data,
+                                 f'{self.output_dir}/charts/model_comparison_heatmap.png')
 
     def _generate_recommendations(self, models_data: Dict) -> List[str]:
         """Model verilerine göre öneriler oluştur"""
@@ -1427,6 +1250,260 @@ Recall: {recall:.3f}
         return html_file
 
 
+# Grafik çizim fonksiyonları (ChartRenderQueue worker process'lerinde çalışır)
+def _apply_chart_style():
+    """Worker process'lerde de aynı matplotlib stilini kullan"""
+    plt.style.use('seaborn-v0_8')
+    sns.set_palette("husl")
+
+
+def render_basic_metrics(data: Dict, output_path: str, dpi: int):
+    """Temel metrikler bar grafiği"""
+    _apply_chart_style()
+    model_name = data['model_name']
+    basic_metrics = data['basic_metrics']
+
+    # API response formatına uygun field isimleri
+    metrics = {
+        'Accuracy': basic_metrics.get('accuracy', 0),
+        'Precision': basic_metrics.get('precision', 0),
+        'Recall': basic_metrics.get('recall', 0),
+        'F1Score': basic_metrics.get('f1Score', 0),  # camelCase
+        'AUC': basic_metrics.get('auc', 0)
+    }
+
+    plt.figure(figsize=(10, 6))
+
+    bars = plt.bar(metrics.keys(), metrics.values(),
+                   color=['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd'])
+
+    # Değerleri bar'ların üzerine yaz
+    for bar, value in zip(bars, metrics.values()):
+        plt.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 0.01,
+                 f'{value:.3f}', ha='center', va='bottom', fontweight='bold')
+
+    plt.title(f'{model_name} - Temel Performans Metrikleri', fontsize=14, fontweight='bold')
+    plt.ylabel('Değer', fontsize=12)
+    plt.ylim(0, 1.1)
+    plt.grid(axis='y', alpha=0.3)
+
+    # Renk kodlaması için legend
+    performance_levels = []
+    for name, value in metrics.items():
+        if value >= 0.9:
+            level = "Mükemmel"
+        elif value >= 0.8:
+            level = "İyi"
+        elif value >= 0.7:
+            level = "Orta"
+        else:
+            level = "Zayıf"
+        performance_levels.append(f"{name}: {level}")
+
+    plt.figtext(0.02, 0.02, "\n".join(performance_levels), fontsize=8,
+                bbox=dict(boxstyle="round,pad=0.3", facecolor="lightgray", alpha=0.7))
+
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=dpi, bbox_inches='tight')
+    plt.close()
+
+
+def render_confusion_matrix(data: Dict, output_path: str, dpi: int):
+    """Confusion Matrix heatmap"""
+    _apply_chart_style()
+    model_name = data['model_name']
+    confusion_data = data['confusion_data']
+
+    # API response formatına uygun field isimleri (camelCase)
+    tp = confusion_data.get('truePositive', 0)
+    tn = confusion_data.get('trueNegative', 0)
+    fp = confusion_data.get('falsePositive', 0)
+    fn = confusion_data.get('falseNegative', 0)
+
+    # Confusion matrix oluştur
+    cm = np.array([[tn, fp], [fn, tp]])
+
+    plt.figure(figsize=(8, 6))
+
+    # Heatmap
+    sns.heatmap(cm, annot=True, fmt='d', cmap='Blues',
+                xticklabels=['Normal', 'Fraud'],
+                yticklabels=['Normal', 'Fraud'],
+                cbar_kws={'label': 'Tahmin Sayısı'})
+
+    plt.title(f'{model_name} - Confusion Matrix', fontsize=14, fontweight='bold')
+    plt.xlabel('Tahmin Edilen', fontsize=12)
+    plt.ylabel('Gerçek', fontsize=12)
+
+    # Performans bilgileri ekle
+    total = tp + tn + fp + fn
+    accuracy = (tp + tn) / total if total > 0 else 0
+    precision = tp / (tp + fp) if (tp + fp) > 0 else 0
+    recall = tp / (tp + fn) if (tp + fn) > 0 else 0
+
+    info_text = f"""
+Toplam Örnek: {total}
+Accuracy: {accuracy:.3f}
+Precision: {precision:.3f}
+Recall: {recall:.3f}
+    """
+
+    plt.figtext(0.02, 0.02, info_text.strip(), fontsize=10,
+                bbox=dict(boxstyle="round,pad=0.3", facecolor="lightblue", alpha=0.7))
+
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=dpi, bbox_inches='tight')
+    plt.close()
+
+
+def render_roc_curve(data: Dict, output_path: str, dpi: int):
+    """ROC Curve simülasyonu (gerçek veri olmadığı için)"""
+    _apply_chart_style()
+    model_name = data['model_name']
+    basic_metrics = data['basic_metrics']
+
+    # API response formatına uygun field ismi
+    auc = basic_metrics.get('auc', 0.5)
+
+    # Simulated ROC curve points
+    if auc > 0.5:
+        # Good performance curve
+        fpr = np.linspace(0, 1, 100)
+        tpr = np.power(fpr, 0.5) * auc + fpr * (1 - auc)
+        tpr = np.minimum(tpr, 1.0)
+    else:
+        # Random classifier
+        fpr = np.linspace(0, 1, 100)
+        tpr = fpr
+
+    plt.figure(figsize=(8, 6))
+
+    # ROC Curve
+    plt.plot(fpr, tpr, 'b-', linewidth=2, label=f'ROC Curve (AUC = {auc:.3f})')
+    plt.plot([0, 1], [0, 1], 'r--', linewidth=2, label='Random Classifier (AUC = 0.5)')
+
+    plt.xlim([0.0, 1.0])
+    plt.ylim([0.0, 1.05])
+    plt.xlabel('False Positive Rate', fontsize=12)
+    plt.ylabel('True Positive Rate', fontsize=12)
+    plt.title(f'{model_name} - ROC Curve', fontsize=14, fontweight='bold')
+    plt.legend(loc="lower right")
+    plt.grid(True, alpha=0.3)
+
+    # AUC değerlendirmesi
+    if auc >= 0.9:
+        performance = "Mükemmel"
+        color = "green"
+    elif auc >= 0.8:
+        performance = "İyi"
+        color = "blue"
+    elif auc >= 0.7:
+        performance = "Orta"
+        color = "orange"
+    else:
+        performance = "Zayıf"
+        color = "red"
+
+    plt.text(0.6, 0.2, f'Performans: {performance}',
+             bbox=dict(boxstyle="round,pad=0.3", facecolor=color, alpha=0.3),
+             fontsize=12, fontweight='bold')
+
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=dpi, bbox_inches='tight')
+    plt.close()
+
+
+def render_extended_metrics(data: Dict, output_path: str, dpi: int):
+    """Genişletilmiş metrikler radar chart"""
+    _apply_chart_style()
+    model_name = data['model_name']
+    extended_metrics = data['extended_metrics']
+
+    # API response formatına uygun field isimleri (camelCase)
+    metrics = {
+        'Sensitivity': extended_metrics.get('sensitivity', 0),
+        'Specificity': extended_metrics.get('specificity', 0),
+        'Balanced Accuracy': extended_metrics.get('balancedAccuracy', 0),
+        'Matthews Corr': extended_metrics.get('matthewsCorrCoef', 0)
+    }
+
+    # Matthews correlation'ı normalize et (-1,1) -> (0,1)
+    if 'Matthews Corr' in metrics:
+        metrics['Matthews Corr'] = (metrics['Matthews Corr'] + 1) / 2
+
+    # Radar chart
+    angles = np.linspace(0, 2 * np.pi, len(metrics), endpoint=False).tolist()
+    values = list(metrics.values())
+
+    # Döngüyü tamamla
+    angles += angles[:1]
+    values += values[:1]
+
+    fig, ax = plt.subplots(figsize=(8, 8), subplot_kw=dict(projection='polar'))
+
+    ax.plot(angles, values, 'o-', linewidth=2, color='blue')
+    ax.fill(angles, values, alpha=0.25, color='blue')
+
+    ax.set_xticks(angles[:-1])
+    ax.set_xticklabels(metrics.keys())
+    ax.set_ylim(0, 1)
+    ax.set_yticks([0.2, 0.4, 0.6, 0.8, 1.0])
+    ax.set_yticklabels(['0.2', '0.4', '0.6', '0.8', '1.0'])
+    ax.grid(True)
+
+    plt.title(f'{model_name} - Detaylı Performans Metrikleri',
+              size=14, fontweight='bold', pad=20)
+
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=dpi, bbox_inches='tight')
+    plt.close()
+
+
+def render_model_comparison(data: Dict, output_path: str, dpi: int):
+    """Model karşılaştırma grafiği"""
+    _apply_chart_style()
+
+    # Veri hazırlama
+    df = pd.DataFrame(data['metrics'], index=data['model_names'])
+
+    # Grouped bar chart
+    ax = df.plot(kind='bar', figsize=(12, 8), width=0.8)
+
+    plt.title('Model Performans Karşılaştırması', fontsize=16, fontweight='bold')
+    plt.xlabel('Modeller', fontsize=12)
+    plt.ylabel('Performans Değeri', fontsize=12)
+    plt.legend(title='Metrikler', bbox_to_anchor=(1.05, 1), loc='upper left')
+    plt.xticks(rotation=45, ha='right')
+    plt.grid(axis='y', alpha=0.3)
+
+    # Değerleri bar'ların üzerine yaz
+    for container in ax.containers:
+        ax.bar_label(container, fmt='%.3f', rotation=90, fontsize=8)
+
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=dpi, bbox_inches='tight')
+    plt.close()
+
+
+def render_comparison_heatmap(data: Dict, output_path: str, dpi: int):
+    """Model karşılaştırma heatmap'i"""
+    _apply_chart_style()
+    df = pd.DataFrame(data['metrics'], index=data['model_names'])
+
+    plt.figure(figsize=(10, 6))
+
+    sns.heatmap(df.T, annot=True, fmt='.3f', cmap='RdYlBu_r',
+                cbar_kws={'label': 'Performans Değeri'})
+
+    plt.title('Model Performans Heatmap', fontsize=14, fontweight='bold')
+    plt.xlabel('Modeller', fontsize=12)
+    plt.ylabel('Metrikler', fontsize=12)
+
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=dpi, bbox_inches='tight')
+    plt.close()
+
+
 # Test fonksiyonu
 def create_sample_report():
     """Örnek rapor oluştur"""
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Optimization Scheduler - Model tipleri arası paralel hiperparametre optimizasyonu
+Global worker bütçesi altında LightGBM/PCA/Ensemble tuning işlerini eşzamanlı yürütür
+"""
+
+import copy
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from api_client import FraudDetectionAPIClient
+
+# Ortak modüller (thread_budget) Python/ kökünde
+PYTHON_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PYTHON_ROOT not in sys.path:
+    sys.path.append(PYTHON_ROOT)
+
+from thread_budget import get_thread_budget, with_lightgbm_threads
+
+
+class TrainingResultCache:
+    """
+    Aynı konfigürasyonla tekrar eğitim yapılmasını önleyen thread-safe önbellek
+
+    Aynı anahtar için eşzamanlı gelen istekler tek bir eğitimi bekler.
+    Hatalı sonuçlar önbelleğe alınmaz, sonraki çağrıda tekrar denenir.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model_type: str, config: Dict) -> str:
+        """Konfigürasyondan kararlı anahtar oluştur"""
+        return f"{model_type}:{json.dumps(config, sort_keys=True, default=str)}"
+
+    def get_or_train(self, model_type: str, config: Dict, train_fn: Callable[[], Dict]) -> Dict:
+        """Önbellekte varsa döndür, yoksa eğit ve sakla"""
+        key = self.make_key(model_type, config)
+
+        with self.lock:
+            future = self.entries.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self.entries[key] = future
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if owner:
+            try:
+                result = train_fn()
+            except Exception as e:
+                result = {"error": str(e), "status_code": 500}
+
+            if not result or "error" in result:
+                with self.lock:
+                    self.entries.pop(key, None)
+            future.set_result(result)
+        else:
+            print(f"♻️ {model_type} sonucu önbellekten kullanılıyor")
+
+        # Çağıranlar sonucu değiştirebildiği için kopya döndür
+        return copy.deepcopy(future.result())
+
+    def get_stats(self) -> Dict:
+        """Önbellek istatistikleri"""
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries)}
+
+
+class OptimizationScheduler:
+    """
+    Tuning ve rapor eğitimlerini global worker bütçesiyle yöneten sınıf
+
+    Tüm model tiplerinin eğitim istekleri aynı bütçeyi paylaşır; böylece
+    paralel çalışan tuner'lar backend'i toplamda max_workers'tan fazla yüklemez.
+    Ensemble tuning, biten LightGBM ve PCA tuning'lerinin en iyi konfigürasyonlarını kullanır.
+    """
+
+    def __init__(self, api_client: FraudDetectionAPIClient, max_workers: Optional[int] = None):
+        """
+        Scheduler'ı başlat
+
+        Args:
+            api_client: API client instance
+            max_workers: Aynı anda çalışabilecek maksimum eğitim sayısı (None ise CPU sayısının yarısı)
+        """
+        self.api_client = api_client
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) // 2)
+        self.worker_budget = threading.BoundedSemaphore(self.max_workers)
+        self.threads_per_training = get_thread_budget().split(self.max_workers).total
+        self.result_cache = TrainingResultCache()
+
+        self.active_jobs = 0
+        self.peak_jobs = 0
+        self.stats_lock = threading.Lock()
+
+        print(f"🗓️ Optimization Scheduler başlatıldı (worker bütçesi: {self.max_workers}, "
+              f"eğitim başına {self.threads_per_training} thread)")
+
+    def train(self, model_type: str, config: Dict) -> Dict:
+        """
+        Bütçe ve önbellek altında model eğit
+
+        Args:
+            model_type: lightgbm, pca veya ensemble
+            config: Model konfigürasyonu
+
+        Returns:
+            API eğitim sonucu
+        """
+        train_methods = {
+            "lightgbm": self.api_client.train_lightgbm,
+            "pca": self.api_client.train_pca,
+            "ensemble": self.api_client.train_ensemble
+        }
+        if model_type not in train_methods:
+            return {"error": f"Bilinmeyen model tipi: {model_type}"}
+
+        def run():
+            with self.worker_budget:
+                with self.stats_lock:
+                    self.active_jobs += 1
+                    self.peak_jobs = max(self.peak_jobs, self.active_jobs)
+                try:
+                    return train_methods[model_type](
+                        with_lightgbm_threads(model_type, config, self.threads_per_training)
+                    )
+                finally:
+                    with self.stats_lock:
+                        self.active_jobs -= 1
+
+        return self.result_cache.get_or_train(model_type, config, run)
+
+    def map(self, fn: Callable, items: List) -> List:
+        """Fonksiyonu elemanlara bütçe kadar paralel uygula (sonuçlar girdi sırasıyla)"""
+        if not items:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as executor:
+            return list(executor.map(fn, items))
+
+    def run_tuning(self, tuner, model_types: List[str], experiment_counts: Dict[str, int] = None,
+                   metrics: Dict[str, str] = None, top_k: int = 2) -> Dict:
+        """
+        Model tiplerinin tuning işlerini eşzamanlı çalıştır
+
+        LightGBM ve PCA aynı anda başlar; ensemble, ikisinin en iyi top_k
+        konfigürasyonu hazır olunca bu konfigürasyonlarla çalışır.
+
+        Args:
+            tuner: HyperparameterTuner (scheduler ile oluşturulmuş)
+            model_types: ['lightgbm', 'pca', 'ensemble'] alt kümesi
+            experiment_counts: Model tipi başına maksimum deneme sayısı
+            metrics: Model tipi başına optimize edilecek metrik
+            top_k: Ensemble'a aktarılacak en iyi alt model konfigürasyonu sayısı
+
+        Returns:
+            Model tipi başına tuning özeti
+        """
+        experiment_counts = experiment_counts or {"lightgbm": 15, "pca": 10, "ensemble": 12}
+        metrics = metrics or {"lightgbm": "f1_score", "pca": "accuracy"}
+        start_time = time.time()
+        results = {}
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = {}
+            if "lightgbm" in model_types:
+                futures["lightgbm"] = executor.submit(
+                    tuner.tune_lightgbm,
+                    max_experiments=experiment_counts.get("lightgbm", 15),
+                    optimization_metric=metrics.get("lightgbm", "f1_score")
+                )
+            if "pca" in model_types:
+                futures["pca"] = executor.submit(
+                    tuner.tune_pca,
+                    max_experiments=experiment_counts.get("pca", 10),
+                    optimization_metric=metrics.get("pca", "accuracy")
+                )
+
+            for model_type, future in futures.items():
+                try:
+                    results[model_type] = future.result()
+                except Exception as e:
+                    print(f"🚨 {model_type} tuning hatası: {str(e)}")
+                    results[model_type] = {"error": str(e)}
+
+        if "ensemble" in model_types:
+            results["ensemble"] = tuner.tune_ensemble(
+                max_experiments=experiment_counts.get("ensemble", 12),
+                lightgbm_configs=self._top_configs(results.get("lightgbm"), top_k),
+                pca_configs=self._top_configs(results.get("pca"), top_k)
+            )
+
+        elapsed = time.time() - start_time
+        print(f"⏱️ Paralel tuning süresi: {elapsed:.1f}s (en yüksek eşzamanlılık: {self.peak_jobs})")
+
+        results["scheduler"] = self.get_stats()
+        results["scheduler"]["total_time_seconds"] = elapsed
+        return results
+
+    @staticmethod
+    def _top_configs(summary: Optional[Dict], top_k: int) -> Optional[List[Dict]]:
+        """Tuning özetinden en iyi top_k konfigürasyonu al"""
+        if not summary or "all_results" not in summary:
+            return None
+        ranked = sorted(summary["all_results"], key=lambda r: r["score"], reverse=True)
+        return [r["config"] for r in ranked[:top_k]] or None
+
+    def get_stats(self) -> Dict:
+        """Scheduler istatistikleri"""
+        return {
+            "max_workers": self.max_workers,
+            "threads_per_training": self.threads_per_training,
+            "peak_concurrent_jobs": self.peak_jobs,
+            "cache": self.result_cache.get_stats()
+        }
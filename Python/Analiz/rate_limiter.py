@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Adaptive Rate Limiter - Sunucu yüküne göre kendini ayarlayan istek kontrolcüsü
+Token bucket + AIMD (Additive Increase / Multiplicative Decrease) eşzamanlılık kontrolü
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import numpy as np
+
+
+# Geri çekilme (backoff) tetikleyen HTTP durum kodları
+OVERLOAD_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket ile istek hızını, AIMD ile eşzamanlılığı yöneten sınıf
+
+    Sağlıklı yanıtlarda (düşük gecikme, hata yok) eşzamanlılık ve hız
+    toplamsal olarak artırılır; timeout, 429 veya 5xx yanıtlarında
+    çarpımsal olarak düşürülür.
+    """
+
+    def __init__(self,
+                 initial_concurrency: int = 3,
+                 min_concurrency: int = 1,
+                 max_concurrency: int = 8,
+                 initial_rate: Optional[float] = None,
+                 max_rate: float = 10.0,
+                 burst: int = 2,
+                 increase_step: float = 1.0,
+                 decrease_factor: float = 0.5,
+                 latency_tolerance: float = 3.0,
+                 window_seconds: float = 30.0):
+        """
+        Rate limiter'ı başlat
+
+        Args:
+            initial_concurrency: Başlangıç eşzamanlı istek limiti
+            min_concurrency: Minimum eşzamanlı istek limiti
+            max_concurrency: Maksimum eşzamanlı istek limiti
+            initial_rate: Başlangıç istek hızı (istek/saniye), None ise hız sınırı yok
+            max_rate: Maksimum istek hızı (istek/saniye)
+            burst: Token bucket kapasitesi
+            increase_step: Her sağlıklı "tur" sonunda eklenecek limit miktarı
+            decrease_factor: Aşırı yük sinyalinde limitin çarpılacağı katsayı
+            latency_tolerance: Gecikme bu katsayı x referans gecikmeyi aşarsa geri çekil
+            window_seconds: Throughput/latency raporlama pencere süresi
+        """
+        self.min_concurrency = max(1, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.concurrency_limit = float(min(max(initial_concurrency, self.min_concurrency), self.max_concurrency))
+
+        self.rate = initial_rate
+        self.max_rate = max_rate
+        self.min_rate = initial_rate / 4 if initial_rate else None
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.last_refill = time.monotonic()
+
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.window_seconds = window_seconds
+
+        # Paylaşılan durum
+        self.condition = threading.Condition()
+        self.in_flight = 0
+        self.baseline_latency = None
+        self.last_decrease = 0.0
+
+        # Pencere istatistikleri
+        self.window_start = time.monotonic()
+        self.window_latencies = []
+        self.window_errors = 0
+        self.windows = []
+        self.total_requests = 0
+        self.total_errors = 0
+        self.backoff_events = 0
+        self.limit_history = deque(maxlen=500)
+
+    # Slot yönetimi
+    def acquire(self):
+        """Eşzamanlılık slotu ve token alınana kadar bekle"""
+        with self.condition:
+            while True:
+                self._refill_tokens()
+                has_slot = self.in_flight < int(self.concurrency_limit)
+                has_token = self.rate is None or self.tokens >= 1.0
+
+                if has_slot and has_token:
+                    self.in_flight += 1
+                    if self.rate is not None:
+                        self.tokens -= 1.0
+                    return
+
+                # Token eksikse bir sonraki token'a kadar, slot eksikse bildirim gelene kadar bekle
+                wait_time = None
+                if has_slot and not has_token:
+                    wait_time = (1.0 - self.tokens) / self.rate
+                self.condition.wait(timeout=wait_time)
+
+    def release(self, latency: float, success: bool, status_code: Optional[int] = None,
+                error: Optional[str] = None):
+        """
+        Slotu bırak ve sonuca göre limitleri güncelle
+
+        Args:
+            latency: İstek süresi (saniye)
+            success: İstek başarılı mı?
+            status_code: HTTP durum kodu (varsa)
+            error: Hata mesajı (varsa)
+        """
+        with self.condition:
+            self.in_flight = max(0, self.in_flight - 1)
+            self.total_requests += 1
+            self.window_latencies.append(latency)
+
+            overloaded = self._is_overload_signal(success, status_code, error)
+            slow = self._is_slow(latency)
+
+            if not success:
+                self.total_errors += 1
+                self.window_errors += 1
+
+            if overloaded or slow:
+                self._decrease(reason="overload" if overloaded else "latency")
+            elif success:
+                self._increase()
+
+            # Kalıcı yavaşlamada sürekli geri çekilmemek için referans her başarılı yanıtta güncellenir
+            if success:
+                self._update_baseline(latency)
+
+            self._roll_window()
+            self.condition.notify_all()
+
+    @contextmanager
+    def slot(self):
+        """
+        Context manager olarak slot kullanımı
+
+        Örnek:
+            with limiter.slot() as outcome:
+                result = client.train_lightgbm(config)
+                outcome["success"] = "error" not in result
+                outcome["status_code"] = result.get("status_code")
+        """
+        self.acquire()
+        outcome = {"success": False, "status_code": None, "error": None}
+        start = time.monotonic()
+        try:
+            yield outcome
+        except Exception as e:
+            outcome["success"] = False
+            outcome["error"] = str(e)
+            raise
+        finally:
+            self.release(time.monotonic() - start, outcome["success"],
+                         outcome["status_code"], outcome["error"])
+
+    # AIMD mantığı
+    def _is_overload_signal(self, success: bool, status_code: Optional[int], error: Optional[str]) -> bool:
+        """Timeout, 429 veya 5xx durumlarını tespit et"""
+        if status_code is not None and status_code in OVERLOAD_STATUS_CODES:
+            return True
+        if not success and error and "timeout" in str(error).lower():
+            return True
+        return False
+
+    def _is_slow(self, latency: float) -> bool:
+        """Gecikme referans değerin çok üzerinde mi?"""
+        if self.baseline_latency is None:
+            return False
+        return latency > self.baseline_latency * self.latency_tolerance
+
+    def _update_baseline(self, latency: float):
+        """Referans gecikmeyi EWMA ile güncelle"""
+        if self.baseline_latency is None:
+            self.baseline_latency = latency
+        else:
+            self.baseline_latency = 0.8 * self.baseline_latency + 0.2 * latency
+
+    def _increase(self):
+        """Toplamsal artış - her tam limit turunda yaklaşık increase_step kadar"""
+        self.concurrency_limit = min(
+            float(self.max_concurrency),
+            self.concurrency_limit + self.increase_step / max(self.concurrency_limit, 1.0)
+        )
+        if self.rate is not None:
+            self.rate = min(self.max_rate, self.rate + 0.1 * self.increase_step)
+        self.limit_history.append((time.monotonic(), self.concurrency_limit, "increase"))
+
+    def _decrease(self, reason: str):
+        """Çarpımsal azalış - aynı yük dalgası için tekrar tekrar düşürmemek adına kısa bekleme"""
+        now = time.monotonic()
+        cooldown = self.baseline_latency if self.baseline_latency else 1.0
+        if now - self.last_decrease < cooldown:
+            return
+
+        self.last_decrease = now
+        self.backoff_events += 1
+        self.concurrency_limit = max(float(self.min_concurrency), self.concurrency_limit * self.decrease_factor)
+        if self.rate is not None:
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            self.tokens = min(self.tokens, 0.0)
+        self.limit_history.append((now, self.concurrency_limit, reason))
+        print(f"🐢 Geri çekiliyor ({reason}): eşzamanlılık limiti {self.concurrency_limit:.2f}")
+
+    def _refill_tokens(self):
+        """Token bucket'ı geçen süreye göre doldur"""
+        if self.rate is None:
+            return
+        now = time.monotonic()
+        elapsed = now - self.last_refill
+        self.last_refill = now
+        self.tokens = min(float(self.burst), self.tokens + elapsed * self.rate)
+
+    # Raporlama
+    def _roll_window(self, force: bool = False):
+        """Pencere süresi dolduysa istatistikleri kaydet"""
+        now = time.monotonic()
+        elapsed = now - self.window_start
+        if not force and elapsed < self.window_seconds:
+            return
+        if not self.window_latencies:
+            self.window_start = now
+            return
+
+        latencies = np.array(self.window_latencies)
+        self.windows.append({
+            "window_index": len(self.windows),
+            "duration_seconds": elapsed,
+            "requests": int(len(latencies)),
+            "errors": int(self.window_errors),
+            "throughput_per_minute": len(latencies) / elapsed * 60 if elapsed > 0 else 0,
+            "avg_latency_seconds": float(np.mean(latencies)),
+            "p95_latency_seconds": float(np.percentile(latencies, 95)),
+            "concurrency_limit": round(self.concurrency_limit, 2),
+            "rate_per_second": self.rate
+        })
+
+        self.window_start = now
+        self.window_latencies = []
+        self.window_errors = 0
+
+    def get_report(self) -> Dict:
+        """Pencere bazlı throughput ve gecikme raporu"""
+        with self.condition:
+            self._roll_window(force=True)
+
+            return {
+                "total_requests": self.total_requests,
+                "total_errors": self.total_errors,
+                "final_concurrency_limit": round(self.concurrency_limit, 2),
+                "final_rate_per_second": self.rate,
+                "baseline_latency_seconds": self.baseline_latency,
+                "backoff_events": self.backoff_events,
+                "recent_limit_changes": [
+                    {"concurrency_limit": round(limit, 2), "reason": reason}
+                    for _, limit, reason in list(self.limit_history)[-20:]
+                ],
+                "windows": list(self.windows)
+            }
+
+    def reset_stats(self):
+        """Yeni batch için istatistikleri sıfırla (öğrenilen limitler korunur)"""
+        with self.condition:
+            self.window_start = time.monotonic()
+            self.window_latencies = []
+            self.window_errors = 0
+            self.windows = []
+            self.total_requests = 0
+            self.total_errors = 0
+            self.backoff_events = 0
@@ -4,6 +4,7 @@ Fraud Detection Analysis Starter Script
 Kolay başlatma ve kullanım için wrapper script
 """
 
+import importlib.util
 import os
 import sys
 import subprocess
@@ -22,10 +23,9 @@ def check_requirements():
 
     missing_modules = []
 
+    # Modüller import edilmeden sadece kurulu olup olmadıkları kontrol edilir (hızlı başlangıç)
     for module in required_modules:
-        try:
-            __import__(module)
-        except ImportError:
+        if importlib.util.find_spec(module) is None:
             missing_modules.append(module)
 
     if missing_modules:
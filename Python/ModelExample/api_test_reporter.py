@@ -13,6 +13,8 @@ import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import json
+import os
+import sys
 import time
 from datetime import datetime
 import warnings
@@ -22,7 +24,130 @@ warnings.filterwarnings('ignore')
 # HTML template için
 from jinja2 import Template
 import base64
-from io import BytesIO
+
+# Ortak modüller (chart_renderer) Python/ kökünde
+PYTHON_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PYTHON_ROOT not in sys.path:
+    sys.path.append(PYTHON_ROOT)
+
+from chart_renderer import ChartRenderQueue, DEFAULT_DPI
+
+
+def render_training_times(data, output_path, dpi):
+    """Model eğitim süreleri grafiği (render kuyruğu için)"""
+    plt.style.use('seaborn-v0_8')
+    sns.set_palette("husl")
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    models = data['models']
+    times = data['times']
+
+    bars = ax.bar(models, times, color=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4'])
+    ax.set_title('Model Eğitim Süreleri Karşılaştırması', fontsize=16, fontweight='bold')
+    ax.set_ylabel('Süre (saniye)')
+    ax.set_xlabel('Model Tipleri')
+
+    # Bar'ların üstüne değerleri yaz
+    for bar, time in zip(bars, times):
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width() / 2., height + 0.1,
+                f'{time:.1f}s', ha='center', va='bottom')
+
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=dpi, bbox_inches='tight')
+    plt.close()
+
+
+def render_performance_metrics(data, output_path, dpi):
+    """Model performans metrikleri grafiği (render kuyruğu için)"""
+    plt.style.use('seaborn-v0_8')
+    sns.set_palette("husl")
+
+    metrics_df = pd.DataFrame(data['model_metrics']).T
+
+    fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+    fig.suptitle('Model Performans Metrikleri', fontsize=16, fontweight='bold', y=0.98)
+
+    # Accuracy
+    if 'Accuracy' in metrics_df.columns:
+        axes[0, 0].bar(metrics_df.index, metrics_df['Accuracy'], color='#FF6B6B')
+        axes[0, 0].set_title('Accuracy')
+        axes[0, 0].set_ylim(0, 1)
+        for i, v in enumerate(metrics_df['Accuracy']):
+            axes[0, 0].text(i, v + 0.01, f'{v:.3f}', ha='center')
+
+    # Precision
+    if 'Precision' in metrics_df.columns:
+        axes[0, 1].bar(metrics_df.index, metrics_df['Precision'], color='#4ECDC4')
+        axes[0, 1].set_title('Precision')
+        axes[0, 1].set_ylim(0, 1)
+        for i, v in enumerate(metrics_df['Precision']):
+            axes[0, 1].text(i, v + 0.01, f'{v:.3f}', ha='center')
+
+    # Recall
+    if 'Recall' in metrics_df.columns:
+        axes[1, 0].bar(metrics_df.index, metrics_df['Recall'], color='#45B7D1')
+        axes[1, 0].set_title('Recall')
+        axes[1, 0].set_ylim(0, 1)
+        for i, v in enumerate(metrics_df['Recall']):
+            axes[1, 0].text(i, v + 0.01, f'{v:.3f}', ha='center')
+
+    # F1 Score
+    if 'F1Score' in metrics_df.columns:
+        axes[1, 1].bar(metrics_df.index, metrics_df['F1Score'], color='#96CEB4')
+        axes[1, 1].set_title('F1 Score')
+        axes[1, 1].set_ylim(0, 1)
+        for i, v in enumerate(metrics_df['F1Score']):
+            axes[1, 1].text(i, v + 0.01, f'{v:.3f}', ha='center')
+
+    for ax in axes.flat:
+        ax.tick_params(axis='x', rotation=45)
+
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=dpi, bbox_inches='tight')
+    plt.close()
+
+
+def render_probability_distribution(data, output_path, dpi):
+    """Tahmin probability dağılımı grafiği (render kuyruğu için)"""
+    plt.style.use('seaborn-v0_8')
+    sns.set_palette("husl")
+
+    successful_predictions = data['predictions']
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+    fig.suptitle('Tahmin Probability Dağılımları', fontsize=16, fontweight='bold')
+
+    # Model bazında probability dağılımı
+    prob_data = {}
+    for pred in successful_predictions:
+        model = pred['model_name']
+        if model not in prob_data:
+            prob_data[model] = []
+        prob_data[model].append(pred['probability'])
+
+    # Box plot
+    ax1.boxplot([prob_data[model] for model in prob_data.keys()],
+                labels=list(prob_data.keys()))
+    ax1.set_title('Model Bazında Probability Dağılımı')
+    ax1.set_ylabel('Fraud Probability')
+    ax1.tick_params(axis='x', rotation=45)
+
+    # Fraud vs Normal histogram
+    fraud_probs = [p['probability'] for p in successful_predictions if p['actual_fraud']]
+    normal_probs = [p['probability'] for p in successful_predictions if not p['actual_fraud']]
+
+    ax2.hist(normal_probs, alpha=0.7, label='Normal Transactions', bins=20, color='green')
+    ax2.hist(fraud_probs, alpha=0.7, label='Fraud Transactions', bins=20, color='red')
+    ax2.set_title('Fraud vs Normal Transaction Probabilities')
+    ax2.set_xlabel('Fraud Probability')
+    ax2.set_ylabel('Frequency')
+    ax2.legend()
+
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=dpi, bbox_inches='tight')
+    plt.close()
 
 
 class AdvancedMLAPITester:
@@ -30,8 +155,13 @@ class AdvancedMLAPITester:
     Advanced ML API Test ve Rapor Sınıfı
     """
 
-    def __init__(self, base_url="http://localhost:5000"):
+    def __init__(self, base_url="http://localhost:5000", render_mode="process", chart_dpi=DEFAULT_DPI,
+                 chart_dir="test_charts"):
         self.base_url = base_url
+        self.chart_dir = chart_dir
+        self.render_queue = ChartRenderQueue(mode=render_mode, dpi=chart_dpi,
+                                             cache_dir=os.path.join(chart_dir, '.chart_cache'))
+        self.session = requests.Session()
         self.test_results = []
         self.model_metrics = {}
         self.prediction_results = []
@@ -212,44 +342,30 @@ class AdvancedMLAPITester:
 
             model_predictions = []
 
-            # İlk 20 transaction ile test et
-            for transaction in self.sample_transactions[:20]:
-                try:
-                    # Advanced model endpoint'ini kullan
-                    response = requests.post(
-                        f"{self.base_url}/api/model/predict/advanced/{model_name}",
-                        json=transaction,
-                        timeout=30
-                    )
-
-                    if response.status_code == 200:
-                        result = response.json()
-
-                        prediction = {
-                            'transaction_id': transaction['transactionId'],
-                            'model_name': model_name,
-                            'predicted_fraud': result.get('IsFraudulent', False),
-                            'probability': result.get('Probability', 0.0),
-                            'confidence': result.get('Confidence', 0.0),
-                            'actual_fraud': transaction['actual_fraud'],
-                            'amount': transaction['amount'],
-                            'time_hour': int(transaction['time'] / 3600) % 24,
-                            'success': True
-                        }
-                    else:
-                        prediction = {
-                            'transaction_id': transaction['transactionId'],
-                            'model_name': model_name,
-                            'success': False,
-                            'error': response.text
-                        }
+            # İlk 20 transaction ile test et - tek istekte toplu tahmin
+            transactions = self.sample_transactions[:20]
+            outcomes = self.predict_many(model_name, transactions)
 
-                except Exception as e:
+            for transaction, (result, error) in zip(transactions, outcomes):
+                if error is None:
+                    is_fraud, probability, confidence = self._prediction_fields(result)
+                    prediction = {
+                        'transaction_id': transaction['transactionId'],
+                        'model_name': model_name,
+                        'predicted_fraud': is_fraud,
+                        'probability': probability,
+                        'confidence': confidence,
+                        'actual_fraud': transaction['actual_fraud'],
+                        'amount': transaction['amount'],
+                        'time_hour': int(transaction['time'] / 3600) % 24,
+                        'success': True
+                    }
+                else:
                     prediction = {
                         'transaction_id': transaction['transactionId'],
                         'model_name': model_name,
                         'success': False,
-                        'error': str(e)
+                        'error': error
                     }
 
                 model_predictions.append(prediction)
@@ -301,6 +417,78 @@ class AdvancedMLAPITester:
 
         return prediction_results
 
+    @staticmethod
+    def _prediction_fields(result):
+        """
+        Tahmin yanıtından (is_fraud, probability, confidence)
+
+        Toplu endpoint sonucu iç içe 'prediction' nesnesi (camelCase), tekil
+        advanced endpoint ise üst seviyede PascalCase alanlar döndürür.
+        """
+        nested = result.get('prediction')
+        if isinstance(nested, dict):
+            return (nested.get('isFraudulent', False), nested.get('probability', 0.0),
+                    nested.get('confidence', 0.0))
+        return (result.get('IsFraudulent', False), result.get('Probability', 0.0),
+                result.get('Confidence', 0.0))
+
+    def predict_many(self, model_name, transactions, chunk_size=50):
+        """
+        Transaction'ları toplu tahmin endpoint'i (/api/model/predict/batch, model
+        modelType alanıyla seçilir) ile chunk'lar halinde tahmin et
+
+        Sunucu toplu endpoint'i desteklemiyorsa (404/405) tek tek isteğe düşer.
+
+        Returns:
+            Girdi sırasıyla (sonuç, hata) listesi - başarılıysa hata None
+        """
+        outcomes = []
+        bulk_url = f"{self.base_url}/api/model/predict/batch"
+        single_url = f"{self.base_url}/api/model/predict/advanced/{model_name}"
+        bulk_supported = True
+
+        for start in range(0, len(transactions), chunk_size):
+            chunk = transactions[start:start + chunk_size]
+
+            if bulk_supported:
+                try:
+                    response = self.session.post(bulk_url, json={'transactions': chunk, 'modelType': model_name},
+                                                 timeout=60)
+
+                    if response.status_code in (404, 405):
+                        bulk_supported = False
+                    elif response.status_code == 200:
+                        items = {item.get('index', i): item
+                                 for i, item in enumerate(response.json().get('results', []))}
+                        for i in range(len(chunk)):
+                            item = items.get(i)
+                            if item is None:
+                                outcomes.append((None, 'Missing result in batch response'))
+                            elif item.get('success', True):
+                                outcomes.append((item, None))
+                            else:
+                                outcomes.append((None, item.get('error', 'Unknown error')))
+                        continue
+                    else:
+                        outcomes.extend([(None, response.text)] * len(chunk))
+                        continue
+                except Exception as e:
+                    outcomes.extend([(None, str(e))] * len(chunk))
+                    continue
+
+            # Toplu endpoint yok - tek tek tahmin
+            for transaction in chunk:
+                try:
+                    response = self.session.post(single_url, json=transaction, timeout=30)
+                    if response.status_code == 200:
+                        outcomes.append((response.json(), None))
+                    else:
+                        outcomes.append((None, response.text))
+                except Exception as e:
+                    outcomes.append((None, str(e)))
+
+        return outcomes
+
     def test_model_comparison(self):
         """Model karşılaştırma API'sini test et"""
         print("\n⚖️  Model karşılaştırma testi...")
@@ -330,134 +518,43 @@ class AdvancedMLAPITester:
 
         visualizations = {}
 
+        # Matplotlib grafikleri arka planda paralel çizilir, aynı veriyle tekrar çizilmez
+        charts = {}
+
         # 1. Model Training Times Comparison
         if self.test_results:
             training_data = [r for r in self.test_results if r.get('success', False)]
 
             if training_data:
-                fig, ax = plt.subplots(figsize=(10, 6))
-                models = [r['model_name'] for r in training_data]
-                times = [r['training_time'] for r in training_data]
-
-                bars = ax.bar(models, times, color=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4'])
-                ax.set_title('Model Eğitim Süreleri Karşılaştırması', fontsize=16, fontweight='bold')
-                ax.set_ylabel('Süre (saniye)')
-                ax.set_xlabel('Model Tipleri')
-
-                # Bar'ların üstüne değerleri yaz
-                for bar, time in zip(bars, times):
-                    height = bar.get_height()
-                    ax.text(bar.get_x() + bar.get_width() / 2., height + 0.1,
-                            f'{time:.1f}s', ha='center', va='bottom')
-
-                plt.xticks(rotation=45)
-                plt.tight_layout()
-
-                # Base64'e çevir
-                buffer = BytesIO()
-                plt.savefig(buffer, format='png', dpi=300, bbox_inches='tight')
-                buffer.seek(0)
-                training_chart = base64.b64encode(buffer.getvalue()).decode()
-                plt.close()
-
-                visualizations['training_times'] = training_chart
+                charts['training_times'] = self.render_queue.submit(render_training_times, {
+                    'models': [r['model_name'] for r in training_data],
+                    'times': [r['training_time'] for r in training_data]
+                }, os.path.join(self.chart_dir, 'training_times.png'))
 
         # 2. Model Performance Metrics
         if self.model_metrics:
-            metrics_df = pd.DataFrame(self.model_metrics).T
-
-            if not metrics_df.empty:
-                fig, axes = plt.subplots(2, 2, figsize=(15, 12))
-                fig.suptitle('Model Performans Metrikleri', fontsize=16, fontweight='bold', y=0.98)
-
-                # Accuracy
-                if 'Accuracy' in metrics_df.columns:
-                    axes[0, 0].bar(metrics_df.index, metrics_df['Accuracy'], color='#FF6B6B')
-                    axes[0, 0].set_title('Accuracy')
-                    axes[0, 0].set_ylim(0, 1)
-                    for i, v in enumerate(metrics_df['Accuracy']):
-                        axes[0, 0].text(i, v + 0.01, f'{v:.3f}', ha='center')
-
-                # Precision
-                if 'Precision' in metrics_df.columns:
-                    axes[0, 1].bar(metrics_df.index, metrics_df['Precision'], color='#4ECDC4')
-                    axes[0, 1].set_title('Precision')
-                    axes[0, 1].set_ylim(0, 1)
-                    for i, v in enumerate(metrics_df['Precision']):
-                        axes[0, 1].text(i, v + 0.01, f'{v:.3f}', ha='center')
-
-                # Recall
-                if 'Recall' in metrics_df.columns:
-                    axes[1, 0].bar(metrics_df.index, metrics_df['Recall'], color='#45B7D1')
-                    axes[1, 0].set_title('Recall')
-                    axes[1, 0].set_ylim(0, 1)
-                    for i, v in enumerate(metrics_df['Recall']):
-                        axes[1, 0].text(i, v + 0.01, f'{v:.3f}', ha='center')
-
-                # F1 Score
-                if 'F1Score' in metrics_df.columns:
-                    axes[1, 1].bar(metrics_df.index, metrics_df['F1Score'], color='#96CEB4')
-                    axes[1, 1].set_title('F1 Score')
-                    axes[1, 1].set_ylim(0, 1)
-                    for i, v in enumerate(metrics_df['F1Score']):
-                        axes[1, 1].text(i, v + 0.01, f'{v:.3f}', ha='center')
-
-                for ax in axes.flat:
-                    ax.tick_params(axis='x', rotation=45)
-
-                plt.tight_layout()
-
-                buffer = BytesIO()
-                plt.savefig(buffer, format='png', dpi=300, bbox_inches='tight')
-                buffer.seek(0)
-                metrics_chart = base64.b64encode(buffer.getvalue()).decode()
-                plt.close()
-
-                visualizations['performance_metrics'] = metrics_chart
+            charts['performance_metrics'] = self.render_queue.submit(
+                render_performance_metrics, {'model_metrics': self.model_metrics},
+                os.path.join(self.chart_dir, 'performance_metrics.png'))
 
         # 3. Prediction Probability Distribution
         if self.prediction_results:
-            successful_predictions = [p for p in self.prediction_results if p.get('success', False)]
+            successful_predictions = [
+                {'model_name': p['model_name'], 'probability': p['probability'], 'actual_fraud': p['actual_fraud']}
+                for p in self.prediction_results if p.get('success', False)
+            ]
 
             if successful_predictions:
-                fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-                fig.suptitle('Tahmin Probability Dağılımları', fontsize=16, fontweight='bold')
-
-                # Model bazında probability dağılımı
-                prob_data = {}
-                for pred in successful_predictions:
-                    model = pred['model_name']
-                    if model not in prob_data:
-                        prob_data[model] = []
-                    prob_data[model].append(pred['probability'])
-
-                # Box plot
-                ax1.boxplot([prob_data[model] for model in prob_data.keys()],
-                            labels=list(prob_data.keys()))
-                ax1.set_title('Model Bazında Probability Dağılımı')
-                ax1.set_ylabel('Fraud Probability')
-                ax1.tick_params(axis='x', rotation=45)
-
-                # Fraud vs Normal histogram
-                fraud_probs = [p['probability'] for p in successful_predictions if p['actual_fraud']]
-                normal_probs = [p['probability'] for p in successful_predictions if not p['actual_fraud']]
-
-                ax2.hist(normal_probs, alpha=0.7, label='Normal Transactions', bins=20, color='green')
-                ax2.hist(fraud_probs, alpha=0.7, label='Fraud Transactions', bins=20, color='red')
-                ax2.set_title('Fraud vs Normal Transaction Probabilities')
-                ax2.set_xlabel('Fraud Probability')
-                ax2.set_ylabel('Frequency')
-                ax2.legend()
-
-                plt.tight_layout()
-
-                buffer = BytesIO()
-                plt.savefig(buffer, format='png', dpi=300, bbox_inches='tight')
-                buffer.seek(0)
-                probability_chart = base64.b64encode(buffer.getvalue()).decode()
-                plt.close()
-
-                visualizations['probability_distribution'] = probability_chart
+                charts['probability_distribution'] = self.render_queue.submit(
+                    render_probability_distribution, {'predictions': successful_predictions},
+                    os.path.join(self.chart_dir, 'probability_distribution.png'))
+
+        # Çizimleri bekle ve Base64'e çevir
+        self.render_queue.wait()
+        for name, path in charts.items():
+            if path and os.path.exists(path):
+                with open(path, 'rb') as f:
+                    visualizations[name] = base64.b64encode(f.read()).decode()
 
         # 4. Interactive Plotly Chart - Model Comparison Radar
         if self.model_metrics:
@@ -857,6 +954,7 @@ class AdvancedMLAPITester:
 
         # 5. Generate Report
         report_file = self.generate_html_report(visualizations)
+        self.render_queue.shutdown()
 
         print("\n" + "=" * 60)
         print("🎉 Test Suite Tamamlandı!")
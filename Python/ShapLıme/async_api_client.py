@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Asenkron Fraud Detection API Client (Explainability)
+.NET API'ye havuzlanmış bağlantılarla eşzamanlı tahmin isteği atan client
+"""
+
+import asyncio
+import json
+import time
+from typing import Dict, List, Optional
+
+try:
+    import aiohttp
+
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    print("⚠️  aiohttp not available. AsyncFraudDetectionAPIClient will be disabled.")
+    AIOHTTP_AVAILABLE = False
+
+from python_api_explainer import FraudDetectionAPIClient
+
+
+class AsyncFraudDetectionAPIClient(FraudDetectionAPIClient):
+    """
+    FraudDetectionAPIClient'ın asyncio sürümü
+
+    Transaction formatlama ve yanıt dönüştürme mantığı senkron client'tan
+    devralınır; sadece taşıma katmanı aiohttp ile değiştirilir.
+    """
+
+    def __init__(self,
+                 base_url: str = "http://localhost:5112",
+                 timeout: int = 300,
+                 max_connections: int = 100,
+                 max_concurrency: int = 200):
+        """
+        Async API Client'ı başlat
+
+        Args:
+            base_url: API'nin base URL'i
+            timeout: Varsayılan istek timeout süresi (saniye)
+            max_connections: Bağlantı havuzundaki maksimum TCP bağlantısı
+            max_concurrency: Aynı anda uçuşta olabilecek maksimum istek
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("AsyncFraudDetectionAPIClient için aiohttp gerekli: pip install aiohttp")
+
+        super().__init__(base_url=base_url, timeout=timeout)
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+
+        # aiohttp session ve semaphore event loop içinde oluşturulur
+        self.async_session = None
+        self.semaphore = None
+
+        self.request_count = 0
+        self.error_count = 0
+        self.total_latency = 0.0
+
+    async def __aenter__(self):
+        await self._ensure_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _ensure_session(self):
+        """Session'ı çalışan event loop içinde tembel olarak oluştur"""
+        if self.async_session is None or self.async_session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections,
+                                             limit_per_host=self.max_connections)
+            self.async_session = aiohttp.ClientSession(
+                connector=connector,
+                headers={
+                    'Content-Type': 'application/json',
+                    'Accept': 'application/json'
+                }
+            )
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def close(self):
+        """Bağlantı havuzunu kapat"""
+        if self.async_session is not None and not self.async_session.closed:
+            await self.async_session.close()
+        self.async_session = None
+
+    async def _make_request(self, method: str, endpoint: str, data: Dict = None,
+                            params: Dict = None, timeout: Optional[float] = None,
+                            format_response: bool = True) -> Dict:
+        """
+        API'ye asenkron istek gönder
+
+        Args:
+            method: HTTP method (GET, POST)
+            endpoint: API endpoint
+            data: POST data
+            params: Query parameters
+            timeout: Bu çağrıya özel timeout (saniye)
+            format_response: Yanıt tek tahmin formatına dönüştürülsün mü?
+
+        Returns:
+            API response dict
+        """
+        url = f"{self.base_url}/api/model{endpoint}"
+        await self._ensure_session()
+
+        if method.upper() not in ('GET', 'POST'):
+            raise ValueError(f"Desteklenmeyen HTTP method: {method}")
+
+        call_timeout = aiohttp.ClientTimeout(total=timeout if timeout is not None else self.timeout)
+
+        async with self.semaphore:
+            start = time.monotonic()
+            try:
+                async with self.async_session.request(method.upper(), url, json=data, params=params,
+                                                      timeout=call_timeout) as response:
+                    body = await response.read()
+                    if response.status == 200:
+                        result = json.loads(body)
+                        return self._format_api_response(result) if format_response else result
+
+                    self.error_count += 1
+                    print(f"❌ İstek başarısız: {response.status}")
+                    return {"error": body.decode('utf-8', errors='replace'), "status_code": response.status}
+
+            except asyncio.TimeoutError:
+                self.error_count += 1
+                print(f"⏰ İstek timeout oldu ({call_timeout.total}s)")
+                return {"error": "Request timeout", "status_code": 408}
+            except aiohttp.ClientConnectionError:
+                self.error_count += 1
+                print(f"🔌 Bağlantı hatası: {url}")
+                return {"error": "Connection error", "status_code": 503}
+            except Exception as e:
+                self.error_count += 1
+                print(f"🚨 Beklenmeyen hata: {str(e)}")
+                return {"error": str(e), "status_code": 500}
+            finally:
+                self.request_count += 1
+                self.total_latency += time.monotonic() - start
+
+    # Tahmin metodları
+    async def predict(self, transaction_data: Dict, timeout: Optional[float] = None) -> Dict:
+        """Genel tahmin yap"""
+        formatted_transaction = self._format_transaction_for_api(transaction_data)
+        return await self._make_request("POST", "/predict", data=formatted_transaction, timeout=timeout)
+
+    async def predict_with_model(self, model_type: str, transaction_data: Dict,
+                                 timeout: Optional[float] = None) -> Dict:
+        """Belirli bir modelle tahmin yap"""
+        formatted_transaction = self._format_transaction_for_api(transaction_data)
+        return await self._make_request("POST", f"/{model_type}/predict", data=formatted_transaction,
+                                        timeout=timeout)
+
+    async def predict_concurrently(self, transactions: List[Dict], model_type: Optional[str] = None,
+                                   timeout: Optional[float] = None) -> List[Dict]:
+        """Çok sayıda transaction'ı aynı anda tahmin et (sonuçlar girdi sırasıyla döner)"""
+        if model_type:
+            tasks = [self.predict_with_model(model_type, tx, timeout=timeout) for tx in transactions]
+        else:
+            tasks = [self.predict(tx, timeout=timeout) for tx in transactions]
+        return await asyncio.gather(*tasks)
+
+    async def predict_many(self, transactions: List[Dict], chunk_size: int = 100,
+                           model_type: Optional[str] = None,
+                           timeout: Optional[float] = None) -> Dict:
+        """
+        Çok sayıda transaction'ı toplu tahmin endpoint'i ile tahmin et
+
+        Chunk'lar eşzamanlı gönderilir; sunucu toplu endpoint'i desteklemiyorsa
+        (404/405) transaction'lar tek tek ve eşzamanlı tahmin edilir.
+        """
+        chunk_size = max(1, chunk_size)
+        starts = list(range(0, len(transactions), chunk_size))
+
+        async def send_chunk(start: int) -> Dict:
+            chunk = transactions[start:start + chunk_size]
+            payload = {"transactions": [self._format_transaction_for_api(tx) for tx in chunk]}
+            if model_type:
+                payload["modelType"] = model_type
+            return await self._make_request("POST", "/predict/batch", data=payload, timeout=timeout,
+                                            format_response=False)
+
+        responses = await asyncio.gather(*[send_chunk(start) for start in starts])
+
+        if any(r.get("status_code") in (404, 405) for r in responses):
+            print("⚠️ Toplu tahmin endpoint'i yok, tek tek tahmine geçiliyor")
+            single_model = model_type if model_type and model_type.lower() != "ensemble" else None
+            results = await self.predict_concurrently(transactions, model_type=single_model, timeout=timeout)
+        else:
+            results = [None] * len(transactions)
+            for start, response in zip(starts, responses):
+                size = min(chunk_size, len(transactions) - start)
+                if "results" not in response:
+                    for offset in range(size):
+                        results[start + offset] = {"error": response.get("error", "Unknown error"),
+                                                   "status_code": response.get("status_code")}
+                    continue
+
+                for offset, item in enumerate(response["results"]):
+                    index = item.get("index", offset)
+                    if 0 <= index < size:
+                        if item.get("success", True):
+                            results[start + index] = self._format_api_response(item)
+                        else:
+                            results[start + index] = {"error": item.get("error", "Unknown error"),
+                                                      "status_code": item.get("status_code", 500)}
+
+                for offset in range(size):
+                    if results[start + offset] is None:
+                        results[start + offset] = {"error": "Missing result in batch response", "status_code": 500}
+
+        failed_indices = [i for i, r in enumerate(results) if "error" in r]
+        return {
+            "results": results,
+            "succeeded": len(transactions) - len(failed_indices),
+            "failed": len(failed_indices),
+            "failed_indices": failed_indices,
+            "chunks": len(starts)
+        }
+
+    # Model bilgileri
+    async def get_model_metrics(self, model_name: str, timeout: Optional[float] = None) -> Dict:
+        """Model metriklerini al"""
+        return await self._make_request("GET", f"/{model_name}/metrics", timeout=timeout)
+
+    async def get_performance_summary(self, model_name: str, timeout: Optional[float] = None) -> Dict:
+        """Model performans özetini al"""
+        return await self._make_request("GET", f"/{model_name}/performance-summary", timeout=timeout)
+
+    async def compare_models(self, model_names: List[str], timeout: Optional[float] = None) -> Dict:
+        """Modelleri karşılaştır"""
+        return await self._make_request("POST", "/compare", data=model_names, timeout=timeout)
+
+    # Health check
+    async def health_check(self) -> bool:
+        """API'nin sağlıklı olup olmadığını kontrol et"""
+        await self._ensure_session()
+        short_timeout = aiohttp.ClientTimeout(total=5)
+        try:
+            try:
+                async with self.async_session.get(f"{self.base_url}/health", timeout=short_timeout) as response:
+                    return response.status == 200
+            except aiohttp.ClientError:
+                # Health endpoint yoksa ana API endpoint'ini test et
+                async with self.async_session.get(f"{self.base_url}/api/model", timeout=short_timeout) as response:
+                    return response.status in [200, 404]
+        except Exception:
+            return False
+
+    def get_stats(self) -> Dict:
+        """İstek istatistikleri"""
+        return {
+            "request_count": self.request_count,
+            "error_count": self.error_count,
+            "avg_latency_seconds": self.total_latency / self.request_count if self.request_count else 0.0
+        }
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Batch Stream - Büyük batch açıklama çalışmaları için akışlı girdi/çıktı
+Transaction'lar parça parça okunur, sonuçlar tamamlandıkça JSONL'e yazılır ve
+özet rapor için sabit bellekli birikimli istatistikler tutulur
+"""
+
+import heapq
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterator, List
+
+import pandas as pd
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+INPUT_FORMATS = ('.json', '.jsonl', '.ndjson', '.csv')
+
+# Yüksek risk eşiği (özet rapordaki tanım)
+HIGH_RISK_THRESHOLD = 0.7
+
+
+def iter_transaction_chunks(path: str, chunk_size: int = 1000, skip: int = 0) -> Iterator[List[Dict]]:
+    """
+    Transaction dosyasını chunk_size'lık listeler halinde oku
+
+    CSV pandas chunksize ile, JSONL satır satır okunur. JSON dizileri ijson kuruluysa
+    akışlı, değilse tek seferde okunur.
+
+    Args:
+        path: .json, .jsonl/.ndjson veya .csv dosyası
+        chunk_size: Chunk başına transaction sayısı
+        skip: Baştan atlanacak transaction sayısı (devam ettirme için)
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in INPUT_FORMATS:
+        raise ValueError(f"Desteklenmeyen girdi formatı: {extension} ({', '.join(INPUT_FORMATS)})")
+
+    if extension == '.csv':
+        seen = 0
+        for frame in pd.read_csv(path, chunksize=chunk_size):
+            if seen + len(frame) <= skip:
+                seen += len(frame)
+                continue
+            records = frame.to_dict('records')[max(0, skip - seen):]
+            seen += len(frame)
+            yield records
+        return
+
+    chunk = []
+    for index, transaction in enumerate(_iter_json_records(path, extension)):
+        if index < skip:
+            continue
+        chunk.append(transaction)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _iter_json_records(path: str, extension: str) -> Iterator[Dict]:
+    """JSON / JSONL dosyasındaki transaction'ları tek tek döndür"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if extension in ('.jsonl', '.ndjson'):
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+            return
+
+        if IJSON_AVAILABLE:
+            # Dosya tek bir nesne ise ilk karakterden anlaşılır
+            first = f.read(1)
+            while first.isspace():
+                first = f.read(1)
+            f.seek(0)
+            if first == '[':
+                yield from ijson.items(f, 'item', use_float=True)
+                return
+
+        data = json.load(f)
+        if isinstance(data, list):
+            yield from data
+        else:
+            yield data
+
+
+def chunk_error_records(chunk: List[Dict], index_offset: int, error: str, start: int = 0) -> List[Dict]:
+    """Chunk'ın start'tan itibaren tüm transaction'ları için hata kaydı (satır sayısı girdiyle hizalı kalır)"""
+    return [
+        {
+            'transaction_index': index_offset + i,
+            'transaction_id': chunk[i].get('transactionId', 'unknown'),
+            'error': error
+        }
+        for i in range(start, len(chunk))
+    ]
+
+
+def count_jsonl_lines(path: str) -> int:
+    """
+    Var olan JSONL çıktısındaki tamamlanmış kayıt sayısı
+
+    Yalnızca satır sonu ile biten satırlar sayılır; yazım sırasında kesilen son
+    satır tamamlanmış sayılmaz (JsonlResultWriter devam ederken onu siler).
+    """
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'r', encoding='utf-8') as f:
+        return sum(1 for line in f if line.endswith('\n') and line.strip())
+
+
+def truncate_partial_jsonl(path: str, block_size: int = 65536) -> int:
+    """
+    Dosyayı son satır sonuna kadar kısalt (kesilmiş son satırı at)
+
+    Returns:
+        Silinen byte sayısı
+    """
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'rb+') as f:
+        size = f.seek(0, os.SEEK_END)
+        end = size
+        while end > 0:
+            start = max(0, end - block_size)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b'\n')
+            if newline != -1:
+                end = start + newline + 1
+                break
+            end = start
+        if end < size:
+            f.truncate(end)
+        return size - end
+
+
+class BatchAggregates:
+    """
+    Özet rapor için birikimli istatistikler
+
+    Sonuç listesi tutulmaz; sayaçlar, olasılık toplamı, en yüksek riskli
+    max_high_risk transaction (min-heap) ve ilk max_errors hata saklanır.
+    """
+
+    def __init__(self, max_high_risk: int = 100, max_errors: int = 100):
+        self.max_high_risk = max_high_risk
+        self.max_errors = max_errors
+
+        self.timestamp = datetime.now().isoformat()
+        self.successful = 0
+        self.failed = 0
+        self.high_risk_count = 0
+        self.probability_sum = 0.0
+        self.decisions = {}
+
+        self.high_risk = []  # (probability, sıra, transaction_id) min-heap
+        self.errors = []
+
+    def add_result(self, result: Dict):
+        """Başarılı açıklamayı istatistiklere ekle"""
+        self.successful += 1
+
+        probability = float(result.get('api_prediction', {}).get('Probability', '0.0'))
+        self.probability_sum += probability
+
+        decision = result.get('business_explanation', {}).get('summary', {}).get('decision')
+        if decision:
+            self.decisions[decision] = self.decisions.get(decision, 0) + 1
+
+        if probability > HIGH_RISK_THRESHOLD:
+            self.high_risk_count += 1
+            item = (probability, self.high_risk_count, result.get('transaction_id', 'N/A'))
+            if len(self.high_risk) < self.max_high_risk:
+                heapq.heappush(self.high_risk, item)
+            elif item > self.high_risk[0]:
+                heapq.heapreplace(self.high_risk, item)
+
+    def add_error(self, error: Dict):
+        """Başarısız açıklamayı istatistiklere ekle"""
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(error)
+
+    def summary(self) -> Dict:
+        """Rapor için özet sözlüğü"""
+        total = self.successful + self.failed
+        return {
+            'timestamp': self.timestamp,
+            'total_transactions': total,
+            'successful_explanations': self.successful,
+            'failed_explanations': self.failed,
+            'high_risk_count': self.high_risk_count,
+            'mean_probability': self.probability_sum / self.successful if self.successful else 0.0,
+            'decisions': dict(self.decisions),
+            'high_risk': [
+                {'transaction_id': transaction_id, 'probability': probability}
+                for probability, _, transaction_id in sorted(self.high_risk, reverse=True)
+            ],
+            'errors': list(self.errors)
+        }
+
+
+class JsonlResultWriter:
+    """
+    Batch sonuçlarını tamamlandıkça JSONL'e yazan sink
+
+    Her transaction tek satırdır (başarılı sonuç veya {"error": ...} kaydı), böylece
+    çalışma yarıda kesilse bile yazılan satırlar geçerli kalır ve satır sayısı
+    kaldığı yerden devam etmek için kullanılabilir.
+    """
+
+    def __init__(self, path: str, aggregates: BatchAggregates, resume: bool = False):
+        """
+        Args:
+            path: Çıktı JSONL dosyası
+            aggregates: Güncellenecek birikimli istatistikler
+            resume: Var olan dosyaya ekle (istatistikler mevcut satırlardan yeniden kurulur)
+        """
+        self.path = path
+        self.aggregates = aggregates
+        self.written = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if resume and os.path.exists(path):
+            dropped = truncate_partial_jsonl(path)
+            if dropped:
+                print(f"⚠️ Çıktının yarım kalmış son satırı silindi ({dropped} byte), transaction yeniden işlenecek")
+            self._replay()
+        self.file = open(path, 'a' if resume else 'w', encoding='utf-8')
+
+    def _replay(self):
+        """Önceki çalışmanın satırlarını istatistiklere geri yükle"""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                if 'error' in record and 'api_prediction' not in record:
+                    self.aggregates.add_error(record)
+                else:
+                    self.aggregates.add_result(record)
+                self.written += 1
+
+    def _write(self, record: Dict):
+        self.file.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+        self.file.flush()
+        self.written += 1
+
+    def add_result(self, result: Dict):
+        self.aggregates.add_result(result)
+        self._write(result)
+
+    def add_error(self, error: Dict):
+        self.aggregates.add_error(error)
+        self._write(error)
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Explainer Cache - Model içerik hash'ine bağlı kalıcı explainer önbelleği
+Model dosyalarını indeksler ve SHAP/LIME explainer durumunu model dosyasının yanına kaydeder
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+import joblib
+
+# Explainer durumu formatı değişirse eski önbellekler geçersiz sayılır
+CACHE_VERSION = 1
+
+INDEX_FILE = '.model_index.json'
+EXPLAINER_SUFFIX = '.explainer'
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    """Dosyanın içerik hash'ini parça parça okuyarak hesapla"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _stat_entry(path: str) -> Dict:
+    """İndeks kaydı için dosya boyutu ve nanosaniye mtime"""
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _same_file_state(previous: Optional[Dict], current: Dict) -> bool:
+    """İki indeks kaydı aynı dosya içeriğini mi gösteriyor (boyut + mtime_ns)"""
+    return (previous is not None and previous.get('size') == current['size']
+            and previous.get('mtime_ns') == current['mtime_ns'])
+
+
+class ModelIndex:
+    """
+    Model dizininin kalıcı indeksi
+
+    Her load_model çağrısında os.walk yapmak yerine .joblib dosyaları ve
+    içerik hash'leri models_path altındaki indeks dosyasında tutulur.
+    İndeks, taranan dizinlerden biri son taramadan sonra değişince yenilenir;
+    hash'ler dosya boyutu ve mtime_ns aynı kaldıkça tekrar hesaplanmaz. Yerinde
+    üzerine yazılan dosya dizin mtime'ını değiştirmediğinden hash her sorguda
+    dosyanın kendi stat bilgisiyle doğrulanır.
+    """
+
+    def __init__(self, models_path: str):
+        self.models_path = models_path
+        self.index_path = os.path.join(models_path, INDEX_FILE)
+        self.dirs = []
+        self.files = {}
+        self.scanned_at = 0.0
+        self._load()
+
+    def _load(self):
+        """İndeksi diskten oku"""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                self.dirs = data.get('dirs', [])
+                self.files = data.get('files', {})
+                self.scanned_at = os.stat(self.index_path).st_mtime
+        except (OSError, ValueError):
+            self.dirs, self.files = [], {}
+
+    def _save(self):
+        """İndeksi diske yaz (yazılamazsa sadece bellekte kalır)"""
+        try:
+            with open(self.index_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'dirs': self.dirs, 'files': self.files}, f, indent=2)
+        except OSError as e:
+            print(f"⚠️ Model indeksi kaydedilemedi: {e}")
+
+    def _is_stale(self) -> bool:
+        """Taranan dizinlerden biri son taramadan sonra değiştiyse indeks eskidir"""
+        if not self.dirs:
+            return True
+        for path in self.dirs:
+            try:
+                if os.stat(path).st_mtime > self.scanned_at:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def refresh(self, force: bool = False):
+        """Gerekirse model dizinini yeniden tara"""
+        if not force and not self._is_stale():
+            return
+        if not os.path.isdir(self.models_path):
+            self.dirs, self.files = [], {}
+            return
+
+        self.scanned_at = time.time()
+        dirs, files = [], {}
+        for root, _, names in os.walk(self.models_path):
+            dirs.append(root)
+            for name in names:
+                if not name.endswith('.joblib'):
+                    continue
+                path = os.path.join(root, name)
+                entry = _stat_entry(path)
+
+                # Değişmemiş dosyaların hash'ini koru
+                previous = self.files.get(path)
+                if _same_file_state(previous, entry):
+                    entry['sha256'] = previous.get('sha256')
+                files[path] = entry
+
+        self.dirs, self.files = dirs, files
+        self._save()
+        if os.path.exists(self.index_path):
+            # İndeks dosyasının yazılması kök dizinin mtime'ını değiştirir
+            self.scanned_at = max(self.scanned_at, os.stat(self.index_path).st_mtime)
+
+    def find(self, model_name: str) -> Optional[str]:
+        """Model adını içeren en son model dosyasını bul"""
+        self.refresh()
+        matches = [path for path in self.files if model_name.lower() in os.path.basename(path).lower()]
+        return sorted(matches)[-1] if matches else None
+
+    def content_hash(self, path: str) -> str:
+        """Model dosyasının içerik hash'i (indekste yoksa veya dosya değiştiyse hesaplanır)"""
+        entry = self.files.get(path)
+        if entry is None:
+            self.refresh(force=True)
+            entry = self.files.get(path)
+
+        if entry is None:
+            return file_sha256(path)
+
+        # Yerinde üzerine yazılan model: boyut veya mtime_ns değiştiyse eski hash geçersiz
+        current = _stat_entry(path)
+        if not _same_file_state(entry, current):
+            entry.clear()
+            entry.update(current)
+
+        if not entry.get('sha256'):
+            entry['sha256'] = file_sha256(path)
+            self._save()
+        return entry['sha256']
+
+
+class ExplainerCache:
+    """
+    Explainer durumunu model dosyasının yanında saklayan önbellek
+
+    Dosya adı model içerik hash'ini taşır (model.joblib.explainer-<hash>), böylece
+    model yeniden eğitildiğinde eski durum kendiliğinden kullanılmaz.
+    """
+
+    def __init__(self, model_index: ModelIndex):
+        self.model_index = model_index
+
+    def _cache_path(self, model_path: str) -> str:
+        content_hash = self.model_index.content_hash(model_path)
+        return f"{model_path}{EXPLAINER_SUFFIX}-{content_hash[:16]}"
+
+    def load(self, model_path: str, feature_names: List[str]) -> Optional[Dict]:
+        """
+        Kayıtlı explainer durumunu yükle
+
+        Returns:
+            Durum dict'i veya (yoksa / uyumsuzsa) None
+        """
+        cache_path = self._cache_path(model_path)
+        if not os.path.exists(cache_path):
+            return None
+
+        try:
+            start = time.time()
+            state = joblib.load(cache_path)
+        except Exception as e:
+            print(f"⚠️ Explainer önbelleği okunamadı ({e}), yeniden kurulacak")
+            return None
+
+        if state.get('version') != CACHE_VERSION or state.get('feature_names') != feature_names:
+            return None
+
+        print(f"⚡ Explainer durumu önbellekten yüklendi ({time.time() - start:.2f}s): "
+              f"{os.path.basename(cache_path)}")
+        return state
+
+    def save(self, model_path: str, feature_names: List[str], state: Dict) -> Optional[str]:
+        """Explainer durumunu model dosyasının yanına kaydet"""
+        cache_path = self._cache_path(model_path)
+        state = dict(state, version=CACHE_VERSION, feature_names=feature_names)
+
+        # Eski hash'lere ait önbellekleri temizle
+        directory = os.path.dirname(model_path) or '.'
+        prefix = os.path.basename(model_path) + EXPLAINER_SUFFIX
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if name.startswith(prefix) and path != cache_path:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+        temp_path = cache_path + '.tmp'
+        try:
+            joblib.dump(state, temp_path)
+            os.replace(temp_path, cache_path)
+            print(f"💾 Explainer durumu kaydedildi: {os.path.basename(cache_path)}")
+            return cache_path
+        except Exception as e:
+            print(f"⚠️ Explainer durumu kaydedilemedi: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return None
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Explanation Cache - Tekrarlanan transaction açıklamaları için iki katmanlı önbellek
+Bellekte LRU katmanı + diskte TTL'li JSON katmanı
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+
+
+class ExplanationCache:
+    """
+    (model hash, kanonik feature vektörü, yöntem) anahtarlı açıklama önbelleği
+
+    Önce bellekteki LRU katmanına, sonra diskteki katmana bakılır. Diskten gelen
+    sonuçlar belleğe alınır. Her iki katmanda da kayıtlar ttl_seconds sonra geçersiz olur;
+    süresi dolmuş disk kayıtları her purge_interval kayıtta bir toplu silinir.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600,
+                 cache_dir: Optional[str] = '.explanation_cache', purge_interval: int = 256):
+        """
+        Args:
+            max_entries: Bellekte tutulacak maksimum açıklama sayısı
+            ttl_seconds: Kayıtların geçerlilik süresi (saniye)
+            cache_dir: Disk katmanı dizini (None ise sadece bellek)
+            purge_interval: Kaç put'ta bir süresi dolmuş disk kayıtlarının silineceği (0 ise kapalı)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.cache_dir = cache_dir
+        self.purge_interval = purge_interval
+
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'expired': 0, 'stores': 0, 'purged': 0}
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(model_hash: str, features: np.ndarray, method: str, variant: str = '') -> str:
+        """
+        Önbellek anahtarı üret
+
+        Feature vektörü float64'e çevrilip 10 anlamlı basamağa yuvarlanır; böylece
+        JSON/float32 gidiş-dönüşlerinden gelen küçük farklar anahtarı değiştirmez.
+        """
+        canonical = np.round(np.asarray(features, dtype=np.float64).ravel(), 10)
+        canonical[canonical == 0] = 0.0  # -0.0 ve 0.0 aynı anahtar
+        digest = hashlib.sha256()
+        digest.update(f"{model_hash}|{method}|{variant}|".encode('utf-8'))
+        digest.update(canonical.tobytes())
+        return digest.hexdigest()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _is_expired(self, created: float) -> bool:
+        return time.time() - created > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Önbellekteki açıklamayı döndür (yoksa veya süresi dolduysa None)"""
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                created, value = entry
+                if not self._is_expired(created):
+                    self.memory.move_to_end(key)
+                    self.stats['memory_hits'] += 1
+                    return copy.deepcopy(value)
+                del self.memory[key]
+                self.stats['expired'] += 1
+
+        if self.cache_dir:
+            path = self._disk_path(key)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    record = json.load(f)
+                if not self._is_expired(record['created']):
+                    self._remember(key, record['created'], record['value'])
+                    with self.lock:
+                        self.stats['disk_hits'] += 1
+                    return record['value']
+                os.remove(path)
+                with self.lock:
+                    self.stats['expired'] += 1
+            except (OSError, ValueError, KeyError):
+                pass
+
+        with self.lock:
+            self.stats['misses'] += 1
+        return None
+
+    def _remember(self, key: str, created: float, value: Dict):
+        """Bellek katmanına ekle, kapasite aşılırsa en eski kaydı at"""
+        with self.lock:
+            self.memory[key] = (created, copy.deepcopy(value))
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.max_entries:
+                self.memory.popitem(last=False)
+
+    def put(self, key: str, value: Dict):
+        """Açıklamayı iki katmana da kaydet"""
+        created = time.time()
+        self._remember(key, created, value)
+        with self.lock:
+            self.stats['stores'] += 1
+            purge_due = self.purge_interval and self.stats['stores'] % self.purge_interval == 0
+
+        if self.cache_dir:
+            path = self._disk_path(key)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'created': created, 'value': value}, f, ensure_ascii=False, default=str)
+                os.replace(temp_path, path)
+            except OSError as e:
+                print(f"⚠️ Açıklama diske önbelleklenemedi: {e}")
+
+            # Disk katmanı yalnızca aynı anahtar tekrar okunduğunda temizlenmesin diye
+            if purge_due:
+                self.purge_expired()
+
+    def purge_expired(self) -> int:
+        """Süresi dolmuş disk kayıtlarını sil"""
+        removed = 0
+        if not self.cache_dir:
+            return removed
+
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    if time.time() - os.stat(path).st_mtime > self.ttl_seconds:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    pass
+
+        with self.lock:
+            self.stats['purged'] += removed
+        return removed
+
+    def get_stats(self) -> Dict:
+        """Önbellek isabet istatistikleri"""
+        with self.lock:
+            stats = dict(self.stats)
+            stats['memory_entries'] = len(self.memory)
+
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_ratio'] = (stats['memory_hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        stats['memory_hit_ratio'] = stats['memory_hits'] / lookups if lookups else 0.0
+        return stats
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Fast LIME - Önbellekli pertürbasyon tasarımı ve birleşik skorlama ile hızlı LIME
+LimeTabularExplainer ile aynı örnekleme/ağırlıklandırma mantığını NumPy üzerinde yürütür
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+
+def _sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+
+class FusedScorer:
+    """
+    Ensemble / LightGBM / PCA fraud olasılığını tek geçişte hesaplayan skorlayıcı
+
+    DataFrame oluşturmadan float32 dizilerle çalışır. PCA rekonstrüksiyon hatası
+    (scaler + transform + inverse_transform) tek bir karesel form olarak hesaplanır:
+    u = (x - shift) / scale,  e = u^T A u,  A = (I - V^T V) / d
+    """
+
+    def __init__(self, model, model_type: str):
+        """
+        Args:
+            model: Ensemble model dict'i, LightGBM modeli veya PCA modeli/dict'i
+            model_type: ensemble, lightgbm veya pca
+        """
+        if model_type == 'lightgbm':
+            model_dict = {'lightgbm_model': model}
+        else:
+            model_dict = model if isinstance(model, dict) else {'pca_model': model}
+
+        self.booster = None
+        self.lightgbm_weight = 0.0
+        self.pca_weight = 0.0
+
+        if model_type in ('ensemble', 'lightgbm'):
+            lightgbm_model = model_dict['lightgbm_model']
+            self.booster = getattr(lightgbm_model, 'booster_', lightgbm_model)
+            self.lightgbm_weight = model_dict.get('lightgbm_weight', 0.7) if model_type == 'ensemble' else 1.0
+
+        if model_type in ('ensemble', 'pca'):
+            self.pca_weight = model_dict.get('pca_weight', 0.3) if model_type == 'ensemble' else 1.0
+            self._setup_pca(model_dict)
+
+    def _setup_pca(self, model_dict: Dict):
+        """Scaler ve PCA'yı tek bir kaydırma/ölçek ve karesel form matrisine indir"""
+        pca_model = model_dict.get('pca_model')
+        scaler = model_dict.get('pca_scaler')
+        self.pca_threshold = model_dict.get('pca_threshold', 0.1)
+
+        components = pca_model.components_
+        n_features = components.shape[1]
+
+        scaler_mean = scaler.mean_ if scaler is not None else np.zeros(n_features)
+        scaler_scale = scaler.scale_ if scaler is not None else np.ones(n_features)
+
+        # u = (x - m_s) / s - m_p  =  (x - (m_s + m_p * s)) / s
+        self.pca_shift = (scaler_mean + pca_model.mean_ * scaler_scale).astype(np.float32)
+        self.pca_inv_scale = (1.0 / scaler_scale).astype(np.float32)
+        self.pca_matrix = ((np.eye(n_features) - components.T @ components) / n_features).astype(np.float32)
+
+    def fraud_proba(self, X) -> np.ndarray:
+        """(n, d) girdi için fraud olasılıkları (n,)"""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+
+        proba = np.zeros(len(X), dtype=np.float64)
+
+        if self.booster is not None:
+            proba += self.lightgbm_weight * np.asarray(self.booster.predict(X), dtype=np.float64)
+
+        if self.pca_weight:
+            U = (X - self.pca_shift) * self.pca_inv_scale
+            errors = np.einsum('ij,ij->i', U @ self.pca_matrix, U)
+            proba += self.pca_weight * _sigmoid(errors / self.pca_threshold - 2)
+
+        return proba
+
+    def predict_proba(self, X) -> np.ndarray:
+        """sklearn uyumlu (n, 2) olasılık matrisi"""
+        proba = self.fraud_proba(X)
+        return np.column_stack([1 - proba, proba])
+
+
+class FastLimeResult:
+    """lime Explanation nesnesinin kullanılan alt kümesi"""
+
+    def __init__(self, features: List, intercept: float, score: float, local_pred: float,
+                 fraud_proba: float, num_samples: int):
+        self.features = features
+        self.intercept = {1: intercept}
+        self.score = score
+        self.local_pred = local_pred
+        self.predict_proba = np.array([1 - fraud_proba, fraud_proba])
+        self.num_samples = num_samples
+
+    def as_list(self, label: int = 1) -> List:
+        """(koşul, ağırlık) listesi - mutlak ağırlığa göre sıralı"""
+        return list(self.features)
+
+
+class FastLimeExplainer:
+    """
+    Model başına önbellekli pertürbasyon tasarımıyla çalışan LIME
+
+    Discretize edilmiş tabular LIME'da örnekler eğitim bin frekanslarından,
+    açıklanan transaction'dan bağımsız olarak çekilir; transaction'a bağlı olan sadece
+    "aynı bin'de mi" ikili maskesidir. Bu yüzden örnek havuzu ve havuzun model skorları
+    model başına bir kez hesaplanır. Her transaction için yalnızca maske, uzaklıklar
+    ve ridge regresyonları hesaplanır.
+
+    Örnek sayısı min_samples'tan başlayıp ikiye katlanır; ilk top_k feature ve
+    ağırlıkları tol içinde sabitlendiğinde örnekleme durur.
+    """
+
+    def __init__(self, lime_explainer, scorer: FusedScorer, pool_size: int = 1000,
+                 random_state: int = 42):
+        """
+        Args:
+            lime_explainer: Kurulu LimeTabularExplainer (discretize_continuous=True)
+            scorer: FusedScorer
+            pool_size: Önbellekteki maksimum pertürbasyon sayısı
+            random_state: Tekrarlanabilirlik için seed
+        """
+        if lime_explainer.discretizer is None:
+            raise ValueError("Fast LIME discretize_continuous=True ile kurulmuş explainer gerektirir")
+
+        self.lime_explainer = lime_explainer
+        self.discretizer = lime_explainer.discretizer
+        self.scorer = scorer
+        self.pool_size = pool_size
+        self.random_state = random_state
+
+        self.feature_names = list(lime_explainer.feature_names)
+        self.kernel_fn = lime_explainer.base.kernel_fn
+        self.scaler_mean = np.asarray(lime_explainer.scaler.mean_, dtype=np.float64)
+        self.scaler_scale = np.asarray(lime_explainer.scaler.scale_, dtype=np.float64)
+
+        self.pool_bins = None
+        self.pool_proba = None
+
+    def _build_pool(self):
+        """Transaction'dan bağımsız pertürbasyon havuzunu çek ve bir kez skorla"""
+        rng = np.random.RandomState(self.random_state)
+        n_features = len(self.feature_names)
+
+        bins = np.empty((self.pool_size, n_features))
+        for column in range(n_features):
+            values = self.lime_explainer.feature_values[column]
+            frequencies = self.lime_explainer.feature_frequencies[column]
+            bins[:, column] = rng.choice(values, size=self.pool_size, replace=True, p=frequencies)
+
+        # Bin'lerden sürekli değerlere (discretize edilmeyen kategorikler olduğu gibi kalır)
+        continuous = self.discretizer.undiscretize(bins.copy())
+
+        self.pool_bins = bins
+        self.pool_proba = self.scorer.fraud_proba(continuous)
+
+    def _feature_labels(self, instance: np.ndarray, instance_bins: np.ndarray) -> List[str]:
+        """LIME ile aynı formatta koşul isimleri (ör. 'V14 <= -0.43', 'DayOfWeek=3')"""
+        labels = []
+        for i, name in enumerate(self.feature_names):
+            if i in self.discretizer.names:
+                labels.append(self.discretizer.names[i][int(instance_bins[i])])
+            else:
+                labels.append(f"{name}={int(instance[i])}")
+        return labels
+
+    @staticmethod
+    def _fit(scaled: np.ndarray, labels: np.ndarray, weights: np.ndarray, num_features: int):
+        """LIME 'highest_weights' seçimi + ağırlıklı ridge"""
+        from sklearn.linear_model import Ridge
+
+        selector = Ridge(alpha=0.01, fit_intercept=True)
+        selector.fit(scaled, labels, sample_weight=weights)
+        used = np.argsort(-np.abs(selector.coef_ * scaled[0]), kind='stable')[:num_features]
+
+        model = Ridge(alpha=1, fit_intercept=True)
+        model.fit(scaled[:, used], labels, sample_weight=weights)
+        score = model.score(scaled[:, used], labels, sample_weight=weights)
+        local_pred = model.predict(scaled[0, used].reshape(1, -1))[0]
+        return used, model.coef_, model.intercept_, score, local_pred
+
+    def explain_instance(self, instance: np.ndarray, num_features: int = 15, top_k: int = 5,
+                         min_samples: int = 250, tol: float = 0.02) -> FastLimeResult:
+        """
+        Tek transaction için LIME açıklaması
+
+        Args:
+            instance: (d,) feature vektörü
+            num_features: Açıklamadaki feature sayısı
+            top_k: Kararlılığı izlenen en önemli feature sayısı
+            min_samples: İlk turdaki örnek sayısı
+            tol: top_k ağırlıklarındaki göreli değişim eşiği
+
+        Returns:
+            FastLimeResult
+        """
+        if self.pool_bins is None:
+            self._build_pool()
+
+        instance = np.asarray(instance, dtype=np.float64)
+        instance_bins = self.discretizer.discretize(instance.reshape(1, -1))[0]
+        instance_proba = float(self.scorer.fraud_proba(instance)[0])
+
+        # İlk satır transaction'ın kendisi (tüm feature'lar aynı bin'de)
+        mask = np.vstack([np.ones(len(instance)), (self.pool_bins == instance_bins).astype(np.float64)])
+        scaled_all = (mask - self.scaler_mean) / self.scaler_scale
+        distances_all = np.sqrt(np.sum((scaled_all - scaled_all[0]) ** 2, axis=1))
+        labels_all = np.concatenate([[instance_proba], self.pool_proba])
+
+        n_samples = min(min_samples, len(mask))
+        previous = None
+        while True:
+            scaled = scaled_all[:n_samples]
+            weights = self.kernel_fn(distances_all[:n_samples])
+            used, coef, intercept, score, local_pred = self._fit(
+                scaled, labels_all[:n_samples], weights, num_features
+            )
+
+            order = np.argsort(-np.abs(coef), kind='stable')
+            top = {int(used[i]): float(coef[i]) for i in order[:top_k]}
+
+            if previous is not None and set(top) == set(previous):
+                scale = max(abs(w) for w in top.values()) or 1.0
+                change = max(abs(top[f] - previous[f]) for f in top) / scale
+                if change < tol:
+                    break
+            if n_samples >= len(mask):
+                break
+
+            previous = top
+            n_samples = min(n_samples * 2, len(mask))
+
+        labels = self._feature_labels(instance, instance_bins)
+        features = [(labels[used[i]], float(coef[i])) for i in order]
+        return FastLimeResult(features, float(intercept), float(score), float(local_pred),
+                              instance_proba, n_samples)
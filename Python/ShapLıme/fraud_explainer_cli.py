@@ -10,11 +10,14 @@ import sys
 import os
 from datetime import datetime
 from typing import Dict, List
-import pandas as pd
 
 # Ana explainer sınıfını import et
 try:
     from python_api_explainer import FraudDetectionAPIClient, ExplainabilityAnalyzer
+    from chart_renderer import DEFAULT_DPI, RENDER_MODES
+    from batch_stream import (BatchAggregates, JsonlResultWriter, chunk_error_records,
+                              count_jsonl_lines, iter_transaction_chunks)
+    from parallel_batch import ThroughputReporter, run_parallel_batch
 except ImportError:
     print("❌ python_api_explainer.py dosyası bulunamadı!")
     print("Bu dosyanın aynı klasörde olduğundan emin olun.")
@@ -27,14 +30,28 @@ class FraudExplainerCLI:
     def __init__(self):
         self.api_client = None
         self.analyzer = None
+        self.analyzer_config = {}
 
-    def setup_clients(self, api_url: str, models_path: str):
+    def setup_clients(self, api_url: str, models_path: str, render_mode: str = 'process',
+                      chart_dpi: int = DEFAULT_DPI, use_explainer_cache: bool = True,
+                      background_size: int = 100, lime_mode: str = 'fast',
+                      result_cache_ttl: float = 3600):
         """API client ve analyzer'ı kur"""
         print(f"🔧 Clients kuruluyor...")
         print(f"API URL: {api_url}")
         print(f"Models Path: {models_path}")
 
         self.api_client = FraudDetectionAPIClient(api_url)
+        self.analyzer_config = {
+            'api_url': api_url,
+            'models_path': models_path,
+            'render_mode': render_mode,
+            'chart_dpi': chart_dpi,
+            'use_explainer_cache': use_explainer_cache,
+            'background_size': background_size,
+            'lime_mode': lime_mode,
+            'result_cache_ttl': result_cache_ttl
+        }
 
         # Health check
         if not self.api_client.health_check():
@@ -44,11 +61,20 @@ class FraudExplainerCLI:
 
         print("✅ API bağlantısı başarılı!")
 
-        self.analyzer = ExplainabilityAnalyzer(self.api_client, models_path)
+        self.analyzer = ExplainabilityAnalyzer(self.api_client, models_path,
+                                               render_mode=render_mode, chart_dpi=chart_dpi,
+                                               use_explainer_cache=use_explainer_cache,
+                                               background_size=background_size,
+                                               lime_mode=lime_mode,
+                                               result_cache_ttl=result_cache_ttl)
         print("✅ Analyzer kuruldu!")
 
         return True
 
+    def worker_config(self, model_type: str) -> Dict:
+        """Worker process'lerin analyzer'ı aynı ayarlarla kurması için config"""
+        return dict(self.analyzer_config, model_type=model_type)
+
     def explain_single_transaction(self, args):
         """Tek transaction açıkla"""
         print(f"=== SINGLE TRANSACTION EXPLANATION ===")
@@ -93,66 +119,100 @@ class FraudExplainerCLI:
             return False
 
     def explain_batch_transactions(self, args):
-        """Batch transaction açıkla"""
-        print(f"=== BATCH TRANSACTION EXPLANATION ===")
+        """
+        Batch transaction açıkla
 
-        # Transaction listesi yükle
-        if args.input.endswith('.json'):
-            with open(args.input, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if isinstance(data, list):
-                    transactions = data
-                else:
-                    transactions = [data]
-        elif args.input.endswith('.csv'):
-            df = pd.read_csv(args.input)
-            transactions = df.to_dict('records')
-        else:
-            print("❌ Sadece JSON ve CSV dosyalar destekleniyor")
-            return False
+        Girdi chunk'lar halinde okunur, sonuçlar tamamlandıkça JSONL'e yazılır ve özet
+        rapor birikimli istatistiklerden oluşturulur; bellek kullanımı batch boyutundan
+        bağımsızdır. --resume ile yarıda kalan çalışma kaldığı satırdan devam eder.
+        """
+        print(f"=== BATCH TRANSACTION EXPLANATION ===")
 
-        print(f"📄 {len(transactions)} transaction yüklendi")
+        os.makedirs(args.output_dir, exist_ok=True)
+        output_file = os.path.join(args.output_dir, 'batch_explanation_results.jsonl')
 
-        # Batch limit kontrolü
-        if len(transactions) > args.batch_limit:
-            print(f"⚠️ Transaction sayısı limit aşıyor ({len(transactions)} > {args.batch_limit})")
-            if not self._confirm_action("Devam etmek istiyor musunuz?"):
-                return False
+        skip = count_jsonl_lines(output_file) if args.resume else 0
+        if skip:
+            print(f"↩️ {skip} transaction önceki çalışmada tamamlanmış, kalanlardan devam ediliyor")
 
-        # Batch açıklama
         try:
-            results = self.analyzer.batch_explain(
-                transactions=transactions,
-                model_type=args.model_type,
-                method=args.method
-            )
-
-            # Sonuçları göster
-            print(f"\n📊 BATCH RESULTS:")
-            print(f"Total Transactions: {results['total_transactions']}")
-            print(f"Successful: {results['successful_explanations']}")
-            print(f"Failed: {results['failed_explanations']}")
-
-            if results['failed_explanations'] > 0:
-                print(f"\n❌ Failed Transactions:")
-                for error in results['errors'][:5]:  # İlk 5 hatayı göster
-                    print(f"  • {error['transaction_id']}: {error['error']}")
-
-            # Sonucu kaydet
-            output_file = os.path.join(args.output_dir, 'batch_explanation_results.json')
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2, ensure_ascii=False, default=str)
-
-            print(f"💾 Batch sonuçları kaydedildi: {output_file}")
-
-            # Özet rapor oluştur
-            self._create_batch_summary_report(results, args.output_dir)
+            chunks = iter_transaction_chunks(args.input, chunk_size=args.chunk_size, skip=skip)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return False
 
-            return True
+        aggregates = BatchAggregates()
+        writer = JsonlResultWriter(output_file, aggregates, resume=args.resume)
+
+        def limited_chunks():
+            """Batch limit kontrolü (toplam sayı baştan bilinmediği için ilk aşımda sorulur)"""
+            seen = skip
+            limit_confirmed = False
+            for chunk in chunks:
+                if not limit_confirmed and seen + len(chunk) > args.batch_limit:
+                    print(f"⚠️ Transaction sayısı limit aşıyor (> {args.batch_limit})")
+                    if not self._confirm_action("Devam etmek istiyor musunuz?"):
+                        return
+                    limit_confirmed = True
+                seen += len(chunk)
+                yield chunk
+
+        options = {
+            'model_type': args.model_type,
+            'method': args.method,
+            'chunk_size': args.chunk_size,
+            'output_dir': args.output_dir
+        }
 
-        except Exception as e:
-            print(f"❌ Batch processing hatası: {e}")
-            return False
+        try:
+            if args.workers > 1:
+                # Worker'lar explainer durumunu diskten yüklesin diye önce ana process'te hazırla
+                self.analyzer.prepare_explainers(args.model_type)
+                throughput = run_parallel_batch(limited_chunks(), writer, self.worker_config(args.model_type),
+                                                options, workers=args.workers, start_index=skip)
+            else:
+                reporter = ThroughputReporter(skip)
+                for chunk in limited_chunks():
+                    processed = reporter.processed
+                    try:
+                        self.analyzer.batch_explain(transactions=chunk, result_sink=writer,
+                                                    index_offset=processed, **options)
+                    except Exception as e:
+                        # Chunk'ın kalan transaction'ları hata olarak yazılır
+                        print(f"❌ Chunk hatası ({processed}-{processed + len(chunk)}): {e}")
+                        for record in chunk_error_records(chunk, processed, f"Batch processing error: {e}",
+                                                          start=writer.written - processed):
+                            writer.add_error(record)
+                    reporter.update(len(chunk))
+                throughput = reporter.summary()
+
+            print(f"⏱️ {throughput['processed']} transaction {throughput['elapsed_seconds']:.1f}s içinde "
+                  f"({throughput['transactions_per_second']:.1f} tx/s)")
+
+        except KeyboardInterrupt:
+            print(f"\n⏹️ Durduruldu - {writer.written} sonuç kaydedildi, --resume ile devam edilebilir")
+        finally:
+            writer.close()
+
+        summary = aggregates.summary()
+
+        # Sonuçları göster
+        print(f"\n📊 BATCH RESULTS:")
+        print(f"Total Transactions: {summary['total_transactions']}")
+        print(f"Successful: {summary['successful_explanations']}")
+        print(f"Failed: {summary['failed_explanations']}")
+
+        if summary['failed_explanations'] > 0:
+            print(f"\n❌ Failed Transactions:")
+            for error in summary['errors'][:5]:  # İlk 5 hatayı göster
+                print(f"  • {error['transaction_id']}: {error['error']}")
+
+        print(f"💾 Batch sonuçları kaydedildi: {output_file}")
+
+        # Özet rapor oluştur
+        self._create_batch_summary_report(summary, args.output_dir)
+
+        return summary['total_transactions'] > 0
 
     def create_sample_transactions(self, args):
         """Örnek transaction'lar oluştur"""
@@ -171,6 +231,20 @@ class FraudExplainerCLI:
         print(f"✅ {args.count} örnek transaction oluşturuldu: {output_file}")
         return True
 
+    def warm_cache(self, args):
+        """Explainer'ları kurup model dosyalarının yanına kaydet"""
+        print(f"=== EXPLAINER CACHE WARM-UP ===")
+
+        success = True
+        for model_type in args.model_types:
+            if self.analyzer.prepare_explainers(model_type):
+                print(f"✅ {model_type} explainer'ları hazır")
+            else:
+                print(f"❌ {model_type} explainer'ları hazırlanamadı")
+                success = False
+
+        return success
+
     def api_test(self, args):
         """API bağlantısını test et"""
         print(f"=== API TEST ===")
@@ -249,8 +323,8 @@ class FraudExplainerCLI:
             if 'lime' in explanations:
                 print("   ✅ LIME Analysis")
 
-    def _create_batch_summary_report(self, results: Dict, output_dir: str):
-        """Batch sonuçları için özet rapor oluştur"""
+    def _create_batch_summary_report(self, summary: Dict, output_dir: str):
+        """Batch özet istatistiklerinden (BatchAggregates.summary) HTML rapor oluştur"""
         try:
             # HTML rapor şablonu
             html_template = """
@@ -259,16 +333,16 @@ class FraudExplainerCLI:
             <head>
                 <title>Fraud Detection Batch Analysis Report</title>
                 <style>
-                    body { font-family: Arial, sans-serif; margin: 40px; }
-                    .header { background-color: #f4f4f4; padding: 20px; border-radius: 5px; }
-                    .summary { margin: 20px 0; }
-                    .transaction { border: 1px solid #ddd; margin: 10px 0; padding: 15px; border-radius: 5px; }
-                    .high-risk { background-color: #ffebee; }
-                    .medium-risk { background-color: #fff3e0; }
-                    .low-risk { background-color: #e8f5e8; }
-                    .error { background-color: #ffcccb; }
-                    .stats { display: flex; justify-content: space-around; }
-                    .stat-box { text-align: center; padding: 10px; background-color: #f9f9f9; border-radius: 5px; }
+                    body {{ font-family: Arial, sans-serif; margin: 40px; }}
+                    .header {{ background-color: #f4f4f4; padding: 20px; border-radius: 5px; }}
+                    .summary {{ margin: 20px 0; }}
+                    .transaction {{ border: 1px solid #ddd; margin: 10px 0; padding: 15px; border-radius: 5px; }}
+                    .high-risk {{ background-color: #ffebee; }}
+                    .medium-risk {{ background-color: #fff3e0; }}
+                    .low-risk {{ background-color: #e8f5e8; }}
+                    .error {{ background-color: #ffcccb; }}
+                    .stats {{ display: flex; justify-content: space-around; }}
+                    .stat-box {{ text-align: center; padding: 10px; background-color: #f9f9f9; border-radius: 5px; }}
                 </style>
             </head>
             <body>
@@ -296,44 +370,43 @@ class FraudExplainerCLI:
                             <h3>{high_risk_count}</h3>
                             <p>High Risk</p>
                         </div>
+                        <div class="stat-box">
+                            <h3>{mean_probability:.1%}</h3>
+                            <p>Mean Fraud Probability</p>
+                        </div>
                     </div>
                 </div>
 
                 <div class="transactions">
                     <h2>🚨 High Risk Transactions</h2>
+                    {high_risk_note}
                     {high_risk_transactions}
                 </div>
 
                 <div class="errors">
                     <h2>❌ Failed Analyses</h2>
+                    {error_note}
                     {error_transactions}
                 </div>
             </body>
             </html>
             """
 
-            # High risk transactions
+            # High risk transactions (en yüksek olasılıklılar)
             high_risk_transactions = []
-            high_risk_count = 0
-
-            for result in results.get('results', []):
-                api_pred = result.get('api_prediction', {})
-                prob = float(api_pred.get('Probability', '0.0'))
-
-                if prob > 0.7:
-                    high_risk_count += 1
-                    transaction_html = f"""
+            for item in summary.get('high_risk', []):
+                transaction_html = f"""
                     <div class="transaction high-risk">
-                        <h4>Transaction ID: {result.get('transaction_id', 'N/A')}</h4>
-                        <p><strong>Fraud Probability:</strong> {prob:.1%}</p>
+                        <h4>Transaction ID: {item['transaction_id']}</h4>
+                        <p><strong>Fraud Probability:</strong> {item['probability']:.1%}</p>
                         <p><strong>Decision:</strong> INVESTIGATE</p>
                     </div>
                     """
-                    high_risk_transactions.append(transaction_html)
+                high_risk_transactions.append(transaction_html)
 
-            # Error transactions
+            # Error transactions (ilk hatalar)
             error_transactions = []
-            for error in results.get('errors', []):
+            for error in summary.get('errors', []):
                 error_html = f"""
                 <div class="transaction error">
                     <h4>Transaction ID: {error.get('transaction_id', 'N/A')}</h4>
@@ -342,15 +415,23 @@ class FraudExplainerCLI:
                 """
                 error_transactions.append(error_html)
 
+            high_risk_count = summary.get('high_risk_count', 0)
+            failed = summary.get('failed_explanations', 0)
+
             # HTML'i oluştur
             html_content = html_template.format(
-                timestamp=results.get('timestamp', 'N/A'),
-                total_transactions=results.get('total_transactions', 0),
-                successful_explanations=results.get('successful_explanations', 0),
-                failed_explanations=results.get('failed_explanations', 0),
+                timestamp=summary.get('timestamp', 'N/A'),
+                total_transactions=summary.get('total_transactions', 0),
+                successful_explanations=summary.get('successful_explanations', 0),
+                failed_explanations=failed,
                 high_risk_count=high_risk_count,
+                mean_probability=summary.get('mean_probability', 0.0),
+                high_risk_note=(f'<p>Showing top {len(high_risk_transactions)} of {high_risk_count}.</p>'
+                                if len(high_risk_transactions) < high_risk_count else ''),
                 high_risk_transactions=''.join(
                     high_risk_transactions) if high_risk_transactions else '<p>No high risk transactions found.</p>',
+                error_note=(f'<p>Showing first {len(error_transactions)} of {failed}.</p>'
+                            if len(error_transactions) < failed else ''),
                 error_transactions=''.join(error_transactions) if error_transactions else '<p>No errors occurred.</p>'
             )
 
@@ -441,9 +522,18 @@ def main():
   # Batch transaction açıkla
   python fraud_explainer_cli.py explain-batch -i transactions.json -m LightGBM -o batch_results/
 
+  # Büyük batch'i akışlı işle, yarıda kalırsa kaldığı yerden devam et
+  python fraud_explainer_cli.py explain-batch -i transactions.csv --chunk-size 5000 --batch-limit 1000000 --resume
+
+  # Batch'i 8 process'e dağıt
+  python fraud_explainer_cli.py explain-batch -i transactions.jsonl --workers 8 --batch-limit 1000000
+
   # API test et
   python fraud_explainer_cli.py api-test -m Ensemble
 
+  # Explainer'ları önceden kur ve model dosyalarının yanına kaydet
+  python fraud_explainer_cli.py warm-cache -m Ensemble LightGBM
+
   # Örnek transaction'lar oluştur
   python fraud_explainer_cli.py create-samples -c 10 -o samples.json
         """
@@ -452,6 +542,18 @@ def main():
     # Global arguments
     parser.add_argument('--api-url', default='http://localhost:5112', help='API URL (default: http://localhost:5112)')
     parser.add_argument('--models-path', default='models', help='Models directory path (default: models)')
+    parser.add_argument('--render-mode', default='process', choices=list(RENDER_MODES),
+                        help='Chart rendering: background process pool, inline or skip (default: process)')
+    parser.add_argument('--chart-dpi', type=int, default=DEFAULT_DPI,
+                        help=f'Chart resolution (default: {DEFAULT_DPI})')
+    parser.add_argument('--no-explainer-cache', action='store_true',
+                        help='Do not load/save explainer state next to model files')
+    parser.add_argument('--background-size', type=int, default=100,
+                        help='SHAP/LIME background rows - smaller is faster, larger is more accurate (default: 100)')
+    parser.add_argument('--lime-mode', default='fast', choices=['fast', 'standard'],
+                        help='LIME: cached perturbation design with early stopping, or the lime library (default: fast)')
+    parser.add_argument('--cache-ttl', type=float, default=3600,
+                        help='Explanation result cache TTL in seconds, 0 disables the cache (default: 3600)')
 
     # Subcommands
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
@@ -466,18 +568,29 @@ def main():
 
     # Explain batch transactions
     batch_parser = subparsers.add_parser('explain-batch', help='Explain batch transactions')
-    batch_parser.add_argument('-i', '--input', required=True, help='Input transactions file (JSON/CSV)')
+    batch_parser.add_argument('-i', '--input', required=True, help='Input transactions file (JSON/JSONL/CSV)')
     batch_parser.add_argument('-m', '--model-type', default='Ensemble', choices=['Ensemble', 'LightGBM', 'PCA'],
                               help='Model type')
     batch_parser.add_argument('--method', default='shap', choices=['shap', 'lime', 'both'], help='Explanation method')
     batch_parser.add_argument('-o', '--output-dir', default='batch_explanations', help='Output directory')
     batch_parser.add_argument('--batch-limit', type=int, default=100, help='Maximum batch size')
+    batch_parser.add_argument('--chunk-size', type=int, default=1000,
+                              help='Transactions read and explained per chunk (default: 1000)')
+    batch_parser.add_argument('--workers', type=int, default=1,
+                              help='Worker processes; each loads the model and explainers once (default: 1)')
+    batch_parser.add_argument('--resume', action='store_true',
+                              help='Append to an existing results JSONL and skip transactions already written')
 
     # API test
     test_parser = subparsers.add_parser('api-test', help='Test API connection and prediction')
     test_parser.add_argument('-m', '--model-type', default='Ensemble', choices=['Ensemble', 'LightGBM', 'PCA'],
                              help='Model type for testing')
 
+    # Warm explainer cache
+    warm_parser = subparsers.add_parser('warm-cache', help='Build and persist explainers next to model files')
+    warm_parser.add_argument('-m', '--model-types', nargs='+', default=['Ensemble', 'LightGBM', 'PCA'],
+                             choices=['Ensemble', 'LightGBM', 'PCA'], help='Model types to prepare')
+
     # Create samples
     samples_parser = subparsers.add_parser('create-samples', help='Create sample transactions')
     samples_parser.add_argument('-c', '--count', type=int, default=5, help='Number of samples to create')
@@ -498,7 +611,9 @@ def main():
         sys.exit(0 if success else 1)
 
     # Diğer komutlar için client setup
-    if not cli.setup_clients(args.api_url, args.models_path):
+    if not cli.setup_clients(args.api_url, args.models_path, args.render_mode, args.chart_dpi,
+                             not args.no_explainer_cache, args.background_size, args.lime_mode,
+                             args.cache_ttl):
         sys.exit(1)
 
     # Komutları çalıştır
@@ -510,6 +625,16 @@ def main():
         success = cli.explain_batch_transactions(args)
     elif args.command == 'api-test':
         success = cli.api_test(args)
+    elif args.command == 'warm-cache':
+        success = cli.warm_cache(args)
+
+    # Arka planda çizilen grafiklerin bitmesini bekle
+    cli.analyzer.shutdown_renders()
+
+    cache_stats = cli.analyzer.get_cache_stats()
+    if cache_stats:
+        print(f"⚡ Açıklama önbelleği: isabet oranı {cache_stats['hit_ratio']:.1%} "
+              f"(bellek {cache_stats['memory_hits']}, disk {cache_stats['disk_hits']}, ıska {cache_stats['misses']})")
 
     sys.exit(0 if success else 1)
 
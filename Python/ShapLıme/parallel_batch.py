@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Parallel Batch - Batch açıklamanın process'lere dağıtılması
+Her worker modeli ve explainer'ları bir kez yükler; chunk sonuçları girdi sırasıyla birleştirilir
+"""
+
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from batch_stream import chunk_error_records
+
+# Ortak modüller (thread_budget) Python/ kökünde
+PYTHON_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PYTHON_ROOT not in sys.path:
+    sys.path.append(PYTHON_ROOT)
+
+from thread_budget import ThreadBudget, apply_thread_budget, get_thread_budget
+
+# Worker process'in analyzer'ı (initializer'da bir kez kurulur)
+_worker_analyzer = None
+
+
+def _init_worker(config: Dict):
+    """Worker başlatıcı: thread payını uygula, API client, analyzer ve explainer'ları kur"""
+    global _worker_analyzer
+    apply_thread_budget(ThreadBudget(config.get('threads')))
+
+    from python_api_explainer import FraudDetectionAPIClient, ExplainabilityAnalyzer
+
+    api_client = FraudDetectionAPIClient(config['api_url'])
+    _worker_analyzer = ExplainabilityAnalyzer(
+        api_client, config['models_path'],
+        # Worker içinde ikinci bir process pool açılmaz
+        render_mode='skip' if config['render_mode'] == 'skip' else 'inline',
+        chart_dpi=config['chart_dpi'],
+        use_explainer_cache=config['use_explainer_cache'],
+        background_size=config['background_size'],
+        lime_mode=config['lime_mode'],
+        result_cache_ttl=config['result_cache_ttl']
+    )
+    _worker_analyzer.prepare_explainers(config['model_type'])
+
+
+class _ChunkCollector:
+    """Worker içinde chunk kayıtlarını sırasıyla toplayan sink"""
+
+    def __init__(self):
+        self.records = []
+
+    def add_result(self, result: Dict):
+        self.records.append(('result', result))
+
+    def add_error(self, error: Dict):
+        self.records.append(('error', error))
+
+
+def _explain_chunk(chunk: List[Dict], index_offset: int, options: Dict) -> List[Tuple[str, Dict]]:
+    """Worker'da tek chunk'ı açıkla"""
+    collector = _ChunkCollector()
+    _worker_analyzer.batch_explain(
+        transactions=chunk,
+        model_type=options['model_type'],
+        method=options['method'],
+        chunk_size=options['chunk_size'],
+        output_dir=options['output_dir'],
+        result_sink=collector,
+        index_offset=index_offset
+    )
+    return collector.records
+
+
+class ThroughputReporter:
+    """İşlenen transaction sayısı ve saniyedeki transaction ilerleme çıktısı"""
+
+    def __init__(self, start_index: int = 0):
+        self.start_index = start_index
+        self.processed = start_index
+        self.started = time.time()
+
+    def update(self, count: int):
+        self.processed += count
+        print(f"📄 {self.processed} transaction işlendi ({self.rate():.1f} tx/s)")
+
+    def rate(self) -> float:
+        elapsed = time.time() - self.started
+        return (self.processed - self.start_index) / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> Dict:
+        return {
+            'processed': self.processed - self.start_index,
+            'elapsed_seconds': time.time() - self.started,
+            'transactions_per_second': self.rate()
+        }
+
+
+def run_parallel_batch(chunks: Iterable[List[Dict]], sink, config: Dict, options: Dict,
+                       workers: int, start_index: int = 0,
+                       max_pending: Optional[int] = None) -> Dict:
+    """
+    Chunk'ları worker process'lerde açıkla ve sonuçları girdi sırasıyla sink'e yaz
+
+    Aynı anda en fazla max_pending chunk (varsayılan 2 x workers) işte olur; böylece
+    girdi okuma hızı işleme hızını aşsa da bellek sabit kalır.
+
+    Args:
+        chunks: Transaction chunk'ları (iter_transaction_chunks)
+        sink: add_result / add_error metodları olan sonuç alıcısı (JsonlResultWriter)
+        config: Worker analyzer ayarları (api_url, models_path, model_type, ...)
+        options: batch_explain parametreleri (model_type, method, chunk_size, output_dir)
+        workers: Worker process sayısı
+        start_index: İlk chunk'ın girdi içindeki sırası (devam ettirme için)
+        max_pending: Aynı anda işte olan en fazla chunk sayısı
+
+    Returns:
+        İşlenen transaction sayısı, süre ve throughput
+    """
+    max_pending = max_pending or workers * 2
+
+    # Her worker BLAS/SHAP için bütçenin eşit payını alır
+    config = {**config, 'threads': get_thread_budget().split(workers).total}
+    reporter = ThroughputReporter(start_index)
+    pending = deque()
+    offset = start_index
+
+    def drain_one():
+        chunk_offset, chunk, future = pending.popleft()
+        try:
+            records = future.result()
+        except Exception as e:
+            print(f"❌ Chunk hatası ({chunk_offset}-{chunk_offset + len(chunk)}): {e}")
+            records = [('error', record) for record in
+                       chunk_error_records(chunk, chunk_offset, f"Batch processing error: {e}")]
+
+        for kind, record in records:
+            if kind == 'result':
+                sink.add_result(record)
+            else:
+                sink.add_error(record)
+        reporter.update(len(chunk))
+
+    print(f"🚀 {workers} worker process başlatılıyor (worker başına {config['threads']} thread)...")
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(config,))
+    try:
+        for chunk in chunks:
+            pending.append((offset, chunk, executor.submit(_explain_chunk, chunk, offset, options)))
+            offset += len(chunk)
+            while len(pending) >= max_pending:
+                drain_one()
+
+        while pending:
+            drain_one()
+    finally:
+        executor.shutdown(wait=not pending, cancel_futures=True)
+
+    return reporter.summary()
@@ -7,29 +7,32 @@ Mevcut .NET API'ye istek atarak SHAP/LIME analizi yapan client
 import requests
 import json
 import os
+import re
+import sys
 import numpy as np
 import pandas as pd
-import joblib
 import warnings
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Union
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple, Union
 import time
-import matplotlib
 import uuid
 from enum import Enum
 
+# shap, lime, matplotlib, sklearn ve joblib yalnızca açıklama/grafik yollarında import edilir;
+# api-test ve sample gibi hafif komutlar bu modülleri yüklemez
+if TYPE_CHECKING:
+    from lime.lime_tabular import LimeTabularExplainer
 
-matplotlib.use('Agg')  # Non-interactive backend
-import matplotlib.pyplot as plt
-import seaborn as sns
+# Ortak modüller (chart_renderer) Python/ kökünde
+PYTHON_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PYTHON_ROOT not in sys.path:
+    sys.path.append(PYTHON_ROOT)
 
-# Explainability libraries
-import shap
-import lime
-from lime.lime_tabular import LimeTabularExplainer
-
-# Sklearn utilities
-from sklearn.preprocessing import StandardScaler
+from ensemble_shap import DecomposedEnsembleExplainer, expand_weighted_rows
+from chart_renderer import ChartRenderQueue, DEFAULT_DPI
+from explainer_cache import ExplainerCache, ModelIndex
+from fast_lime import FastLimeExplainer, FusedScorer
+from explanation_cache import ExplanationCache
 
 # Warnings'leri filtrele
 warnings.filterwarnings('ignore', category=UserWarning)
@@ -146,7 +149,8 @@ class FraudDetectionAPIClient:
             traceback.print_exc()
             return response
 
-    def _make_request(self, method: str, endpoint: str, data: Dict = None, params: Dict = None) -> Dict:
+    def _make_request(self, method: str, endpoint: str, data: Dict = None, params: Dict = None,
+                      format_response: bool = True) -> Dict:
         """
         API'ye istek gönder
 
@@ -155,6 +159,7 @@ class FraudDetectionAPIClient:
             endpoint: API endpoint
             data: POST data
             params: Query parameters
+            format_response: Yanıt tek tahmin formatına dönüştürülsün mü?
 
         Returns:
             API response dict
@@ -178,7 +183,7 @@ class FraudDetectionAPIClient:
                 result = response.json()
                 print(f"✅ İstek başarılı: {response.status_code}")
                 print(f"Debug - Raw Response: {json.dumps(result, indent=2)}")
-                return self._format_api_response(result)
+                return self._format_api_response(result) if format_response else result
             else:
                 print(f"❌ İstek başarısız: {response.status_code}")
                 print(f"Hata: {response.text}")
@@ -208,6 +213,77 @@ class FraudDetectionAPIClient:
         formatted_transaction = self._format_transaction_for_api(transaction_data)
         return self._make_request("POST", f"/{model_type}/predict", data=formatted_transaction)
 
+    def predict_many(self, transactions: List[Dict], chunk_size: int = 100,
+                     model_type: Optional[str] = None) -> Dict:
+        """
+        Çok sayıda transaction'ı toplu tahmin endpoint'i ile tahmin et
+
+        Transaction'lar chunk'lar halinde tek istekte gönderilir. Sunucu toplu
+        endpoint'i desteklemiyorsa (404/405) o chunk tek tek tahmin edilir.
+
+        Returns:
+            {"results": [...girdi sırasıyla...], "succeeded", "failed", "failed_indices", "chunks"}
+        """
+        results = [None] * len(transactions)
+        chunk_size = max(1, chunk_size)
+        chunk_count = 0
+        bulk_supported = True
+
+        for start in range(0, len(transactions), chunk_size):
+            chunk = transactions[start:start + chunk_size]
+            chunk_count += 1
+
+            response = None
+            if bulk_supported:
+                payload = {"transactions": [self._format_transaction_for_api(tx) for tx in chunk]}
+                if model_type:
+                    payload["modelType"] = model_type
+                response = self._make_request("POST", "/predict/batch", data=payload, format_response=False)
+
+                if response.get("status_code") in (404, 405):
+                    print("⚠️ Toplu tahmin endpoint'i yok, tek tek tahmine geçiliyor")
+                    bulk_supported = False
+
+            if not bulk_supported:
+                for offset, transaction in enumerate(chunk):
+                    if model_type and model_type.lower() != "ensemble":
+                        results[start + offset] = self.predict_with_model(model_type, transaction)
+                    else:
+                        results[start + offset] = self.predict(transaction)
+                continue
+
+            if "results" not in response:
+                # Chunk bütünüyle başarısız - her elemana aynı hatayı yaz
+                for offset in range(len(chunk)):
+                    results[start + offset] = {"error": response.get("error", "Unknown error"),
+                                               "status_code": response.get("status_code")}
+                continue
+
+            for offset, item in enumerate(response["results"]):
+                index = item.get("index", offset)
+                if 0 <= index < len(chunk):
+                    if item.get("success", True):
+                        results[start + index] = self._format_api_response(item)
+                    else:
+                        results[start + index] = {"error": item.get("error", "Unknown error"),
+                                                  "status_code": item.get("status_code", 500)}
+
+            for offset in range(len(chunk)):
+                if results[start + offset] is None:
+                    results[start + offset] = {"error": "Missing result in batch response", "status_code": 500}
+
+        failed_indices = [i for i, r in enumerate(results) if "error" in r]
+        print(f"📦 Toplu tahmin: {len(transactions) - len(failed_indices)}/{len(transactions)} başarılı "
+              f"({chunk_count} chunk)")
+
+        return {
+            "results": results,
+            "succeeded": len(transactions) - len(failed_indices),
+            "failed": len(failed_indices),
+            "failed_indices": failed_indices,
+            "chunks": chunk_count
+        }
+
     def _format_transaction_for_api(self, transaction_data: Dict) -> Dict:
         """Transaction data'yı gerçek .NET API format'ına çevir"""
         # GUID'ları oluştur
@@ -313,20 +389,36 @@ class ExplainabilityAnalyzer:
     SHAP ve LIME analizi yaparak model kararlarını açıklar
     """
 
-    def __init__(self, api_client: FraudDetectionAPIClient, models_path: str = "models"):
+    def __init__(self, api_client: FraudDetectionAPIClient, models_path: str = "models",
+                 render_mode: str = "process", chart_dpi: int = DEFAULT_DPI,
+                 use_explainer_cache: bool = True, background_size: int = 100,
+                 lime_mode: str = "fast", result_cache_ttl: Optional[float] = 3600):
         """
         Args:
             api_client: API client instance
             models_path: Modellerin bulunduğu dizin
+            render_mode: Grafik çizimi - process (arka plan), inline veya skip
+            chart_dpi: Grafik çözünürlüğü
+            use_explainer_cache: Explainer durumu model dosyasının yanına kaydedilip tekrar kullanılsın mı?
+            background_size: SHAP/LIME background satır sayısı (küçük = hızlı, büyük = daha doğru)
+            lime_mode: fast (önbellekli tasarım + erken durdurma) veya standard (lime kütüphanesi)
+            result_cache_ttl: Açıklama önbelleğinin geçerlilik süresi (saniye, None ise önbellek kapalı)
         """
         self.api_client = api_client
         self.models_path = models_path
+        self.render_queue = ChartRenderQueue(mode=render_mode, dpi=chart_dpi)
+        self.model_index = ModelIndex(models_path)
+        self.explainer_cache = ExplainerCache(self.model_index) if use_explainer_cache else None
+        self.background_size = background_size
+        self.lime_mode = lime_mode
+        self.result_cache = ExplanationCache(ttl_seconds=result_cache_ttl) if result_cache_ttl else None
         self.loaded_models = {}
         self.feature_names = self._get_standard_features()
 
         # Explainer'ları sakla
         self.shap_explainers = {}
         self.lime_explainers = {}
+        self.fast_lime_explainers = {}
 
         print(f"Explainability Analyzer başlatıldı. Models path: {models_path}")
 
@@ -353,22 +445,17 @@ class ExplainabilityAnalyzer:
         try:
             print(f"Model yükleniyor: {model_name} (tip: {model_type})")
 
-            # Model dosyasını bul
-            model_files = []
-            for root, dirs, files in os.walk(self.models_path):
-                for file in files:
-                    if model_name.lower() in file.lower() and file.endswith('.joblib'):
-                        model_files.append(os.path.join(root, file))
+            # Model dosyasını indeksten bul (en son model)
+            model_file = self.model_index.find(model_name)
 
-            if not model_files:
+            if model_file is None:
                 print(f"❌ Model dosyası bulunamadı: {model_name}")
                 return False
 
-            # En son modeli seç
-            model_file = sorted(model_files)[-1]
             print(f"Model dosyası: {model_file}")
 
             # Modeli yükle
+            import joblib
             model = joblib.load(model_file)
             self.loaded_models[model_name] = {
                 'model': model,
@@ -387,6 +474,9 @@ class ExplainabilityAnalyzer:
         """
         SHAP ve LIME explainer'ları kur
 
+        Background data verilmemişse explainer durumu model içerik hash'iyle
+        önbellekten yüklenir; yoksa kurulur ve model dosyasının yanına kaydedilir.
+
         Args:
             model_name: Model adı
             background_data: SHAP için background data (opsiyonel)
@@ -401,55 +491,200 @@ class ExplainabilityAnalyzer:
             model_info = self.loaded_models[model_name]
             model = model_info['model']
             model_type = model_info['type']
-
-            # Background data oluştur
+            self.fast_lime_explainers.pop(model_name, None)
+
+            use_cache = self.explainer_cache is not None and background_data is None
+            if use_cache:
+                state = self.explainer_cache.load(model_info['path'], self.feature_names)
+                if state is not None and state.get('background_size') == self.background_size:
+                    background_data, background_weights = state['background_data'], state['background_weights']
+                    if state['shap_explainer'] is not None:
+                        self.shap_explainers[model_name] = state['shap_explainer']
+                    else:
+                        self._build_shap_explainer(model_name, model, model_type, background_data,
+                                                   background_weights)
+                    self.lime_explainers[model_name] = self._build_lime_explainer(
+                        expand_weighted_rows(background_data, background_weights), state['lime_stats']
+                    )
+                    print("✅ SHAP ve LIME explainer'ları önbellekten kuruldu")
+                    return
+
+            # Background data: eğitimde kaydedilen gerçek veri özeti, yoksa sentetik veri
+            background_weights = None
             if background_data is None:
-                background_data = self._create_background_data()
+                summary = self._load_background_summary(model_info['path'])
+                if summary is not None:
+                    background_data, background_weights = summary
+                else:
+                    print("⚠️ Background özeti bulunamadı, sentetik background kullanılıyor")
+                    background_data = self._create_background_data(self.background_size)
+            if background_weights is None:
+                background_weights = np.full(len(background_data), 1.0 / len(background_data))
 
             # SHAP Explainer
-            if model_type == 'lightgbm':
-                self.shap_explainers[model_name] = shap.TreeExplainer(model)
-                print("✅ SHAP TreeExplainer kuruldu")
+            cacheable = self._build_shap_explainer(model_name, model, model_type, background_data,
+                                                   background_weights)
 
-            elif model_type == 'ensemble':
-                # Ensemble için custom wrapper
-                def ensemble_predict_proba(X):
-                    return self._ensemble_predict_wrapper(X, model)
+            # LIME Explainer (ağırlık desteklemediği için satırlar ağırlığa oranla çoğaltılır)
+            self.lime_explainers[model_name] = self._build_lime_explainer(
+                expand_weighted_rows(background_data, background_weights)
+            )
+            print("✅ LIME Explainer kuruldu")
 
-                self.shap_explainers[model_name] = shap.Explainer(
-                    ensemble_predict_proba, background_data
+            if use_cache:
+                self.explainer_cache.save(model_info['path'], self.feature_names, {
+                    'background_size': self.background_size,
+                    'background_data': background_data,
+                    'background_weights': background_weights,
+                    'shap_explainer': self.shap_explainers.get(model_name) if cacheable else None,
+                    'lime_stats': self._lime_training_stats(self.lime_explainers[model_name])
+                })
+
+        except Exception as e:
+            print(f"❌ Explainer kurulum hatası: {e}")
+
+    def prepare_explainers(self, model_type: str) -> bool:
+        """
+        Modeli yükle ve explainer'ları kur (önbellek yoksa oluşturulup kaydedilir)
+
+        Args:
+            model_type: Model tipi (Ensemble, LightGBM, PCA)
+
+        Returns:
+            Explainer'lar hazır mı?
+        """
+        model_name = f"fraud_model_{model_type.lower()}"
+        if model_name not in self.loaded_models and not self.load_model(model_name, model_type.lower()):
+            return False
+        if model_name not in self.shap_explainers:
+            self.setup_explainers(model_name)
+        return model_name in self.shap_explainers
+
+    def _build_shap_explainer(self, model_name: str, model, model_type: str, background_data: np.ndarray,
+                              background_weights: np.ndarray) -> bool:
+        """
+        SHAP explainer'ı kur
+
+        Returns:
+            Explainer önbelleğe kaydedilebilir mi? (model-agnostic explainer closure taşır)
+        """
+        import shap
+
+        if model_type == 'lightgbm':
+            self.shap_explainers[model_name] = shap.TreeExplainer(model)
+            print("✅ SHAP TreeExplainer kuruldu")
+
+        elif model_type in ('ensemble', 'pca'):
+            try:
+                # TreeSHAP + kapalı formlu PCA atfı - kara kutu değerlendirmesi yok
+                self.shap_explainers[model_name] = DecomposedEnsembleExplainer(
+                    model, background_data, self.feature_names, model_type, background_weights
                 )
-                print("✅ SHAP Explainer (Ensemble) kuruldu")
+                print(f"✅ SHAP Decomposed Explainer ({model_type}) kuruldu")
+            except Exception as e:
+                print(f"⚠️ Decomposed explainer kurulamadı ({e}), model-agnostic explainer kullanılıyor")
+                wrapper = self._ensemble_predict_wrapper if model_type == 'ensemble' else self._pca_predict_wrapper
 
-            elif model_type == 'pca':
-                # PCA için wrapper
-                def pca_predict_proba(X):
-                    return self._pca_predict_wrapper(X, model)
+                def predict_proba(X):
+                    return wrapper(X, model)
 
                 self.shap_explainers[model_name] = shap.Explainer(
-                    pca_predict_proba, background_data
+                    predict_proba, expand_weighted_rows(background_data, background_weights)
                 )
-                print("✅ SHAP Explainer (PCA) kuruldu")
-
-            # LIME Explainer
-            categorical_features = []
-            if 'DayOfWeek' in self.feature_names:
-                categorical_features.append(self.feature_names.index('DayOfWeek'))
-            if 'HourOfDay' in self.feature_names:
-                categorical_features.append(self.feature_names.index('HourOfDay'))
-
-            self.lime_explainers[model_name] = LimeTabularExplainer(
-                background_data,
-                feature_names=self.feature_names,
-                class_names=['Normal', 'Fraud'],
-                categorical_features=categorical_features,
-                mode='classification',
-                discretize_continuous=True
-            )
-            print("✅ LIME Explainer kuruldu")
+                print(f"✅ SHAP Explainer ({model_type}) kuruldu")
+                return False
+
+        return True
+
+    def _build_lime_explainer(self, background_data: np.ndarray,
+                              training_data_stats: Optional[Dict] = None) -> 'LimeTabularExplainer':
+        """LIME explainer'ı kur (kayıtlı discretizer istatistikleri varsa onlarla)"""
+        from lime.lime_tabular import LimeTabularExplainer
+
+        categorical_features = []
+        if 'DayOfWeek' in self.feature_names:
+            categorical_features.append(self.feature_names.index('DayOfWeek'))
+        if 'HourOfDay' in self.feature_names:
+            categorical_features.append(self.feature_names.index('HourOfDay'))
+
+        return LimeTabularExplainer(
+            background_data,
+            feature_names=self.feature_names,
+            class_names=['Normal', 'Fraud'],
+            categorical_features=categorical_features,
+            mode='classification',
+            discretize_continuous=True,
+            training_data_stats=training_data_stats
+        )
+
+    @staticmethod
+    def _lime_training_stats(lime_explainer: 'LimeTabularExplainer') -> Dict:
+        """LIME discretizer istatistiklerini training_data_stats formatında çıkar"""
+        discretizer = lime_explainer.discretizer
+        return {
+            'means': discretizer.means,
+            'mins': discretizer.mins,
+            'maxs': discretizer.maxs,
+            'stds': discretizer.stds,
+            'feature_values': lime_explainer.feature_values,
+            'feature_frequencies': lime_explainer.feature_frequencies
+        }
+
+    def _load_background_summary(self, model_path: str):
+        """
+        Eğitimde kaydedilen gerçek veri background özetini yükle (<model>.background.json)
+
+        Özet background_size'tan büyükse ağırlıklı k-means ile küçültülür.
+
+        Returns:
+            (data, weights) veya özet yoksa None
+        """
+        background_path = f"{model_path}.background.json"
+        if not os.path.exists(background_path):
+            return None
+
+        try:
+            with open(background_path, 'r', encoding='utf-8') as f:
+                summary = json.load(f)
+
+            # Eğitim kolonlarını explainer feature sırasına hizala
+            aliases = {'DayOfWeek': 'DayFeature', 'HourOfDay': 'HourFeature'}
+            source = pd.DataFrame(summary['data'], columns=summary['feature_names'])
+            weights = np.asarray(summary['weights'], dtype=float)
+
+            missing = []
+            columns = {}
+            for feature in self.feature_names:
+                column = feature if feature in source.columns else aliases.get(feature)
+                if column in source.columns:
+                    columns[feature] = source[column].values
+                else:
+                    missing.append(feature)
+                    columns[feature] = np.zeros(len(source))
+            if missing:
+                print(f"⚠️ Background özetinde olmayan feature'lar 0 ile dolduruldu: {missing}")
+
+            data = pd.DataFrame(columns)[self.feature_names].values.astype(float)
+
+            if len(data) > self.background_size:
+                from sklearn.cluster import KMeans
+                from sklearn.preprocessing import StandardScaler
+
+                scaler = StandardScaler()
+                kmeans = KMeans(n_clusters=self.background_size, random_state=42, n_init=3)
+                labels = kmeans.fit_predict(scaler.fit_transform(data), sample_weight=weights)
+                data = scaler.inverse_transform(kmeans.cluster_centers_)
+                weights = np.bincount(labels, weights=weights, minlength=self.background_size)
+                keep = weights > 0
+                data, weights = data[keep], weights[keep]
+
+            print(f"✅ Background özeti yüklendi: {len(data)} satır "
+                  f"({summary.get('method', '?')}, {summary.get('source_rows', '?')} eğitim satırından)")
+            return data, weights / weights.sum()
 
         except Exception as e:
-            print(f"❌ Explainer kurulum hatası: {e}")
+            print(f"⚠️ Background özeti okunamadı ({e})")
+            return None
 
     def _create_background_data(self, n_samples: int = 100) -> np.ndarray:
         """Sentetik background data oluştur"""
@@ -545,7 +780,8 @@ class ExplainabilityAnalyzer:
                             transaction_data: Dict,
                             model_type: str = "Ensemble",
                             method: str = "both",
-                            output_dir: str = "explanations") -> Dict:
+                            output_dir: str = "explanations",
+                            api_prediction: Optional[Dict] = None) -> Dict:
         """
         Transaction'ı açıkla (API + Local Analysis)
 
@@ -554,6 +790,7 @@ class ExplainabilityAnalyzer:
             model_type: Model tipi (Ensemble, LightGBM, PCA)
             method: Açıklama yöntemi (shap, lime, both)
             output_dir: Çıktı dizini
+            api_prediction: Önceden alınmış API tahmini (toplu tahminden), None ise API'ye sorulur
 
         Returns:
             Açıklama sonuçları
@@ -564,33 +801,33 @@ class ExplainabilityAnalyzer:
             print(f"Model Type: {model_type}")
             print(f"Method: {method}")
 
-            # API'den tahmin al
-            print("🌐 API'den tahmin alınıyor...")
-            if model_type.lower() == "ensemble":
-                api_prediction = self.api_client.predict(transaction_data)
-            else:
-                api_prediction = self.api_client.predict_with_model(model_type, transaction_data)
-
-            if "error" in api_prediction:
-                raise Exception(f"API prediction error: {api_prediction['error']}")
-
-            probability = float(api_prediction.get('Probability', '0.0'))
-            print(f"✅ API Prediction: {probability:.4f}")
-
             # Transaction data'yı feature'lara çevir
             features_df = self._prepare_features(transaction_data)
 
             # Modeli yükle (eğer yüklü değilse)
             model_name = f"fraud_model_{model_type.lower()}"
-            if model_name not in self.loaded_models:
+            model_loaded = model_name in self.loaded_models
+            if not model_loaded:
                 print("📁 Model yükleniyor...")
-                if not self.load_model(model_name, model_type.lower()):
-                    print("⚠️ Model yüklenemedi, sadece API sonucu dönülüyor")
-                    return self._create_api_only_response(api_prediction, transaction_data)
+                model_loaded = self.load_model(model_name, model_type.lower())
+
+            # API'den tahmin al (feature vektörü dışındaki alanlara da bağlı, önbelleğe alınmaz)
+            if api_prediction is None:
+                print("🌐 API'den tahmin alınıyor...")
+                if model_type.lower() == "ensemble":
+                    api_prediction = self.api_client.predict(transaction_data)
+                else:
+                    api_prediction = self.api_client.predict_with_model(model_type, transaction_data)
+
+            if "error" in api_prediction:
+                raise Exception(f"API prediction error: {api_prediction['error']}")
 
-            # Explainer'ları kur (eğer kurulu değilse)
-            if model_name not in self.shap_explainers:
-                self.setup_explainers(model_name)
+            probability = float(api_prediction.get('Probability', '0.0'))
+            print(f"✅ API Prediction: {probability:.4f}")
+
+            if not model_loaded:
+                print("⚠️ Model yüklenemedi, sadece API sonucu dönülüyor")
+                return self._create_api_only_response(api_prediction, transaction_data)
 
             # Output directory oluştur
             os.makedirs(output_dir, exist_ok=True)
@@ -604,21 +841,46 @@ class ExplainabilityAnalyzer:
                 'explanations': {}
             }
 
-            # SHAP açıklaması
-            if method in ['shap', 'both'] and model_name in self.shap_explainers:
-                print("🔍 SHAP analizi yapılıyor...")
-                shap_results = self._generate_shap_explanation(
-                    model_name, features_df, output_dir
-                )
-                explanation_results['explanations']['shap'] = shap_results
-
-            # LIME açıklaması
-            if method in ['lime', 'both'] and model_name in self.lime_explainers:
-                print("🔍 LIME analizi yapılıyor...")
-                lime_results = self._generate_lime_explanation(
-                    model_name, features_df, output_dir
-                )
-                explanation_results['explanations']['lime'] = lime_results
+            # SHAP/LIME yalnızca model + feature vektörüne bağlıdır; aynı anahtar önbellekten gelir
+            cache_key = None
+            cached = None
+            if self.result_cache is not None:
+                cache_key = self._explanation_cache_key(model_name, features_df, method)
+                cached = self.result_cache.get(cache_key)
+
+            # Grafik/HTML dosya adları önbellek anahtarına (yoksa transaction id'sine) bağlıdır,
+            # sonraki transaction'lar önbellekteki açıklamanın dosyalarının üzerine yazmaz
+            file_suffix = f"_{cache_key[:16] if cache_key else _file_token(explanation_results['transaction_id'])}"
+
+            if cached is not None:
+                print("⚡ SHAP/LIME açıklaması önbellekten döndü")
+                explanation_results['explanations'] = self._from_cached_explanation(cached)
+                explanation_results['cache_hit'] = True
+            else:
+                # Explainer'ları kur (eğer kurulu değilse)
+                if model_name not in self.shap_explainers:
+                    self.setup_explainers(model_name)
+
+                # SHAP açıklaması
+                if method in ['shap', 'both'] and model_name in self.shap_explainers:
+                    print("🔍 SHAP analizi yapılıyor...")
+                    shap_results = self._generate_shap_explanation(
+                        model_name, features_df, output_dir, file_suffix
+                    )
+                    explanation_results['explanations']['shap'] = shap_results
+
+                # LIME açıklaması
+                if method in ['lime', 'both'] and model_name in self.lime_explainers:
+                    print("🔍 LIME analizi yapılıyor...")
+                    lime_results = self._generate_lime_explanation(
+                        model_name, features_df, output_dir, file_suffix
+                    )
+                    explanation_results['explanations']['lime'] = lime_results
+
+                # Hatalı açıklama önbelleğe alınmaz, sonraki çağrı yeniden dener
+                explanations = explanation_results['explanations']
+                if cache_key is not None and not any('error' in entry for entry in explanations.values()):
+                    self.result_cache.put(cache_key, {'explanations': explanations})
 
             # Business açıklaması
             business_explanation = self._generate_business_explanation(
@@ -643,60 +905,73 @@ class ExplainabilityAnalyzer:
                 'error': str(e),
                 'timestamp': datetime.now().isoformat(),
                 'transaction_id': transaction_data.get('transactionId', 'unknown'),
-                'api_prediction': api_prediction if 'api_prediction' in locals() else None
+                'api_prediction': api_prediction
             }
 
-    def _prepare_features(self, transaction_data: Dict) -> pd.DataFrame:
-        """Transaction data'yı model feature'larına çevir - Gerçek API format'ından"""
-        # Transaction data'dan feature'ları çıkar
-        features = {}
+    def _explanation_cache_key(self, model_name: str, features_df: pd.DataFrame, method: str) -> str:
+        """Model içerik hash'i + kanonik feature vektörü + yöntemden önbellek anahtarı"""
+        model_hash = self.model_index.content_hash(self.loaded_models[model_name]['path'])
+        variant = f"{self.lime_mode}|{self.background_size}"
+        return ExplanationCache.make_key(model_hash, features_df.values[0], method, variant)
 
-        # Temel feature'lar
-        features['Amount'] = transaction_data.get('amount', 0.0)
+    def _from_cached_explanation(self, cached: Dict) -> Dict:
+        """Önbellekteki SHAP/LIME sonuçları; grafik durumları güncel dosya durumundan yenilenir"""
+        explanations = cached['explanations']
+        for entry in explanations.values():
+            if isinstance(entry, dict) and 'visualization_path' in entry:
+                entry['visualization_status'] = self.render_queue.status(entry['visualization_path'])
+        return explanations
 
-        # Time feature'ı timestamp'den çıkar
-        timestamp = transaction_data.get('timestamp')
-        if timestamp:
-            try:
-                from datetime import datetime
-                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                # Gün içindeki saniye
-                features['Time'] = dt.hour * 3600 + dt.minute * 60 + dt.second
-            except:
-                features['Time'] = 43200.0  # Default 12:00
-        else:
-            features['Time'] = 43200.0
-
-        # V feature'ları - AdditionalData'dan VFactors'dan al
-        v_factors = {}
-
-        # Direkt V feature'lar varsa al
-        for i in range(1, 29):
-            v_key = f'V{i}'
-            if v_key in transaction_data:
-                v_factors[v_key] = transaction_data[v_key]
-            elif f'v{i}' in transaction_data:
-                v_factors[v_key] = transaction_data[f'v{i}']
+    def get_cache_stats(self) -> Dict:
+        """Açıklama önbelleği istatistikleri"""
+        return self.result_cache.get_stats() if self.result_cache is not None else {}
 
-        # Eğer V feature'lar yoksa sıfır ile doldur
+    def _prepare_features(self, transaction_data: Dict) -> pd.DataFrame:
+        """Transaction data'yı model feature'larına çevir - Gerçek API format'ından"""
+        return self._prepare_features_batch([transaction_data])
+
+    def _prepare_features_batch(self, transactions: List[Dict]) -> pd.DataFrame:
+        """Transaction listesini tek bir feature matrisine çevir (engineered feature'lar vektörel)"""
+        n = len(transactions)
+        amounts = np.zeros(n)
+        times = np.full(n, 43200.0)  # Default 12:00
+        v_matrix = np.zeros((n, 28))
+
+        for row, transaction_data in enumerate(transactions):
+            # Temel feature'lar
+            amounts[row] = transaction_data.get('amount', 0.0)
+
+            # Time feature'ı timestamp'den çıkar (gün içindeki saniye)
+            timestamp = transaction_data.get('timestamp')
+            if timestamp:
+                try:
+                    dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+                    times[row] = dt.hour * 3600 + dt.minute * 60 + dt.second
+                except (ValueError, AttributeError):
+                    pass
+
+            # V feature'ları - yoksa sıfır kalır
+            for i in range(1, 29):
+                value = transaction_data.get(f'V{i}', transaction_data.get(f'v{i}'))
+                if value is not None:
+                    v_matrix[row, i - 1] = value
+
+        features = {'Amount': amounts, 'Time': times}
         for i in range(1, 29):
-            v_key = f'V{i}'
-            if v_key not in v_factors:
-                v_factors[v_key] = 0.0
-            features[v_key] = v_factors[v_key]
+            features[f'V{i}'] = v_matrix[:, i - 1]
 
         # Engineered features
-        features['AmountLog'] = np.log1p(features['Amount'])
+        features['AmountLog'] = np.log1p(amounts)
 
         # Time-based features
         seconds_in_day = 24 * 60 * 60
-        features['TimeSin'] = np.sin(2 * np.pi * features['Time'] / seconds_in_day)
-        features['TimeCos'] = np.cos(2 * np.pi * features['Time'] / seconds_in_day)
-        features['DayOfWeek'] = int((features['Time'] / seconds_in_day) % 7)
-        features['HourOfDay'] = int((features['Time'] / 3600) % 24)
+        features['TimeSin'] = np.sin(2 * np.pi * times / seconds_in_day)
+        features['TimeCos'] = np.cos(2 * np.pi * times / seconds_in_day)
+        features['DayOfWeek'] = ((times / seconds_in_day) % 7).astype(int)
+        features['HourOfDay'] = ((times / 3600) % 24).astype(int)
 
         # DataFrame'e çevir
-        features_df = pd.DataFrame([features])
+        features_df = pd.DataFrame(features)
 
         # Sadece gerekli feature'ları seç
         missing_features = set(self.feature_names) - set(features_df.columns)
@@ -705,70 +980,85 @@ class ExplainabilityAnalyzer:
 
         return features_df[self.feature_names]
 
-    def _generate_shap_explanation(self, model_name: str, features_df: pd.DataFrame, output_dir: str) -> Dict:
-        """SHAP açıklaması oluştur"""
-        try:
-            explainer = self.shap_explainers[model_name]
-            shap_values = explainer(features_df.values)
+    def _compute_shap_arrays(self, model_name: str, X: np.ndarray, chunk_size: int = 1000):
+        """
+        SHAP explainer'ı matrisin tamamı üzerinde (chunk'lar halinde) çalıştır
 
-            # SHAP values extract
-            if hasattr(shap_values, 'values'):
-                values = shap_values.values[0] if len(shap_values.values.shape) > 2 else shap_values.values[0]
-                base_value = shap_values.base_values[0] if hasattr(shap_values, 'base_values') else 0
-            else:
-                values = shap_values[0] if isinstance(shap_values, list) else shap_values[0]
-                base_value = getattr(explainer, 'expected_value', 0)
-                if isinstance(base_value, np.ndarray):
-                    base_value = base_value[1] if len(base_value) > 1 else base_value[0]
+        Returns:
+            (values (n, n_features), base_values (n,)) - pozitif (fraud) sınıf için
+        """
+        explainer = self.shap_explainers[model_name]
+        all_values = []
+        all_base = []
+
+        for start in range(0, len(X), chunk_size):
+            chunk = X[start:start + chunk_size]
+            shap_values = explainer(chunk)
+            values = np.asarray(shap_values.values)
+            base = np.asarray(shap_values.base_values)
+
+            # Çok sınıflı çıktıda (n, d, sınıf) pozitif sınıfı al
+            if values.ndim == 3:
+                values = values[:, :, -1]
+            if base.ndim == 2:
+                base = base[:, -1]
+
+            all_values.append(values)
+            all_base.append(np.broadcast_to(base, (len(chunk),)))
+
+        return np.vstack(all_values), np.concatenate(all_base)
+
+    def _summarize_shap_row(self, values: np.ndarray, feature_values: np.ndarray, base_value: float) -> Dict:
+        """Tek satırın SHAP değerlerinden açıklama özeti oluştur"""
+        feature_importance = list(zip(self.feature_names, values, feature_values))
+        feature_importance.sort(key=lambda x: abs(x[1]), reverse=True)
+
+        return {
+            'base_value': float(base_value),
+            'prediction_value': float(base_value + np.sum(values)),
+            'feature_contributions': [
+                {
+                    'feature': name,
+                    'value': float(value),
+                    'shap_value': float(shap_val),
+                    'contribution': 'positive' if shap_val > 0 else 'negative',
+                    'abs_importance': float(abs(shap_val))
+                }
+                for name, shap_val, value in feature_importance
+            ],
+            'top_positive_features': [
+                {'feature': name, 'shap_value': float(val)}
+                for name, val, _ in feature_importance if val > 0
+            ][:5],
+            'top_negative_features': [
+                {'feature': name, 'shap_value': float(val)}
+                for name, val, _ in feature_importance if val < 0
+            ][:5]
+        }
+
+    def _generate_shap_explanation(self, model_name: str, features_df: pd.DataFrame, output_dir: str,
+                                   file_suffix: str = '') -> Dict:
+        """SHAP açıklaması oluştur (file_suffix, aynı dizine yazılan grafik/HTML dosyalarını ayırır)"""
+        try:
+            values_matrix, base_values = self._compute_shap_arrays(model_name, features_df.values)
+            values = values_matrix[0]
+            base_value = base_values[0]
 
             # Feature importance
             feature_importance = list(zip(self.feature_names, values))
             feature_importance.sort(key=lambda x: abs(x[1]), reverse=True)
 
-            # Ana SHAP görselleştirmesi
-            plt.figure(figsize=(15, 10))
-            plt.style.use('seaborn')
-            
-            # Bar plot
-            plt.subplot(2, 1, 1)
-            top_features = feature_importance[:15]
-            feature_names_plot = [f[0] for f in top_features]
-            feature_values_plot = [f[1] for f in top_features]
-            
-            colors = ['#dc3545' if v > 0 else '#198754' for v in feature_values_plot]
-            bars = plt.barh(range(len(feature_names_plot)), feature_values_plot, color=colors, alpha=0.7)
-            
-            # Bar etiketleri
-            for i, bar in enumerate(bars):
-                width = bar.get_width()
-                plt.text(width if width > 0 else 0, 
-                        bar.get_y() + bar.get_height()/2,
-                        f'{width:.4f}',
-                        ha='left' if width > 0 else 'right',
-                        va='center',
-                        color='white',
-                        fontweight='bold',
-                        padding=5)
-            
-            plt.yticks(range(len(feature_names_plot)), feature_names_plot)
-            plt.xlabel('SHAP Değeri (Fraud Olasılığına Etkisi)')
-            plt.title('SHAP Feature Önem Sıralaması - Fraud Detection', pad=20)
-            plt.axvline(x=0, color='black', linestyle='-', alpha=0.3)
-            
-            # Waterfall plot
-            plt.subplot(2, 1, 2)
-            shap.initjs()
-            shap.force_plot(base_value, values, features_df.iloc[0],
-                          matplotlib=True, show=False, figsize=(15, 3))
-            plt.title('SHAP Waterfall Plot - Feature Etkileri', pad=20)
-            
-            plt.tight_layout()
-            shap_plot_path = os.path.join(output_dir, 'shap_explanation.png')
-            plt.savefig(shap_plot_path, dpi=300, bbox_inches='tight', facecolor='white')
-            plt.close()
+            # Grafik çizimi ertelenir - JSON hemen döner, figür render kuyruğunda çizilir
+            shap_plot_path = self.render_queue.submit(render_shap_chart, {
+                'top_features': [(name, float(val)) for name, val in feature_importance[:15]],
+                'base_value': float(base_value),
+                'values': [float(v) for v in values],
+                'feature_values': [float(v) for v in features_df.values[0]],
+                'feature_names': self.feature_names
+            }, os.path.join(output_dir, f'shap_explanation{file_suffix}.png'))
 
             # HTML raporu için ek görselleştirmeler
-            html_path = os.path.join(output_dir, 'shap_explanation.html')
+            html_path = os.path.join(output_dir, f'shap_explanation{file_suffix}.html')
             with open(html_path, 'w', encoding='utf-8') as f:
                 f.write(f'''
                 <!DOCTYPE html>
@@ -853,115 +1143,75 @@ class ExplainabilityAnalyzer:
                 </html>
                 ''')
 
-            return {
-                'base_value': float(base_value),
-                'prediction_value': float(base_value + np.sum(values)),
-                'feature_contributions': [
-                    {
-                        'feature': name,
-                        'value': float(features_df[name].iloc[0]),
-                        'shap_value': float(shap_val),
-                        'contribution': 'positive' if shap_val > 0 else 'negative',
-                        'abs_importance': float(abs(shap_val))
-                    }
-                    for name, shap_val in feature_importance
-                ],
-                'top_positive_features': [
-                    {'feature': name, 'shap_value': float(val)}
-                    for name, val in feature_importance if val > 0
-                ][:5],
-                'top_negative_features': [
-                    {'feature': name, 'shap_value': float(val)}
-                    for name, val in feature_importance if val < 0
-                ][:5],
-                'visualization_path': shap_plot_path,
-                'html_report_path': html_path
-            }
+            summary = self._summarize_shap_row(values, features_df.values[0], base_value)
+            summary['visualization_path'] = shap_plot_path
+            summary['visualization_status'] = self.render_queue.status(shap_plot_path)
+            summary['html_report_path'] = html_path
+            return summary
 
         except Exception as e:
             print(f"SHAP explanation error: {e}")
             return {'error': str(e)}
 
-    def _generate_lime_explanation(self, model_name: str, features_df: pd.DataFrame, output_dir: str) -> Dict:
-        """LIME açıklaması oluştur"""
-        try:
-            lime_explainer = self.lime_explainers[model_name]
+    def _get_fast_lime_explainer(self, model_name: str) -> Optional[FastLimeExplainer]:
+        """Model için fast LIME explainer'ı (pertürbasyon havuzu ilk kullanımda hesaplanır)"""
+        if model_name not in self.fast_lime_explainers:
             model_info = self.loaded_models[model_name]
+            try:
+                scorer = FusedScorer(model_info['model'], model_info['type'])
+                self.fast_lime_explainers[model_name] = FastLimeExplainer(self.lime_explainers[model_name], scorer)
+            except Exception as e:
+                print(f"⚠️ Fast LIME kurulamadı ({e}), standart LIME kullanılıyor")
+                self.fast_lime_explainers[model_name] = None
+        return self.fast_lime_explainers[model_name]
 
-            # Prediction function
-            def predict_fn(X):
-                X_df = pd.DataFrame(X, columns=self.feature_names)
-                if model_info['type'] == 'ensemble':
-                    return self._ensemble_predict_wrapper(X_df.values, model_info['model'])
-                elif model_info['type'] == 'lightgbm':
-                    return model_info['model'].predict_proba(X_df)
-                elif model_info['type'] == 'pca':
-                    return self._pca_predict_wrapper(X_df.values, model_info['model'])
-                else:
-                    prob = np.full(len(X_df), 0.3)
-                    return np.array([1 - prob, prob]).T
-
-            # LIME explanation
+    def _generate_lime_explanation(self, model_name: str, features_df: pd.DataFrame, output_dir: str,
+                                   file_suffix: str = '') -> Dict:
+        """LIME açıklaması oluştur (file_suffix, aynı dizine yazılan grafik/HTML dosyalarını ayırır)"""
+        try:
             instance = features_df.iloc[0].values
-            lime_exp = lime_explainer.explain_instance(
-                instance,
-                predict_fn,
-                num_features=15,
-                num_samples=1000
-            )
+            fast_explainer = self._get_fast_lime_explainer(model_name) if self.lime_mode == 'fast' else None
+
+            if fast_explainer is not None:
+                # Önbellekli pertürbasyon tasarımı + erken durdurma
+                lime_exp = fast_explainer.explain_instance(instance, num_features=15)
+            else:
+                lime_explainer = self.lime_explainers[model_name]
+                model_info = self.loaded_models[model_name]
+
+                # Prediction function
+                def predict_fn(X):
+                    X_df = pd.DataFrame(X, columns=self.feature_names)
+                    if model_info['type'] == 'ensemble':
+                        return self._ensemble_predict_wrapper(X_df.values, model_info['model'])
+                    elif model_info['type'] == 'lightgbm':
+                        return model_info['model'].predict_proba(X_df)
+                    elif model_info['type'] == 'pca':
+                        return self._pca_predict_wrapper(X_df.values, model_info['model'])
+                    else:
+                        prob = np.full(len(X_df), 0.3)
+                        return np.array([1 - prob, prob]).T
+
+                # LIME explanation
+                lime_exp = lime_explainer.explain_instance(
+                    instance,
+                    predict_fn,
+                    num_features=15,
+                    num_samples=1000
+                )
 
             # Results extract
             lime_features = lime_exp.as_list()
+            probs = [float(p) for p in lime_exp.predict_proba]
 
-            # Ana görselleştirme
-            plt.figure(figsize=(15, 10))
-            plt.style.use('seaborn')
-            
-            # Bar plot
-            plt.subplot(2, 1, 1)
-            feature_names = [f[0] for f in lime_features]
-            feature_weights = [f[1] for f in lime_features]
-            
-            colors = ['#dc3545' if w > 0 else '#198754' for w in feature_weights]
-            bars = plt.barh(range(len(feature_names)), feature_weights, color=colors, alpha=0.7)
-            
-            # Bar etiketleri
-            for i, bar in enumerate(bars):
-                width = bar.get_width()
-                plt.text(width if width > 0 else 0,
-                        bar.get_y() + bar.get_height()/2,
-                        f'{width:.4f}',
-                        ha='left' if width > 0 else 'right',
-                        va='center',
-                        color='white',
-                        fontweight='bold',
-                        padding=5)
-            
-            plt.yticks(range(len(feature_names)), feature_names)
-            plt.xlabel('LIME Ağırlığı (Local Etki)')
-            plt.title('LIME Feature Önem Sıralaması', pad=20)
-            plt.axvline(x=0, color='black', linestyle='-', alpha=0.3)
-            
-            # Prediction probability
-            plt.subplot(2, 1, 2)
-            probs = lime_exp.predict_proba
-            plt.bar(['Normal', 'Fraud'], probs, color=['#198754', '#dc3545'])
-            plt.title('LIME Tahmin Olasılıkları', pad=20)
-            plt.ylim(0, 1)
-            
-            # Probability etiketleri
-            for i, v in enumerate(probs):
-                plt.text(i, v/2, f'{v:.1%}',
-                        ha='center', va='center',
-                        color='white', fontweight='bold')
-            
-            plt.tight_layout()
-            lime_plot_path = os.path.join(output_dir, 'lime_explanation.png')
-            plt.savefig(lime_plot_path, dpi=300, bbox_inches='tight', facecolor='white')
-            plt.close()
+            # Grafik çizimi ertelenir - JSON hemen döner, figür render kuyruğunda çizilir
+            lime_plot_path = self.render_queue.submit(render_lime_chart, {
+                'features': [(name, float(weight)) for name, weight in lime_features],
+                'probs': probs
+            }, os.path.join(output_dir, f'lime_explanation{file_suffix}.png'))
 
             # HTML raporu
-            html_path = os.path.join(output_dir, 'lime_explanation.html')
+            html_path = os.path.join(output_dir, f'lime_explanation{file_suffix}.html')
             with open(html_path, 'w', encoding='utf-8') as f:
                 f.write(f'''
                 <!DOCTYPE html>
@@ -1084,7 +1334,9 @@ class ExplainabilityAnalyzer:
                 ],
                 'prediction_probability': float(lime_exp.predict_proba[1]),
                 'intercept': float(lime_exp.intercept[1]),
+                'num_samples': int(getattr(lime_exp, 'num_samples', 1000)),
                 'visualization_path': lime_plot_path,
+                'visualization_status': self.render_queue.status(lime_plot_path),
                 'html_report_path': html_path,
                 'top_contributing_features': sorted(
                     lime_features, key=lambda x: abs(x[1]), reverse=True
@@ -1320,44 +1572,275 @@ class ExplainabilityAnalyzer:
             }
         }
 
-    def batch_explain(self, transactions: List[Dict], model_type: str = "Ensemble", method: str = "shap") -> Dict:
-        """Birden fazla transaction için batch açıklama"""
+    def flush_renders(self) -> Dict:
+        """
+        Kuyrukta bekleyen grafiklerin çizimini tamamla
+
+        Açıklama JSON'ları grafikleri visualization_status='pending' ile referans verir;
+        kesinleşen durumlar grafiğin dizinindeki chart_status.json'a yazılır.
+        """
+        stats = self.render_queue.wait()
+        self._write_chart_status(self.render_queue.pop_resolved())
+        if stats['submitted']:
+            print(f"🖼️ Grafikler: {stats['rendered']} çizildi, {stats['cache_hits']} önbellekten, "
+                  f"{stats['failed']} hata")
+        return stats
+
+    def shutdown_renders(self) -> Dict:
+        """Bekleyen grafikleri tamamla, durumlarını yaz ve process pool'u kapat"""
+        stats = self.flush_renders()
+        self.render_queue.shutdown()
+        return stats
+
+    @staticmethod
+    def _write_chart_status(resolved: List[Tuple[str, str]]):
+        """Kesinleşen grafik durumlarını dizin başına chart_status.json'a ekle (dosya adı -> durum)"""
+        by_directory = {}
+        for path, status in resolved:
+            by_directory.setdefault(os.path.dirname(path) or '.', {})[os.path.basename(path)] = status
+
+        for directory, statuses in by_directory.items():
+            status_file = os.path.join(directory, 'chart_status.json')
+            try:
+                current = {}
+                if os.path.exists(status_file):
+                    with open(status_file, 'r', encoding='utf-8') as f:
+                        current = json.load(f)
+                current.update(statuses)
+                with open(status_file, 'w', encoding='utf-8') as f:
+                    json.dump(current, f, indent=2, ensure_ascii=False)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Grafik durumu yazılamadı ({status_file}): {e}")
+
+    def batch_explain(self, transactions: List[Dict], model_type: str = "Ensemble", method: str = "shap",
+                      chunk_size: int = 1000, output_dir: Optional[str] = None,
+                      result_sink=None, index_offset: int = 0) -> Dict:
+        """
+        Birden fazla transaction için batch açıklama
+
+        Tahminler toplu endpoint'ten alınır, tüm transaction'lar tek bir feature
+        matrisine çevrilir ve SHAP explainer matris üzerinde (chunk'lar halinde) bir kez
+        çalıştırılır. Transaction başına grafik çizilmez; sonuçlar tek dosyaya yazılır.
+        LIME yerel bir yöntem olduğundan istenirse satır bazında çalışır.
+
+        result_sink verilirse (add_result / add_error metodları olan nesne, ör. JsonlResultWriter)
+        sonuçlar listede biriktirilmez ve dosyaya yazılmaz; her transaction için girdi
+        sırasıyla tek kayıt sink'e, üretildiği anda iletilir. LIME grafikleri arka planda
+        çizilir (visualization_status='pending', bkz. flush_renders); dosya adları
+        transaction id'sini taşır.
+
+        Args:
+            transactions: Transaction listesi
+            model_type: Model tipi (Ensemble, LightGBM, PCA)
+            method: Açıklama yöntemi (shap, lime, both)
+            chunk_size: SHAP'e tek seferde verilecek satır sayısı
+            output_dir: Çıktı dizini
+            result_sink: Akışlı çıktı için sonuç alıcısı
+            index_offset: Hata kayıtlarındaki transaction_index'e eklenecek değer (akışlı girdi için)
+        """
         print(f"=== BATCH EXPLANATION START ===")
         print(f"Transaction count: {len(transactions)}")
 
         results = []
         errors = []
+        successful = failed = 0
+        timestamp = datetime.now().isoformat()
+        if output_dir is None:
+            output_dir = f"explanations/batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        os.makedirs(output_dir, exist_ok=True)
+
+        def emit_result(result):
+            nonlocal successful
+            successful += 1
+            if result_sink is not None:
+                result_sink.add_result(result)
+            else:
+                results.append(result)
 
-        for i, transaction in enumerate(transactions):
+        def emit_error(i, error):
+            nonlocal failed
+            failed += 1
+            record = {
+                'transaction_index': index_offset + i,
+                'transaction_id': transactions[i].get('transactionId', 'unknown'),
+                'error': error
+            }
+            if result_sink is not None:
+                result_sink.add_error(record)
+            else:
+                errors.append(record)
+
+        # Tahminleri tek tek değil, toplu endpoint ile al
+        predictions = self.api_client.predict_many(transactions, model_type=model_type)["results"]
+        valid_indices = [i for i, prediction in enumerate(predictions) if "error" not in prediction]
+
+        # Model ve explainer'lar bir kez hazırlanır
+        model_name = f"fraud_model_{model_type.lower()}"
+        model_available = model_name in self.loaded_models or self.load_model(model_name, model_type.lower())
+        if model_available and model_name not in self.shap_explainers:
+            self.setup_explainers(model_name)
+
+        shap_values = base_values = None
+        features_df = self._prepare_features_batch([transactions[i] for i in valid_indices])
+
+        if valid_indices and model_available and method in ['shap', 'both'] and model_name in self.shap_explainers:
             try:
-                print(f"Processing transaction {i + 1}/{len(transactions)}")
-                result = self.explain_transaction(
-                    transaction,
-                    model_type=model_type,
-                    method=method,
-                    output_dir=f"explanations/batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-                )
-                results.append(result)
+                print(f"🔍 SHAP analizi {len(valid_indices)} satır için tek seferde yapılıyor...")
+                shap_values, base_values = self._compute_shap_arrays(model_name, features_df.values, chunk_size)
             except Exception as e:
-                print(f"Error processing transaction {i + 1}: {e}")
-                errors.append({
-                    'transaction_index': i,
+                print(f"❌ Batch SHAP hatası: {e}")
+
+        rows = {i: row for row, i in enumerate(valid_indices)}
+        for i, transaction in enumerate(transactions):
+            if i not in rows:
+                emit_error(i, f"API prediction error: {predictions[i]['error']}")
+                continue
+
+            row = rows[i]
+            try:
+                if not model_available:
+                    emit_result(self._create_api_only_response(predictions[i], transaction))
+                    continue
+
+                explanations = {}
+                if shap_values is not None:
+                    explanations['shap'] = self._summarize_shap_row(
+                        shap_values[row], features_df.values[row], base_values[row]
+                    )
+
+                if method in ['lime', 'both'] and model_name in self.lime_explainers:
+                    explanations['lime'] = self._generate_lime_explanation(
+                        model_name, features_df.iloc[[row]], output_dir,
+                        file_suffix=f"_{_file_token(transaction.get('transactionId', index_offset + i))}"
+                    )
+
+                emit_result({
+                    'timestamp': timestamp,
                     'transaction_id': transaction.get('transactionId', 'unknown'),
-                    'error': str(e)
+                    'model_type': model_type,
+                    'api_prediction': predictions[i],
+                    'explanations': explanations,
+                    'business_explanation': self._generate_business_explanation(
+                        predictions[i], explanations, transaction
+                    )
                 })
+            except Exception as e:
+                print(f"Error processing transaction {index_offset + i + 1}: {e}")
+                emit_error(i, str(e))
+
+        if result_sink is None:
+            # Sonuçları tek dosyaya kaydet
+            result_file = os.path.join(output_dir, 'batch_explanations.json')
+            with open(result_file, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2, ensure_ascii=False, default=str)
+        else:
+            result_file = getattr(result_sink, 'path', None)
 
-        print(f"✅ Batch explanation completed. Success: {len(results)}, Errors: {len(errors)}")
+        print(f"✅ Batch explanation completed. Success: {successful}, Errors: {failed}")
 
         return {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': timestamp,
             'total_transactions': len(transactions),
-            'successful_explanations': len(results),
-            'failed_explanations': len(errors),
+            'successful_explanations': successful,
+            'failed_explanations': failed,
             'results': results,
-            'errors': errors
+            'errors': errors,
+            'result_file': result_file
         }
 
 
+def _file_token(value) -> str:
+    """Transaction id'sini dosya adında kullanılabilir hale getir"""
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', str(value))
+
+
+def _pyplot():
+    """matplotlib'i (Agg backend) ilk grafik çiziminde yükle"""
+    import matplotlib
+    matplotlib.use('Agg')  # Non-interactive backend
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _plot_weight_bars(features: List, xlabel: str, title: str):
+    """Pozitif/negatif ağırlıkları yatay bar olarak çiz"""
+    plt = _pyplot()
+    names = [f[0] for f in features]
+    weights = [f[1] for f in features]
+
+    colors = ['#dc3545' if w > 0 else '#198754' for w in weights]
+    bars = plt.barh(range(len(names)), weights, color=colors, alpha=0.7)
+
+    # Bar etiketleri
+    for bar in bars:
+        width = bar.get_width()
+        plt.text(width if width > 0 else 0,
+                 bar.get_y() + bar.get_height() / 2,
+                 f'{width:.4f}',
+                 ha='left' if width > 0 else 'right',
+                 va='center',
+                 fontweight='bold')
+
+    plt.yticks(range(len(names)), names)
+    plt.xlabel(xlabel)
+    plt.title(title, pad=20)
+    plt.axvline(x=0, color='black', linestyle='-', alpha=0.3)
+
+
+def render_shap_chart(data: Dict, output_path: str, dpi: int):
+    """SHAP feature önem ve force plot grafiğini çiz (render kuyruğu için)"""
+    import shap
+    plt = _pyplot()
+
+    plt.figure(figsize=(15, 10))
+    plt.style.use('seaborn-v0_8')
+
+    # Bar plot
+    plt.subplot(2, 1, 1)
+    _plot_weight_bars(data['top_features'], 'SHAP Değeri (Fraud Olasılığına Etkisi)',
+                      'SHAP Feature Önem Sıralaması - Fraud Detection')
+
+    # Waterfall plot
+    plt.subplot(2, 1, 2)
+    shap.force_plot(data['base_value'], np.array(data['values']),
+                    pd.Series(data['feature_values'], index=data['feature_names']),
+                    matplotlib=True, show=False, figsize=(15, 3))
+    plt.title('SHAP Waterfall Plot - Feature Etkileri', pad=20)
+
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=dpi, bbox_inches='tight', facecolor='white')
+    plt.close('all')
+
+
+def render_lime_chart(data: Dict, output_path: str, dpi: int):
+    """LIME yerel ağırlık ve olasılık grafiğini çiz (render kuyruğu için)"""
+    plt = _pyplot()
+
+    plt.figure(figsize=(15, 10))
+    plt.style.use('seaborn-v0_8')
+
+    # Bar plot
+    plt.subplot(2, 1, 1)
+    _plot_weight_bars(data['features'], 'LIME Ağırlığı (Local Etki)', 'LIME Feature Önem Sıralaması')
+
+    # Prediction probability
+    plt.subplot(2, 1, 2)
+    probs = data['probs']
+    plt.bar(['Normal', 'Fraud'], probs, color=['#198754', '#dc3545'])
+    plt.title('LIME Tahmin Olasılıkları', pad=20)
+    plt.ylim(0, 1)
+
+    # Probability etiketleri
+    for i, v in enumerate(probs):
+        plt.text(i, v / 2, f'{v:.1%}',
+                 ha='center', va='center',
+                 color='white', fontweight='bold')
+
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=dpi, bbox_inches='tight', facecolor='white')
+    plt.close('all')
+
+
 def create_sample_transaction() -> Dict:
     """Test için örnek transaction oluştur"""
     return {
@@ -1495,6 +1978,7 @@ def main():
                 for insight in business['key_insights'][:3]:
                     print(f"  • {insight}")
 
+            analyzer.flush_renders()
             print(f"\n📁 Detaylı sonuçlar: demo_explanations/")
 
         else:
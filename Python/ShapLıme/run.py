@@ -574,17 +574,27 @@ def run_explanation_demo(analyzer: ExplainabilityAnalyzer):
     total = len(transactions)
     
     print("\n🔍 İşlemler analiz ediliyor...")
+    output_dir = f"demo_results/batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+    # Tahminleri tek istekte toplu olarak al
+    predictions = analyzer.api_client.predict_many(transactions, model_type="Ensemble")["results"]
+
     for i, transaction in enumerate(transactions, 1):
         if i % 100 == 0:  # Her 100 işlemde bir ilerleme göster
             print(f"İşleniyor: {i}/{total} ({(i/total)*100:.1f}%)")
         
         try:
+            if 'error' in predictions[i - 1]:
+                print(f"   ❌ İşlem {i} tahmin hatası: {predictions[i - 1]['error']}")
+                continue
+
             # Sadece SHAP kullan (daha hızlı)
             explanation = analyzer.explain_transaction(
                 transaction_data=transaction,
                 model_type="Ensemble",
                 method="shap",
-                output_dir=f"demo_results/batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                output_dir=output_dir,
+                api_prediction=predictions[i - 1]
             )
 
             if 'error' in explanation:
@@ -599,6 +609,9 @@ def run_explanation_demo(analyzer: ExplainabilityAnalyzer):
 
     print(f"\n✅ Analiz tamamlandı. Başarılı: {len(demo_results)}, Hata: {total - len(demo_results)}")
 
+    # Arka planda çizilen grafiklerin bitmesini bekle
+    analyzer.flush_renders()
+
     # HTML özet raporu oluştur
     save_html_summary(demo_results, "demo_results/summary2.html")
 
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Advanced Ensemble - LightGBM, AutoEncoder ve Isolation Forest skorlarının tek geçişte birleşimi
+Üye modeller, skor normalizer'ları, ağırlıklar ve olasılık kalibratörü tek joblib
+artefaktında saklanır; paylaşılan float32 feature matrisi chunk chunk tüm üyelerden geçirilir
+"""
+
+import itertools
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Desteklenen üye tipleri (advanced_ml_models --model-type advanced_ensemble)
+ENSEMBLE_MEMBER_TYPES = ('lightgbm', 'autoencoder', 'isolation_forest')
+
+# Ağırlık aramasında optimize edilen metrikler
+WEIGHT_OBJECTIVES = ('auc_pr', 'auc')
+
+# Skorlamada chunk başına satır sayısı
+DEFAULT_SCORE_CHUNK_SIZE = 8192
+
+# Simplex ızgarasının adımı; aday sayısı sınırı aşarsa adım büyütülür
+DEFAULT_WEIGHT_STEP = 0.05
+MAX_WEIGHT_CANDIDATES = 20000
+
+# Aday ağırlık vektörleri bu büyüklükte bloklar halinde değerlendirilir (n x blok matris)
+WEIGHT_BLOCK_SIZE = 64
+
+# Normalizer'da saklanan quantile sayısı
+DEFAULT_QUANTILES = 1001
+
+
+class QuantileNormalizer:
+    """
+    Ham üye skorunu referans dağılımdaki yüzdelik dilimine (0-1) eşler
+
+    LightGBM olasılığı, rekonstrüksiyon hatası ve Isolation Forest skoru farklı
+    ölçeklerde olduğundan ağırlıklı toplamdan önce aynı ölçeğe getirilir. Fraud
+    oranı düşük olduğundan üst kuyruk ayrıca sık örneklenir.
+    """
+
+    def __init__(self, n_quantiles: int = DEFAULT_QUANTILES):
+        self.n_quantiles = n_quantiles
+        self.quantiles_ = None
+        self.levels_ = None
+
+    def fit(self, scores) -> 'QuantileNormalizer':
+        tail = 1 - np.geomspace(1e-2, 1e-6, self.n_quantiles // 4)
+        levels = np.unique(np.concatenate([np.linspace(0, 1, self.n_quantiles), tail]))
+        quantiles = np.quantile(np.asarray(scores, dtype=np.float64), levels)
+
+        # Eşit quantile'lar (ör. sıfıra yığılmış olasılıklar) ortalama seviyeye eşlenir
+        self.quantiles_, inverse = np.unique(quantiles, return_inverse=True)
+        self.levels_ = np.bincount(inverse, weights=levels) / np.bincount(inverse)
+        return self
+
+    def transform(self, scores) -> np.ndarray:
+        return np.interp(scores, self.quantiles_, self.levels_)
+
+
+class EnsembleMember:
+    """
+    Ensemble üyesi: model + ham skor fonksiyonu + normalizer
+
+    Ham skorlar "büyük = daha riskli" yönündedir: LightGBM fraud olasılığı,
+    AutoEncoder rekonstrüksiyon hatası (scaler modüle gömülü), Isolation Forest
+    için -decision_function.
+    """
+
+    def __init__(self, name: str, model, normalizer: Optional[QuantileNormalizer] = None):
+        if name not in ENSEMBLE_MEMBER_TYPES:
+            raise ValueError(f"Desteklenmeyen ensemble üyesi: {name} ({', '.join(ENSEMBLE_MEMBER_TYPES)})")
+        self.name = name
+        self.model = model
+        self.normalizer = normalizer
+
+    def raw_scores(self, X: np.ndarray) -> np.ndarray:
+        """(n, d) float32 matris -> (n,) ham skor"""
+        if self.name == 'lightgbm':
+            return self.model.predict_proba(X)[:, 1]
+        if self.name == 'isolation_forest':
+            return -self.model.decision_function(X)
+
+        import torch
+
+        with torch.inference_mode():
+            return self.model.reconstruction_error(torch.from_numpy(X)).numpy()
+
+
+class AdvancedEnsemble:
+    """
+    N üyeli ensemble artefaktı
+
+    Skorlama tek geçişlidir: feature matrisi bir kez float32'ye çevrilir, her chunk
+    sırayla tüm üyelerden geçirilir ve (n, k) skor matrisine yazılır. Birleşik risk
+    skoru normalize edilmiş skor matrisi ile ağırlık vektörünün çarpımıdır; yüzdelik
+    dilimlerin karışımı olduğundan olasılık değildir. Fraud olasılığı bu skora
+    isotonic regresyonla kalibre edilir; karar eşiği risk skoru üzerindedir.
+    """
+
+    def __init__(self, members: List[EnsembleMember], feature_names: List[str],
+                 chunk_size: int = DEFAULT_SCORE_CHUNK_SIZE):
+        if not members:
+            raise ValueError("Ensemble en az bir üye gerektirir")
+        self.members = members
+        self.feature_names = list(feature_names)
+        self.chunk_size = chunk_size
+        self.weights = np.full(len(members), 1.0 / len(members))
+        self.decision_threshold = 0.5
+        self.calibrator = None
+
+    @property
+    def member_names(self) -> List[str]:
+        return [member.name for member in self.members]
+
+    def set_num_threads(self, num_threads: int):
+        """Ağaç tabanlı üyelerin skorlama thread sayısı (tahmin process'inin bütçesi)"""
+        for member in self.members:
+            if member.name != 'autoencoder':
+                member.model.set_params(n_jobs=num_threads)
+
+    def raw_scores(self, X) -> np.ndarray:
+        """Paylaşılan matrisi chunk chunk tüm üyelerden geçir -> (n, k) ham skor matrisi"""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        scores = np.empty((len(X), len(self.members)))
+        for start in range(0, len(X), self.chunk_size):
+            chunk = X[start:start + self.chunk_size]
+            for j, member in enumerate(self.members):
+                scores[start:start + len(chunk), j] = member.raw_scores(chunk)
+        return scores
+
+    def normalize(self, raw: np.ndarray) -> np.ndarray:
+        """(n, k) ham skor -> (n, k) normalize skor"""
+        normalized = np.empty_like(raw)
+        for j, member in enumerate(self.members):
+            normalized[:, j] = member.normalizer.transform(raw[:, j])
+        return normalized
+
+    def score(self, X) -> Tuple[np.ndarray, np.ndarray]:
+        """Tek geçişte (birleşik risk skoru (n,), normalize üye skorları (n, k))"""
+        member_scores = self.normalize(self.raw_scores(X))
+        return member_scores @ self.weights, member_scores
+
+    def calibrate(self, risk_scores) -> np.ndarray:
+        """Birleşik risk skoru -> kalibre fraud olasılığı"""
+        risk_scores = np.asarray(risk_scores, dtype=np.float64)
+        if self.calibrator is None:
+            raise ValueError("Ensemble kalibre edilmemiş; önce fit çağrılmalı")
+        return self.calibrator.predict(risk_scores)
+
+    def predict_proba(self, X) -> np.ndarray:
+        return self.calibrate(self.score(X)[0])
+
+    def predict(self, X) -> np.ndarray:
+        return (self.score(X)[0] >= self.decision_threshold).astype(int)
+
+    def fit(self, X, y, step: float = DEFAULT_WEIGHT_STEP, objective: str = 'auc_pr') -> Dict:
+        """
+        Normalizer'ları, ağırlıkları, karar eşiğini ve olasılık kalibratörünü (test)
+        setinin skorlarından öğren
+
+        Üyeler önceden eğitilmiş olmalıdır; X tek geçişte skorlanır.
+
+        Returns:
+            Ağırlık araması özeti (üye başına metrik, seçilen ağırlıklar, eşik, risk
+            skorları ve kalibre olasılıklar)
+        """
+        y = np.asarray(y).astype(int)
+        raw = self.raw_scores(X)
+        for j, member in enumerate(self.members):
+            member.normalizer = QuantileNormalizer().fit(raw[:, j])
+        member_scores = self.normalize(raw)
+
+        self.weights, best_value, n_candidates = fit_ensemble_weights(member_scores, y, step, objective)
+        combined = member_scores @ self.weights
+        self.decision_threshold = f1_optimal_threshold(combined, y)
+
+        # Risk skoru monoton olarak gözlenen fraud oranına eşlenir
+        from sklearn.isotonic import IsotonicRegression
+
+        self.calibrator = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds='clip').fit(combined, y)
+
+        member_metrics = score_columns(member_scores, y, objective)
+        return {
+            'objective': objective,
+            'objective_value': float(best_value),
+            'weight_candidates': n_candidates,
+            'weights': dict(zip(self.member_names, self.weights.tolist())),
+            'member_objective': dict(zip(self.member_names, member_metrics.tolist())),
+            'decision_threshold': self.decision_threshold,
+            'combined_scores': combined,
+            'calibrated_probabilities': self.calibrate(combined)
+        }
+
+
+def simplex_grid(k: int, step: float) -> np.ndarray:
+    """Toplamı 1 olan, step aralıklı negatif olmayan tüm k'lık ağırlık vektörleri (m, k)"""
+    divisions = max(1, int(round(1 / step)))
+    while divisions > 1 and math.comb(divisions + k - 1, k - 1) > MAX_WEIGHT_CANDIDATES:
+        divisions //= 2
+
+    # Stars and bars: divisions birimi k üyeye dağıtmanın tüm yolları
+    grid = [np.diff((-1,) + bars + (divisions + k - 1,)) - 1
+            for bars in itertools.combinations(range(divisions + k - 1), k - 1)]
+    return np.array(grid, dtype=np.float64) / divisions
+
+
+def score_columns(scores: np.ndarray, y: np.ndarray, objective: str = 'auc_pr') -> np.ndarray:
+    """
+    (n, m) skor matrisinin her kolonu için metrik, tek vektörel işlemle
+
+    auc_pr: average precision (azalan sıralamada pozitiflerdeki precision ortalaması)
+    auc: ROC AUC (Mann-Whitney U, eşit skorlara ortalama rank)
+    """
+    positive = y == 1
+    n_pos = int(positive.sum())
+    n_neg = len(y) - n_pos
+    if n_pos == 0 or n_neg == 0:
+        return np.zeros(scores.shape[1])
+
+    if objective == 'auc':
+        from scipy.stats import rankdata
+
+        ranks = rankdata(scores, axis=0)
+        return (ranks[positive].sum(axis=0) - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg)
+
+    order = np.argsort(-scores, axis=0, kind='stable')
+    hits = positive[order]
+    precision = np.cumsum(hits, axis=0) / np.arange(1, len(y) + 1)[:, None]
+    return (precision * hits).sum(axis=0) / n_pos
+
+
+def fit_ensemble_weights(member_scores: np.ndarray, y: np.ndarray, step: float = DEFAULT_WEIGHT_STEP,
+                         objective: str = 'auc_pr') -> Tuple[np.ndarray, float, int]:
+    """
+    Simplex üzerindeki tüm aday ağırlıkları vektörel değerlendirip en iyisini seç
+
+    Birleşik skorlar blok blok tek matris çarpımıyla (n, k) @ (k, blok) üretilir ve
+    her aday kolon için metrik aynı anda hesaplanır.
+
+    Returns:
+        (ağırlıklar (k,), en iyi metrik değeri, aday sayısı)
+    """
+    if objective not in WEIGHT_OBJECTIVES:
+        raise ValueError(f"Desteklenmeyen ağırlık metriği: {objective} ({', '.join(WEIGHT_OBJECTIVES)})")
+
+    candidates = simplex_grid(member_scores.shape[1], step)
+    values = np.empty(len(candidates))
+    for start in range(0, len(candidates), WEIGHT_BLOCK_SIZE):
+        block = candidates[start:start + WEIGHT_BLOCK_SIZE]
+        values[start:start + len(block)] = score_columns(member_scores @ block.T, y, objective)
+
+    best = int(np.argmax(values))
+    return candidates[best], float(values[best]), len(candidates)
+
+
+def f1_optimal_threshold(scores: np.ndarray, y: np.ndarray) -> float:
+    """Birleşik skor için F1'i en yüksek yapan eşik (azalan sıralamada kümülatif TP ile)"""
+    order = np.argsort(-scores, kind='stable')
+    sorted_scores = scores[order]
+    true_positives = np.cumsum(y[order] == 1)
+    n_pos = true_positives[-1] if len(true_positives) else 0
+    if n_pos == 0:
+        return 0.5
+
+    # Eşit skorların yalnızca son satırı geçerli bir kesim noktasıdır
+    cut = np.append(sorted_scores[1:] != sorted_scores[:-1], True)
+    predicted = np.arange(1, len(scores) + 1)
+    f1 = np.where(cut, 2 * true_positives / (predicted + n_pos), 0)
+    return float(sorted_scores[int(np.argmax(f1))])
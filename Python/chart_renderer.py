@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Chart Renderer - Grafiklerin ertelenmiş, paralel ve önbellekli çizimi
+Açıklama/rapor verisi hemen döner; figürler arka plandaki process pool'da çizilir
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Varsayılan çözünürlük (eskiden 300 dpi idi)
+DEFAULT_DPI = 100
+
+RENDER_MODES = ('process', 'inline', 'skip')
+
+# Grafik durumları (açıklama JSON'undaki visualization_status)
+CHART_READY = 'ready'
+CHART_PENDING = 'pending'
+CHART_FAILED = 'failed'
+
+
+def _render_job(render_fn: Callable, data: Dict, output_path: str, dpi: int) -> str:
+    """Worker process içinde tek bir grafiği çiz"""
+    import matplotlib
+    matplotlib.use('Agg')  # Non-interactive backend
+
+    render_fn(data, output_path, dpi)
+    return output_path
+
+
+def _json_default(obj):
+    """numpy dizileri ve diğer tipler için JSON dönüştürücü"""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    return str(obj)
+
+
+class ChartRenderQueue:
+    """
+    Grafik çizim kuyruğu
+
+    Çizim fonksiyonları modül seviyesinde tanımlı olmalı ve (data, output_path, dpi)
+    imzasını taşımalıdır. Aynı fonksiyon + veri + dpi için grafik içerik hash'i ile
+    önbelleğe alınır ve tekrar çizilmez, sadece hedef yola kopyalanır.
+
+    Process modunda submit hedef yolu hemen döner (durum: pending); çizim sonucu
+    wait() sırasında kesinleşir ve hemen ardından pop_resolved() ile alınabilir.
+
+    Modlar:
+        process: Arka planda process pool ile çiz (varsayılan)
+        inline: Çağıran thread'de hemen çiz
+        skip: Hiç çizme
+    """
+
+    def __init__(self, mode: str = 'process', max_workers: Optional[int] = None,
+                 dpi: int = DEFAULT_DPI, cache_dir: str = '.chart_cache'):
+        """
+        Args:
+            mode: process, inline veya skip
+            max_workers: Process pool boyutu (None ise CPU sayısı)
+            dpi: Varsayılan çözünürlük
+            cache_dir: İçerik hash'i ile saklanan grafiklerin dizini
+        """
+        if mode not in RENDER_MODES:
+            raise ValueError(f"Geçersiz render modu: {mode} ({', '.join(RENDER_MODES)})")
+
+        self.mode = mode
+        self.max_workers = max_workers
+        self.dpi = dpi
+        self.cache_dir = cache_dir
+        self.executor = None
+
+        # hash -> (future, hedef yollar)
+        self.pending = {}
+        # Son wait() çağrısında kesinleşen (hedef yol, durum) çiftleri
+        self.resolved = []
+        self.lock = threading.Lock()
+        self.stats = {'submitted': 0, 'rendered': 0, 'cache_hits': 0, 'failed': 0}
+
+        if mode != 'skip':
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _content_hash(self, render_fn: Callable, data: Dict, dpi: int) -> str:
+        """Fonksiyon adı, veri ve dpi'dan içerik hash'i üret"""
+        payload = json.dumps(data, sort_keys=True, default=_json_default)
+        key = f"{render_fn.__module__}.{render_fn.__name__}|{dpi}|{payload}"
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self.executor
+
+    @staticmethod
+    def _copy(source: str, target: str):
+        """Önbellekteki grafiği hedef yola kopyala"""
+        if os.path.abspath(source) == os.path.abspath(target):
+            return
+        target_dir = os.path.dirname(target)
+        if target_dir:
+            os.makedirs(target_dir, exist_ok=True)
+        shutil.copyfile(source, target)
+
+    def submit(self, render_fn: Callable, data: Dict, output_path: str,
+               dpi: Optional[int] = None) -> Optional[str]:
+        """
+        Grafiği çizim kuyruğuna ekle
+
+        Args:
+            render_fn: Modül seviyesinde çizim fonksiyonu (data, output_path, dpi)
+            data: Grafiğin çizileceği (JSON'a çevrilebilir) veri
+            output_path: Grafiğin yazılacağı yol
+            dpi: Çözünürlük (None ise varsayılan)
+
+        Returns:
+            Grafiğin yazılacağı yol (skip modunda veya inline çizim başarısızsa None)
+        """
+        if self.mode == 'skip':
+            return None
+
+        dpi = dpi or self.dpi
+        content_hash = self._content_hash(render_fn, data, dpi)
+        extension = os.path.splitext(output_path)[1] or '.png'
+        cached_path = os.path.join(self.cache_dir, content_hash + extension)
+
+        with self.lock:
+            self.stats['submitted'] += 1
+
+            if os.path.exists(cached_path):
+                self.stats['cache_hits'] += 1
+                self._copy(cached_path, output_path)
+                return output_path
+
+            if content_hash in self.pending:
+                # Aynı grafik zaten çiziliyor - bitince bu yola da kopyalanır
+                self.stats['cache_hits'] += 1
+                self.pending[content_hash][1].append(output_path)
+                return output_path
+
+            if self.mode == 'inline':
+                try:
+                    _render_job(render_fn, data, cached_path, dpi)
+                    self.stats['rendered'] += 1
+                    self._copy(cached_path, output_path)
+                except Exception as e:
+                    self.stats['failed'] += 1
+                    print(f"⚠️ Grafik çizim hatası ({os.path.basename(output_path)}): {e}")
+                    return None
+                return output_path
+
+            future = self._get_executor().submit(_render_job, render_fn, data, cached_path, dpi)
+            self.pending[content_hash] = (future, [output_path])
+
+        return output_path
+
+    def wait(self) -> Dict:
+        """Bekleyen tüm çizimlerin bitmesini bekle ve grafikleri hedeflerine kopyala"""
+        with self.lock:
+            pending = list(self.pending.items())
+            self.resolved = []
+
+        for content_hash, (future, targets) in pending:
+            try:
+                cached_path = future.result()
+                error = None
+            except Exception as e:
+                cached_path, error = None, e
+
+            # Kayıt kopyalama bitene kadar pending'de kalır (status() arada failed görmez)
+            with self.lock:
+                if self.pending.pop(content_hash, None) is None:
+                    continue  # Eşzamanlı başka bir wait() kesinleştirdi
+                try:
+                    if error is not None:
+                        raise error
+                    for target in targets:
+                        self._copy(cached_path, target)
+                    self.stats['rendered'] += 1
+                    status = CHART_READY
+                except Exception as e:
+                    self.stats['failed'] += 1
+                    print(f"⚠️ Grafik çizim hatası ({os.path.basename(targets[0])}): {e}")
+                    status = CHART_FAILED
+                self.resolved.extend((target, status) for target in targets)
+
+        return self.get_stats()
+
+    def status(self, output_path: Optional[str]) -> Optional[str]:
+        """submit'in döndürdüğü yolun durumu: ready, pending, failed (yol yoksa None)"""
+        if output_path is None:
+            return None
+        with self.lock:
+            if any(output_path in targets for _, targets in self.pending.values()):
+                return CHART_PENDING
+        return CHART_READY if os.path.exists(output_path) else CHART_FAILED
+
+    def pop_resolved(self) -> List[Tuple[str, str]]:
+        """Son wait() çağrısında kesinleşen (hedef yol, durum) çiftleri"""
+        with self.lock:
+            resolved = self.resolved
+            self.resolved = []
+        return resolved
+
+    def shutdown(self):
+        """Bekleyen çizimleri tamamla ve process pool'u kapat"""
+        self.wait()
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def get_stats(self) -> Dict:
+        """Çizim istatistikleri"""
+        with self.lock:
+            stats = dict(self.stats)
+            stats['pending'] = len(self.pending)
+        stats['mode'] = self.mode
+        return stats
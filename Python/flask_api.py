@@ -9,12 +9,16 @@ from flask_cors import CORS
 import json
 import os
 import sys
+import threading
 from datetime import datetime
 import traceback
 
 # Fraud detection scripts'leri import et
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from shap_service import ShapExplainerPool, prepare_feature_row
+from thread_budget import ThreadBudget, apply_thread_budget, get_thread_budget
+
 app = Flask(__name__)
 
 # CORS konfigürasyonu - React için
@@ -30,9 +34,76 @@ def health_check():
         'version': '1.0.0'
     })
 
+# SHAP açıklayıcı havuzu ayarları (ortam değişkenleri)
+SHAP_MODELS_PATH = os.environ.get('SHAP_MODELS_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models'))
+SHAP_BUDGET_MS = float(os.environ.get('SHAP_BUDGET_MS', 300))
+SHAP_WORKERS = int(os.environ.get('SHAP_WORKERS', 4))
+
+# SHAP worker'ları BLAS thread bütçesini paylaşır. Import sırasında uygulanır, böylece
+# WSGI sunucusu (gunicorn vb.) altında da geçerlidir; bölünmemiş toplam ortamda saklanır,
+# debug reloader veya worker process'leri ortamı devraldığında bütçe tekrar bölünmez
+API_BUDGET_TOTAL_ENV = 'FRAUDSHIELD_API_THREAD_TOTAL'
+_api_budget_total = int(os.environ.setdefault(API_BUDGET_TOTAL_ENV, str(get_thread_budget().total)))
+apply_thread_budget(ThreadBudget(_api_budget_total).split(SHAP_WORKERS))
+
+_shap_pool = None
+_shap_pool_lock = threading.Lock()
+
+
+def get_shap_pool():
+    """Önceden yüklenmiş SHAP açıklayıcı havuzu (ilk çağrıda modeller yüklenir)"""
+    global _shap_pool
+    with _shap_pool_lock:
+        if _shap_pool is None:
+            _shap_pool = ShapExplainerPool(SHAP_MODELS_PATH, max_workers=SHAP_WORKERS,
+                                           default_budget_ms=SHAP_BUDGET_MS)
+            _shap_pool.preload()
+        return _shap_pool
+
+
+def _format_shap_response(transaction_id, model_name, result, top_n=5):
+    """Havuz sonucunu dashboard'un beklediği SHAP yanıt formatına çevir"""
+    features = [
+        {
+            'name': name,
+            'value': float(value),
+            'shapValue': float(shap_value),
+            'impact': 'positive' if shap_value > 0 else 'negative'
+        }
+        for name, value, shap_value in zip(result['feature_names'], result['feature_values'], result['values'])
+    ]
+    features.sort(key=lambda f: abs(f['shapValue']), reverse=True)
+
+    positive = [{'name': f['name'], 'value': f['shapValue']} for f in features if f['shapValue'] > 0]
+    negative = [{'name': f['name'], 'value': f['shapValue']} for f in features if f['shapValue'] < 0]
+
+    return {
+        'transactionId': transaction_id,
+        'modelName': model_name,
+        'prediction': result['prediction'],
+        'expectedValue': result['expected_value'],
+        'features': features,
+        'summary': {
+            'topPositiveFeatures': positive[:top_n],
+            'topNegativeFeatures': negative[:top_n],
+            'totalPositiveImpact': sum(f['value'] for f in positive),
+            'totalNegativeImpact': sum(f['value'] for f in negative)
+        },
+        'method': result['method'],
+        'computeTimeMs': round(result['compute_time_ms'], 2),
+        'budgetMs': result['budget_ms']
+    }
+
 @app.route('/analyze/shap', methods=['POST'])
 def analyze_shap():
-    """SHAP analizi endpoint'i"""
+    """
+    SHAP analizi endpoint'i
+
+    İstek: {"transactionId": "...", "modelName": "ensemble", "transaction": {...}, "budgetMs": 300}
+    transaction ham transaction alanlarını (amount, timestamp, V1..V28) veya doğrudan
+    model feature'larını içerir. Yanıttaki method tam (tree_shap) ya da bütçe aşıldığında
+    kullanılan yaklaşık (saabas) yöntemi, computeTimeMs hesaplama süresini gösterir.
+    """
     try:
         data = request.get_json()
         
@@ -41,54 +112,24 @@ def analyze_shap():
         
         transaction_id = data.get('transactionId', 'unknown')
         model_name = data.get('modelName', 'default')
+        transaction = data.get('transaction') or data.get('features')
         
-        # Mock SHAP analizi - gerçek implementation için SHAP library kullanılabilir
-        mock_response = {
-            'transactionId': transaction_id,
-            'modelName': model_name,
-            'prediction': 0.75,
-            'expectedValue': 0.5,
-            'features': [
-                {
-                    'name': 'amount',
-                    'value': 1500.0,
-                    'shapValue': 0.2,
-                    'impact': 'positive'
-                },
-                {
-                    'name': 'time',
-                    'value': 14.5,
-                    'shapValue': -0.1,
-                    'impact': 'negative'
-                },
-                {
-                    'name': 'v1',
-                    'value': -2.3,
-                    'shapValue': 0.15,
-                    'impact': 'positive'
-                },
-                {
-                    'name': 'v4',
-                    'value': 1.8,
-                    'shapValue': -0.05,
-                    'impact': 'negative'
-                }
-            ],
-            'summary': {
-                'topPositiveFeatures': [
-                    {'name': 'amount', 'value': 0.2},
-                    {'name': 'v1', 'value': 0.15}
-                ],
-                'topNegativeFeatures': [
-                    {'name': 'time', 'value': -0.1},
-                    {'name': 'v4', 'value': -0.05}
-                ],
-                'totalPositiveImpact': 0.35,
-                'totalNegativeImpact': -0.15
-            }
-        }
+        if not isinstance(transaction, dict):
+            return jsonify({'error': 'transaction (veya features) nesnesi gerekli'}), 400
         
-        return jsonify(mock_response)
+        pool = get_shap_pool()
+        model_type = pool.resolve_model(model_name)
+        if model_type is None:
+            return jsonify({
+                'error': f'SHAP açıklayıcısı yüklü model bulunamadı: {model_name}',
+                'availableModels': sorted(pool.explainers)
+            }), 503
+        
+        explainers = pool.explainers[model_type]
+        row = prepare_feature_row(transaction, explainers.feature_names)
+        result = pool.explain(model_type, row, budget_ms=data.get('budgetMs'))
+        
+        return jsonify(_format_shap_response(transaction_id, model_type, result))
         
     except Exception as e:
         app.logger.error(f"SHAP analizi hatası: {str(e)}")
@@ -126,6 +167,27 @@ def train_model():
         app.logger.error(f"Model eğitimi hatası: {str(e)}")
         return jsonify({'error': f'Model eğitimi hatası: {str(e)}'}), 500
 
+# Toplu tahminde tek istekte kabul edilen maksimum transaction sayısı
+MAX_BATCH_SIZE = 1000
+
+
+def _mock_prediction(data, model_type='ensemble'):
+    """Tek transaction için mock tahmin yanıtı (/models/predict her zaman 'ensemble' döndürür)"""
+    return {
+        'transactionId': data.get('transactionId', 'unknown'),
+        'prediction': {
+            'isFraudulent': True,
+            'probability': 0.78,
+            'confidence': 0.85,
+            'riskLevel': 'High'
+        },
+        'modelInfo': {
+            'modelType': model_type,
+            'version': '1.0.0',
+            'lastTrainedAt': '2024-01-15T10:30:00Z'
+        }
+    }
+
 @app.route('/models/predict', methods=['POST'])
 def predict():
     """Tahmin endpoint'i"""
@@ -133,20 +195,7 @@ def predict():
         data = request.get_json()
         
         # Mock prediction response
-        mock_response = {
-            'transactionId': data.get('transactionId', 'unknown'),
-            'prediction': {
-                'isFraudulent': True,
-                'probability': 0.78,
-                'confidence': 0.85,
-                'riskLevel': 'High'
-            },
-            'modelInfo': {
-                'modelType': 'ensemble',
-                'version': '1.0.0',
-                'lastTrainedAt': '2024-01-15T10:30:00Z'
-            }
-        }
+        mock_response = _mock_prediction(data)
         
         return jsonify(mock_response)
         
@@ -154,6 +203,54 @@ def predict():
         app.logger.error(f"Tahmin hatası: {str(e)}")
         return jsonify({'error': f'Tahmin hatası: {str(e)}'}), 500
 
+@app.route('/models/predict/batch', methods=['POST'])
+@app.route('/api/model/predict/batch', methods=['POST'])
+def predict_batch():
+    """
+    Toplu tahmin endpoint'i
+
+    İstek: {"transactions": [...], "modelType": "ensemble"} veya doğrudan transaction listesi
+    Yanıt: {"results": [{"index": 0, "success": true, ...}, {"index": 1, "success": false, "error": "..."}],
+            "total": n, "succeeded": k, "failed": n - k}
+
+    Tek bir transaction'ın hatası tüm isteği başarısız yapmaz; hata ilgili index'e yazılır.
+    """
+    try:
+        data = request.get_json()
+        
+        if isinstance(data, list):
+            transactions, model_type = data, None
+        elif isinstance(data, dict) and isinstance(data.get('transactions'), list):
+            transactions, model_type = data['transactions'], data.get('modelType')
+        else:
+            return jsonify({'error': 'transactions listesi gerekli'}), 400
+        
+        if len(transactions) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'Batch boyutu en fazla {MAX_BATCH_SIZE} olabilir'}), 413
+        
+        results = []
+        for index, transaction in enumerate(transactions):
+            try:
+                if not isinstance(transaction, dict):
+                    raise ValueError('Transaction bir JSON nesnesi olmalı')
+                # Toplu istekte model, transaction'daki veya istekteki modelType ile seçilir
+                item_model_type = transaction.get('modelType') or model_type or 'ensemble'
+                results.append(dict(_mock_prediction(transaction, item_model_type), index=index, success=True))
+            except Exception as e:
+                results.append({'index': index, 'success': False, 'error': str(e)})
+        
+        succeeded = sum(1 for r in results if r['success'])
+        return jsonify({
+            'results': results,
+            'total': len(results),
+            'succeeded': succeeded,
+            'failed': len(results) - succeeded
+        })
+        
+    except Exception as e:
+        app.logger.error(f"Toplu tahmin hatası: {str(e)}")
+        return jsonify({'error': f'Toplu tahmin hatası: {str(e)}'}), 500
+
 @app.route('/status', methods=['GET'])
 def get_status():
     """Sistem durumu"""
@@ -166,8 +263,10 @@ def get_status():
             '/analyze/shap',
             '/models/train',
             '/models/predict',
+            '/models/predict/batch',
             '/status'
         ],
+        'shap': get_shap_pool().get_stats() if _shap_pool is not None else {'loaded': False},
         'cors_enabled': True,
         'allowed_origins': ['http://localhost:3000', 'http://localhost:3001']
     })
@@ -186,6 +285,9 @@ if __name__ == '__main__':
     print("🌐 Çalışma adresi: http://localhost:5001")
     print("🔗 Health check: http://localhost:5001/health")
     
+    # SHAP açıklayıcılarını ilk istekten önce yükle
+    get_shap_pool()
+    
     # Development mode'da çalıştır
     app.run(
         host='0.0.0.0',
@@ -5,18 +5,12 @@ from datetime import datetime
 
 import joblib
 import numpy as np
-from lightgbm import LGBMClassifier
-from sklearn.decomposition import PCA
-from sklearn.metrics import (
-    accuracy_score, precision_score, recall_score, f1_score, roc_auc_score,
-    confusion_matrix, classification_report,
-    roc_curve, matthews_corrcoef, cohen_kappa_score, log_loss, brier_score_loss,
-    average_precision_score
-)
-from sklearn.preprocessing import StandardScaler
+
+# lightgbm ve sklearn yalnızca eğitim/metrik yollarında import edilir (hızlı --help ve başlangıç)
 
 # Yardımcı fonksiyonları içe aktar
-from utils import load_data, load_config
+from utils import load_data, load_config, summarize_background, save_background_summary
+from thread_budget import ThreadBudget, apply_thread_budget, get_thread_budget, LIGHTGBM_THREADS_KEY
 
 
 def calculate_comprehensive_metrics(y_true, y_pred, y_proba, model_type="binary"):
@@ -32,6 +26,13 @@ def calculate_comprehensive_metrics(y_true, y_pred, y_proba, model_type="binary"
     Returns:
         Detaylı metrik sözlüğü
     """
+    from sklearn.metrics import (
+        accuracy_score, precision_score, recall_score, f1_score, roc_auc_score,
+        confusion_matrix, classification_report,
+        roc_curve, matthews_corrcoef, cohen_kappa_score, log_loss, brier_score_loss,
+        average_precision_score
+    )
+
     metrics = {}
 
     # Temel metrikler
@@ -142,6 +143,9 @@ def train_pca(config, X_train, X_test, y_test=None):
     """
     print("PCA anomali modeli eğitiliyor...")
 
+    from sklearn.decomposition import PCA
+    from sklearn.preprocessing import StandardScaler
+
     # Konfigürasyonu al
     pca_config = config.get('pca', {})
 
@@ -344,6 +348,8 @@ def train_lightgbm(config, X_train, y_train, X_test, y_test):
     LightGBM modeli eğit (Feature bilgileri ile)
     """
     print("LightGBM modeli eğitiliyor...")
+
+    from lightgbm import LGBMClassifier
     print(f"Training features: {list(X_train.columns)}")
     print(f"Training feature count: {len(X_train.columns)}")
 
@@ -375,6 +381,7 @@ def train_lightgbm(config, X_train, y_train, X_test, y_test):
         reg_lambda=lgbm_config.get('l2Regularization', 0.01),
         min_split_gain=lgbm_config.get('minGainToSplit', 0.0005),
         class_weight=class_weights,
+        n_jobs=lgbm_config.get(LIGHTGBM_THREADS_KEY) or get_thread_budget().allocation()['lightgbm'],
         random_state=42
     )
 
@@ -447,9 +454,11 @@ def print_metric_summary(metrics, model_name):
     print("-" * 50)
 
 
-def save_model(model_result, model_type, output_dir):
+def save_model(model_result, model_type, output_dir, background=None):
     """
     Modeli geliştirilmiş metriklerle kaydet
+
+    background verilirse (summarize_background çıktısı) explainer'lar için model dosyasının yanına yazılır
     """
     # Dizinin var olduğundan emin ol
     os.makedirs(output_dir, exist_ok=True)
@@ -474,6 +483,10 @@ def save_model(model_result, model_type, output_dir):
     if 'feature_importance' in model_result:
         info['feature_importance'] = model_result['feature_importance']
 
+    # Explainer'lar için gerçek veriden background özeti
+    if background is not None:
+        info['background_path'] = save_background_summary(background, model_path)
+
     info_path = os.path.join(output_dir, f"model_info_{timestamp}.json")
 
     with open(info_path, 'w', encoding='utf-8') as f:
@@ -538,6 +551,10 @@ def main():
     parser.add_argument('--output', type=str, default='models', help='Çıktı dizini')
     parser.add_argument('--model-type', type=str, default='ensemble',
                         choices=['lightgbm', 'pca', 'ensemble'], help='Eğitilecek model tipi')
+    parser.add_argument('--background-size', type=int, default=100,
+                        help='Explainer background özetinin satır sayısı (0 ise kaydedilmez)')
+    parser.add_argument('--background-method', type=str, default='kmeans',
+                        choices=['kmeans', 'stratified'], help='Background özetleme yöntemi')
 
     args = parser.parse_args()
 
@@ -550,6 +567,12 @@ def main():
         # Konfigürasyonu yükle
         config = load_config(args.config)
 
+        # LightGBM/BLAS thread'lerini bütçeyle sınırla; paralel eğitimlerde istemci
+        # worker payını lightgbm.numThreads ile gönderir
+        threads = config.get('lightgbm', {}).get(LIGHTGBM_THREADS_KEY)
+        budget = apply_thread_budget(ThreadBudget(threads) if threads else None)
+        print(f"Thread bütçesi: {budget.total}")
+
         # Model tipine göre eğitim
         if args.model_type == 'lightgbm':
             model_result = train_lightgbm(config, X_train, y_train, X_test, y_test)
@@ -560,8 +583,13 @@ def main():
         else:
             raise ValueError(f"Desteklenmeyen model tipi: {args.model_type}")
 
+        # Explainer background özeti
+        background = None
+        if args.background_size > 0:
+            background = summarize_background(X_train, y_train, args.background_size, args.background_method)
+
         # Modeli kaydet
-        model_path, info_path = save_model(model_result, args.model_type, args.output)
+        model_path, info_path = save_model(model_result, args.model_type, args.output, background)
 
         print(f"\n🎉 Model eğitimi başarıyla tamamlandı!")
         print(f"📊 Genel Skor: {model_result['metrics'].get('accuracy', 0):.4f}")
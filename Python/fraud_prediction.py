@@ -8,21 +8,105 @@ import os
 import json
 import argparse
 import numpy as np
-import pandas as pd
-import joblib
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from thread_budget import ThreadBudget, apply_thread_budget
+
+# pandas, joblib ve torch yalnızca ihtiyaç duyulan yollarda import edilir;
+# .NET servisinin her istekte başlattığı process kullanılmayan modülleri yüklemez
+
 warnings.filterwarnings('ignore', category=UserWarning)
 warnings.filterwarnings('ignore', category=FutureWarning)
 
+# TorchScript'e export edilmiş gelişmiş modeller (advanced_ml_models.export_torchscript)
+TORCHSCRIPT_MODEL_TYPES = ('attention', 'autoencoder')
+
+# Isolation Forest skorlamasında chunk başına satır sayısı
+IF_SCORE_CHUNK_SIZE = 8192
+
+# Eğitim verisindeki engineered feature isimleri -> prediction tarafındaki karşılıkları
+FEATURE_ALIASES = {'DayFeature': 'DayOfWeek', 'HourFeature': 'HourOfDay'}
+
+
+class TorchScriptScorer:
+    """
+    Export edilmiş TorchScript grafiğiyle batch'li CPU skorlama
+
+    Grafik process başına bir kez yüklenir (yol bazında önbellek); girdi float32
+    (n, d) matris olarak verilir ve batch_size'lık parçalar halinde skorlanır.
+    """
+
+    _loaded = {}
+
+    def __init__(self, path, num_threads=1, batch_size=4096):
+        import torch
+
+        self.torch = torch
+        self.path = path
+        self.batch_size = batch_size
+
+        torch.set_num_threads(num_threads)
+        self.module = torch.jit.load(path, map_location='cpu')
+        self.module.eval()
+
+    @classmethod
+    def load(cls, path, num_threads=1, batch_size=4096):
+        """Önbellekteki skorlayıcıyı döndür (yoksa yükle)"""
+        scorer = cls._loaded.get(path)
+        if scorer is None:
+            scorer = cls(path, num_threads, batch_size)
+            cls._loaded[path] = scorer
+        else:
+            scorer.torch.set_num_threads(num_threads)
+        return scorer
+
+    def predict_proba(self, X):
+        """(n, d) girdi için fraud olasılıkları (n,)"""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+
+        outputs = []
+        with self.torch.inference_mode():
+            for start in range(0, len(X), self.batch_size):
+                batch = self.torch.from_numpy(X[start:start + self.batch_size])
+                outputs.append(self.module(batch).numpy())
+        return np.concatenate(outputs).astype(np.float64)
+
+
+def align_features(features, feature_names):
+    """Feature'ları eğitimdeki sıraya diz (eksik kolonlar 0) -> float32 (n, d) matris"""
+    feature_names = feature_names or list(features.columns)
+    X = np.zeros((len(features), len(feature_names)), dtype=np.float32)
+    for i, name in enumerate(feature_names):
+        column = name if name in features.columns else FEATURE_ALIASES.get(name)
+        if column in features.columns:
+            X[:, i] = features[column].values
+    return X
+
+
+def score_in_chunks(score_fn, X, chunk_size=IF_SCORE_CHUNK_SIZE, num_threads=1):
+    """score_fn'i chunk'lar halinde (num_threads > 1 ise thread'lerde) uygula, sıra korunur"""
+    starts = range(0, len(X), chunk_size)
+    if num_threads > 1 and len(starts) > 1:
+        with ThreadPoolExecutor(max_workers=min(num_threads, len(starts))) as executor:
+            parts = list(executor.map(lambda start: score_fn(X[start:start + chunk_size]), starts))
+    else:
+        parts = [score_fn(X[start:start + chunk_size]) for start in starts]
+    return np.concatenate(parts) if parts else np.empty(0)
+
 
 class EnhancedFraudPredictor:
     """
     Geliştirilmiş Fraud Detection Tahmin Sistemi
     """
 
-    def __init__(self):
+    def __init__(self, num_threads=1):
+        # TorchScript / Isolation Forest skorlama thread sayısı
+        self.num_threads = num_threads
+
         # Business-optimized thresholds (evaluation sonuçlarından)
         self.BUSINESS_THRESHOLDS = {
             'lightgbm': 0.12,  # F1-optimal'den biraz yüksek
@@ -55,6 +139,12 @@ class EnhancedFraudPredictor:
                 return self._predict_lightgbm_enhanced(model, features)
             elif model_type.lower() == 'pca':
                 return self._predict_pca_enhanced(model, features, model_info)
+            elif model_type.lower() in TORCHSCRIPT_MODEL_TYPES:
+                return self._predict_torchscript_enhanced(model, features, model_info, model_type.lower())
+            elif model_type.lower() == 'isolation_forest':
+                return self._predict_isolation_forest_enhanced(model, features, model_info)
+            elif model_type.lower() == 'advanced_ensemble':
+                return self._predict_advanced_ensemble(model, features)
             else:
                 raise ValueError(f"Desteklenmeyen model tipi: {model_type}")
 
@@ -162,6 +252,108 @@ class EnhancedFraudPredictor:
             print(f"LightGBM enhanced prediction failed: {e}")
             return self._create_fallback_prediction(features, 'lightgbm', str(e))
 
+    def _predict_torchscript_enhanced(self, scorer, features, model_info, model_type):
+        """
+        TorchScript'e export edilmiş attention / autoencoder modeli ile tahmin
+        """
+        try:
+            # Feature'ları export sırasındaki sıraya diz (eksikler 0)
+            X = align_features(features, model_info.get('feature_names'))
+
+            fraud_probability = scorer.predict_proba(X)
+
+            decision_threshold = model_info.get('decision_threshold', 0.5)
+            predicted_class = (fraud_probability >= decision_threshold).astype(int)
+
+            confidence = np.where(
+                (fraud_probability <= 0.2) | (fraud_probability >= 0.8),
+                0.9,  # High confidence
+                0.7  # Medium confidence
+            )
+
+            return {
+                'probability': fraud_probability,
+                'predicted_class': predicted_class,
+                'score': fraud_probability,
+                'confidence': confidence[0] if len(confidence) > 0 else 0.7,
+                'business_threshold': decision_threshold,
+                'method': f'torchscript_{model_type}'
+            }
+
+        except Exception as e:
+            print(f"TorchScript {model_type} prediction failed: {e}")
+            return self._create_fallback_prediction(features, model_type, str(e))
+
+    def _predict_isolation_forest_enhanced(self, model, features, model_info):
+        """
+        Isolation Forest tahmini - tek decision_function geçişi, chunk'lı ve paralel
+        """
+        try:
+            X = align_features(features, model_info.get('feature_names'))
+            if getattr(model, 'feature_names_in_', None) is not None:
+                import pandas as pd
+                X = pd.DataFrame(X, columns=model.feature_names_in_)
+
+            anomaly_scores = score_in_chunks(model.decision_function, X, num_threads=self.num_threads)
+
+            # predict ile aynı kural: decision_function < 0 -> anomali
+            fraud_probability = 1 / (1 + np.exp(anomaly_scores))
+            decision_threshold = model_info.get('decision_threshold', 0.5)
+            predicted_class = (fraud_probability >= decision_threshold).astype(int)
+
+            confidence = np.where(np.abs(anomaly_scores) >= 0.1, 0.8, 0.6)
+
+            return {
+                'probability': fraud_probability,
+                'predicted_class': predicted_class,
+                'score': fraud_probability,
+                'anomaly_score': anomaly_scores,
+                'confidence': confidence[0] if len(confidence) > 0 else 0.6,
+                'business_threshold': decision_threshold,
+                'method': 'isolation_forest'
+            }
+
+        except Exception as e:
+            print(f"Isolation Forest prediction failed: {e}")
+            return self._create_fallback_prediction(features, 'isolation_forest', str(e))
+
+    def _predict_advanced_ensemble(self, ensemble, features):
+        """
+        LightGBM + AutoEncoder + Isolation Forest ensemble tahmini
+
+        Feature'lar bir kez hizalanır; aynı float32 matris tek geçişte tüm üyelerden
+        skorlanır. Ağırlıklar, eşik ve kalibratör eğitimde öğrenilip artefaktta saklanmıştır.
+        probability kalibre fraud olasılığıdır; score / risk_score birleşik risk skorudur
+        (yüzdelik dilim karışımı) ve business_threshold bu skor üzerindedir.
+        """
+        try:
+            X = align_features(features, ensemble.feature_names)
+            ensemble.set_num_threads(self.num_threads)
+
+            risk_scores, member_scores = ensemble.score(X)
+            fraud_probability = ensemble.calibrate(risk_scores)
+            predicted_class = (risk_scores >= ensemble.decision_threshold).astype(int)
+
+            # Üyelerin uyuşması: normalize skorların yayılımı düştükçe güven artar
+            agreement = 1 - (member_scores.max(axis=1) - member_scores.min(axis=1))
+            confidence = np.clip(0.5 + 0.45 * agreement, 0.5, 0.95)
+
+            return {
+                'probability': fraud_probability,
+                'predicted_class': predicted_class,
+                'score': risk_scores,
+                'risk_score': risk_scores,
+                'member_scores': {name: member_scores[:, j] for j, name in enumerate(ensemble.member_names)},
+                'ensemble_weights': dict(zip(ensemble.member_names, ensemble.weights.tolist())),
+                'confidence': confidence[0] if len(confidence) > 0 else 0.5,
+                'business_threshold': ensemble.decision_threshold,
+                'method': 'advanced_ensemble'
+            }
+
+        except Exception as e:
+            print(f"Advanced ensemble prediction failed: {e}")
+            return self._create_fallback_prediction(features, 'advanced_ensemble', str(e))
+
     def _predict_pca_enhanced(self, model, features, model_info, scaler=None, threshold=None):
         """
         Geliştirilmiş PCA tahmin
@@ -227,6 +419,8 @@ class EnhancedFraudPredictor:
             return features.iloc[:, :pca_expected]
         else:
             # Eksik feature'ları 0 ile doldur
+            import pandas as pd
+
             missing_count = pca_expected - features.shape[1]
             zeros = pd.DataFrame(0, index=features.index, columns=[f'missing_{i}' for i in range(missing_count)])
             return pd.concat([features, zeros], axis=1)
@@ -406,7 +600,13 @@ def enhanced_prediction_main():
     parser.add_argument('--input', type=str, required=True, help='Girdi dosyasının yolu (JSON)')
     parser.add_argument('--output', type=str, required=True, help='Çıktı dosyasının yolu (JSON)')
     parser.add_argument('--model-type', type=str, default='ensemble',
-                        choices=['lightgbm', 'pca', 'ensemble'], help='Kullanılacak model tipi')
+                        choices=['lightgbm', 'pca', 'ensemble', 'isolation_forest', 'advanced_ensemble'] +
+                                list(TORCHSCRIPT_MODEL_TYPES),
+                        help='Kullanılacak model tipi')
+    parser.add_argument('--num-threads', type=int, default=None,
+                        help='TorchScript / Isolation Forest / ensemble skorlaması için thread sayısı (varsayılan: thread bütçesi)')
+    parser.add_argument('--quantized', action='store_true',
+                        help='Varsa doğruluk kontrolünden geçmiş int8 modeli kullan')
 
     args = parser.parse_args()
 
@@ -418,22 +618,41 @@ def enhanced_prediction_main():
         print(f"Output: {args.output}")
         print(f"Model type: {args.model_type}")
 
+        # Thread bütçesi (--num-threads verilirse o kadar)
+        budget = apply_thread_budget(ThreadBudget(args.num_threads) if args.num_threads else None)
+        num_threads = budget.allocation()['torch']
+
         # Enhanced predictor oluştur
-        predictor = EnhancedFraudPredictor()
+        predictor = EnhancedFraudPredictor(num_threads=num_threads)
 
         # Model ve bilgileri yükle
         with open(args.model_info, 'r', encoding='utf-8') as f:
             model_info = json.load(f)
 
-        model_path = model_info.get('model_path')
-        model = joblib.load(model_path)
+        if args.model_type in TORCHSCRIPT_MODEL_TYPES:
+            # int8 grafik float32 export olmadan da (--no-torchscript --quantize) üretilmiş olabilir
+            torchscript_path = model_info.get('torchscript_path')
+            if args.quantized:
+                if model_info.get('quantized_torchscript_path'):
+                    torchscript_path = model_info['quantized_torchscript_path']
+                else:
+                    print("⚠️ int8 model bulunamadı (quantize edilmemiş veya doğruluk kontrolünü geçmemiş), float32 kullanılıyor")
+            if not torchscript_path:
+                raise ValueError(f"{args.model_type} modeli için TorchScript export bulunamadı (torchscript_path)")
+            model = TorchScriptScorer.load(torchscript_path, num_threads=num_threads)
+        else:
+            import joblib
+
+            model_path = model_info.get('model_path')
+            model = joblib.load(model_path)
 
         # Input yükle
         with open(args.input, 'r', encoding='utf-8') as f:
             input_data = json.load(f)
 
-        # DataFrame'e dönüştür
-        features = pd.DataFrame([input_data])
+        # DataFrame'e dönüştür (tek transaction veya batch listesi)
+        import pandas as pd
+        features = pd.DataFrame(input_data if isinstance(input_data, list) else [input_data])
 
         # Feature preparation (basit)
         features = prepare_features_for_prediction(features, args.model_type)
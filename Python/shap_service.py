@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+SHAP Service - Flask API için önceden yüklenmiş, zaman bütçeli SHAP açıklayıcı havuzu
+Aktif modeller başlangıçta yüklenir; istekler worker pool'da bütçe dahilinde açıklanır
+"""
+
+import json
+import math
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import joblib
+
+# ShapLıme modülleri (kapalı formlu ensemble SHAP ve model indeksi)
+SHAPLIME_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ShapLıme')
+if SHAPLIME_DIR not in sys.path:
+    sys.path.append(SHAPLIME_DIR)
+
+try:
+    import shap
+    from ensemble_shap import DecomposedEnsembleExplainer, expand_weighted_rows
+    from explainer_cache import ModelIndex
+    SHAP_AVAILABLE = True
+except ImportError:
+    SHAP_AVAILABLE = False
+
+MODEL_TYPES = ('ensemble', 'lightgbm', 'pca')
+
+EXACT_METHOD = 'tree_shap'
+APPROXIMATE_METHOD = 'saabas'
+
+STANDARD_FEATURES = [
+    'Amount', 'AmountLog', 'TimeSin', 'TimeCos', 'DayOfWeek', 'HourOfDay',
+    'V1', 'V2', 'V3', 'V4', 'V5', 'V6', 'V7', 'V8', 'V9', 'V10',
+    'V11', 'V12', 'V13', 'V14', 'V15', 'V16', 'V17', 'V18', 'V19', 'V20',
+    'V21', 'V22', 'V23', 'V24', 'V25', 'V26', 'V27', 'V28'
+]
+
+
+def prepare_feature_row(transaction: Dict, feature_names: List[str]) -> np.ndarray:
+    """
+    Ham transaction'ı (dashboard / API formatı) modelin feature vektörüne çevir
+
+    Feature adları doğrudan verilebilir (Amount, V1, ...); verilmeyen engineered
+    feature'lar amount, Time / timestamp, hour ve dayOfWeek alanlarından türetilir.
+    """
+    amount = float(transaction.get('Amount', transaction.get('amount', 0.0)) or 0.0)
+
+    seconds = transaction.get('Time', transaction.get('time'))
+    if seconds is None:
+        seconds = 43200.0  # Default 12:00
+        timestamp = transaction.get('timestamp')
+        if timestamp:
+            try:
+                dt = datetime.fromisoformat(str(timestamp).replace('Z', '+00:00'))
+                seconds = dt.hour * 3600 + dt.minute * 60 + dt.second
+            except ValueError:
+                pass
+    seconds = float(seconds)
+
+    seconds_in_day = 24 * 60 * 60
+    derived = {
+        'Amount': amount,
+        'AmountLog': math.log1p(max(amount, 0.0)),
+        'Time': seconds,
+        'TimeSin': math.sin(2 * math.pi * seconds / seconds_in_day),
+        'TimeCos': math.cos(2 * math.pi * seconds / seconds_in_day),
+        'DayOfWeek': float(transaction.get('dayOfWeek', int((seconds / seconds_in_day) % 7))),
+        'HourOfDay': float(transaction.get('hour', int((seconds / 3600) % 24)))
+    }
+    derived['DayFeature'] = derived['DayOfWeek']
+    derived['HourFeature'] = derived['HourOfDay']
+
+    row = np.zeros(len(feature_names))
+    for i, name in enumerate(feature_names):
+        value = transaction.get(name, transaction.get(name.lower()))
+        if value is None:
+            value = derived.get(name, 0.0)
+        row[i] = float(value)
+    return row
+
+
+def _model_feature_names(model) -> List[str]:
+    """Modelin eğitimde gördüğü feature isimleri (bulunamazsa standart liste)"""
+    candidates = []
+    if isinstance(model, dict):
+        candidates = [model.get('lightgbm_model'), model.get('pca_scaler'), model.get('pca_model')]
+        if model.get('feature_names'):
+            return list(model['feature_names'])
+    else:
+        candidates = [model]
+
+    for candidate in candidates:
+        names = getattr(candidate, 'feature_name_', None)
+        if names is None:
+            names = getattr(candidate, 'feature_names_in_', None)
+        if names is not None:
+            return [str(name) for name in names]
+    return list(STANDARD_FEATURES)
+
+
+def _positive_class_values(values) -> np.ndarray:
+    """TreeExplainer çıktısından pozitif (fraud) sınıfın SHAP değerleri"""
+    if isinstance(values, list):
+        values = values[-1]
+    values = np.asarray(values)
+    if values.ndim == 3:
+        values = values[:, :, -1]
+    return values
+
+
+def _rescale_to_probability(raw_values: np.ndarray, proba: np.ndarray, expected_proba: float) -> np.ndarray:
+    """Log-odds katkılarını, toplamı olasılık farkına eşit olacak şekilde ölçekle"""
+    delta_raw = raw_values.sum(axis=1)
+    delta_proba = proba - expected_proba
+    safe_delta = np.where(np.abs(delta_raw) > 1e-12, delta_raw, 1.0)
+    scale = np.where(np.abs(delta_raw) > 1e-12, delta_proba / safe_delta, proba * (1 - proba))
+    return raw_values * scale[:, None]
+
+
+class ModelExplainers:
+    """
+    Tek model için tam ve yaklaşık SHAP açıklayıcıları
+
+    Tam yöntem: LightGBM bileşeni için background'a göre TreeSHAP (ensemble/PCA için
+    kapalı formlu DecomposedEnsembleExplainer). Yaklaşık yöntem: LightGBM bileşeni için
+    Saabas (ağaç yolu boyunca katkılar, O(ağaç derinliği)), log-odds'tan olasılık uzayına
+    toplamı koruyarak ölçeklenir; PCA bileşeni zaten ucuz olduğundan kesin kalır.
+    Her iki yöntemde de expected_value + satır toplamı = model olasılığı.
+    """
+
+    def __init__(self, model, model_type: str, model_path: str, background_size: int = 100):
+        self.model = model
+        self.model_type = model_type
+        self.model_path = model_path
+        self.feature_names = _model_feature_names(model)
+
+        background, weights = self._load_background(model_path, background_size)
+        self.background_rows = len(background)
+
+        self.decomposed = None
+        self.exact_tree = None
+        if model_type in ('ensemble', 'pca'):
+            self.decomposed = DecomposedEnsembleExplainer(
+                model, background, self.feature_names, model_type=model_type, background_weights=weights
+            )
+            self.lightgbm_model = self.decomposed.lightgbm_model
+            self.lightgbm_weight = self.decomposed.lightgbm_weight
+            self.tree_expected_value = self.decomposed.tree_expected_value
+            self.expected_value = self.decomposed.expected_value
+        else:
+            self.lightgbm_model = model
+            self.lightgbm_weight = 1.0
+            background_df = pd.DataFrame(expand_weighted_rows(background, weights), columns=self.feature_names)
+            try:
+                self.exact_tree = shap.TreeExplainer(
+                    model, data=background_df,
+                    model_output='probability', feature_perturbation='interventional'
+                )
+                self.tree_expected_value = DecomposedEnsembleExplainer._positive_class(
+                    self.exact_tree.expected_value
+                )
+            except Exception as e:
+                print(f"⚠️ Olasılık çıktılı TreeSHAP kurulamadı ({e}), log-odds TreeSHAP kullanılacak")
+                self.tree_expected_value = float(np.mean(model.predict_proba(background_df)[:, 1]))
+            self.expected_value = self.tree_expected_value
+
+        # Yaklaşık yöntem için background'suz (path dependent) TreeExplainer
+        self.raw_tree = shap.TreeExplainer(self.lightgbm_model) if self.lightgbm_model is not None else None
+
+    def _load_background(self, model_path: str, background_size: int):
+        """Model yanındaki background özetini yükle (yoksa sıfır merkezli sentetik veri)"""
+        summary_path = f"{model_path}.background.json"
+        if os.path.exists(summary_path):
+            with open(summary_path, 'r', encoding='utf-8') as f:
+                summary = json.load(f)
+            columns = {name: i for i, name in enumerate(summary['feature_names'])}
+            for alias, source in (('DayOfWeek', 'DayFeature'), ('HourOfDay', 'HourFeature')):
+                if alias not in columns and source in columns:
+                    columns[alias] = columns[source]
+
+            data = np.asarray(summary['data'], dtype=float)
+            background = np.zeros((len(data), len(self.feature_names)))
+            for i, name in enumerate(self.feature_names):
+                if name in columns:
+                    background[:, i] = data[:, columns[name]]
+            weights = np.asarray(summary['weights'], dtype=float)
+
+            # En ağır satırları tut (interaktif istekler için küçük background)
+            if len(background) > background_size:
+                keep = np.argsort(-weights, kind='stable')[:background_size]
+                background, weights = background[keep], weights[keep]
+            return background, weights
+
+        print(f"⚠️ Background özeti bulunamadı ({os.path.basename(summary_path)}), sentetik veri kullanılıyor")
+        rng = np.random.RandomState(42)
+        background = rng.normal(0, 1, (background_size, len(self.feature_names)))
+        return background, np.ones(background_size)
+
+    def _tree_values(self, X: np.ndarray, approximate: bool) -> np.ndarray:
+        """LightGBM bileşeninin olasılık uzayındaki katkıları"""
+        X_df = pd.DataFrame(X, columns=self.feature_names)
+        if not approximate and self.exact_tree is not None:
+            return _positive_class_values(self.exact_tree.shap_values(X_df))
+
+        raw = _positive_class_values(self.raw_tree.shap_values(X_df, approximate=approximate))
+        proba = self.lightgbm_model.predict_proba(X_df)[:, 1]
+        return _rescale_to_probability(raw, proba, self.tree_expected_value)
+
+    def exact(self, X: np.ndarray) -> np.ndarray:
+        """Tam SHAP değerleri (TreeSHAP)"""
+        if self.decomposed is not None:
+            return self.decomposed.shap_values(X)
+        return self._tree_values(X, approximate=False)
+
+    def approximate(self, X: np.ndarray) -> np.ndarray:
+        """Ucuz yaklaşık SHAP değerleri (Saabas)"""
+        values = np.zeros_like(X, dtype=float)
+        if self.decomposed is not None:
+            pca_values, _ = self.decomposed._pca_shap_values(X)
+            values += self.decomposed.pca_weight * pca_values
+        if self.raw_tree is not None:
+            values += self.lightgbm_weight * self._tree_values(X, approximate=True)
+        return values
+
+
+class ShapExplainerPool:
+    """
+    Aktif modeller için önceden yüklenmiş SHAP açıklayıcıları ve worker pool
+
+    Her istek bir zaman bütçesiyle gelir. Tam TreeSHAP worker pool'da çalıştırılır ve
+    bütçe kadar beklenir; süre dolarsa veya modelin tam yöntem gecikme tahmini (EWMA)
+    bütçeyi zaten aşıyorsa yaklaşık yönteme düşülür. Tahmin bütçeyi aştığı için atlanan
+    her istekte azaltılır, böylece yük düştüğünde tam yöntem tekrar denenir.
+    """
+
+    def __init__(self, models_path: str = 'models', model_types=MODEL_TYPES, max_workers: int = 4,
+                 default_budget_ms: float = 300, background_size: int = 100):
+        """
+        Args:
+            models_path: Model dosyalarının dizini
+            model_types: Başlangıçta yüklenecek model tipleri
+            max_workers: Tam SHAP hesaplayan worker sayısı
+            default_budget_ms: İstek başına varsayılan zaman bütçesi (ms)
+            background_size: Model başına background satır sayısı
+        """
+        self.models_path = models_path
+        self.model_types = tuple(model_types)
+        self.default_budget_ms = default_budget_ms
+        self.background_size = background_size
+
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='shap')
+        self.explainers = {}
+        self.latency_ms = {}
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'exact': 0, 'approximate': 0, 'timeouts': 0, 'skipped': 0}
+
+    def preload(self) -> Dict[str, bool]:
+        """Aktif (en son eğitilmiş) modelleri ve açıklayıcılarını yükle"""
+        if not SHAP_AVAILABLE:
+            print("⚠️ SHAP bulunamadı, açıklayıcı havuzu devre dışı")
+            return {model_type: False for model_type in self.model_types}
+
+        model_index = ModelIndex(self.models_path)
+        loaded = {}
+        for model_type in self.model_types:
+            model_path = model_index.find(f"{model_type}_model")
+            if model_path is None:
+                loaded[model_type] = False
+                continue
+            try:
+                start = time.time()
+                explainers = ModelExplainers(joblib.load(model_path), model_type, model_path,
+                                             background_size=self.background_size)
+                with self.lock:
+                    self.explainers[model_type] = explainers
+                    self.latency_ms.pop(model_type, None)
+                loaded[model_type] = True
+                print(f"✅ SHAP açıklayıcı hazır: {model_type} ({os.path.basename(model_path)}, "
+                      f"{time.time() - start:.2f}s)")
+            except Exception as e:
+                loaded[model_type] = False
+                print(f"❌ SHAP açıklayıcı yüklenemedi ({model_type}): {e}")
+        return loaded
+
+    def resolve_model(self, model_name: Optional[str]) -> Optional[str]:
+        """İstekteki model adını yüklü model tipine eşle (default: ensemble öncelikli)"""
+        name = (model_name or 'default').lower()
+        if name in self.explainers:
+            return name
+        for model_type in self.explainers:
+            if model_type in name:
+                return model_type
+        if name == 'default':
+            for model_type in MODEL_TYPES:
+                if model_type in self.explainers:
+                    return model_type
+        return None
+
+    def _timed_exact(self, model_type: str, explainers: ModelExplainers, X: np.ndarray) -> np.ndarray:
+        """Tam SHAP'ı çalıştır ve gecikme tahminini güncelle (bütçe aşılsa da ölçülür)"""
+        start = time.perf_counter()
+        values = explainers.exact(X)
+        self._record_latency(model_type, (time.perf_counter() - start) * 1000)
+        return values
+
+    def _record_latency(self, model_type: str, elapsed_ms: float, alpha: float = 0.3):
+        with self.lock:
+            previous = self.latency_ms.get(model_type)
+            self.latency_ms[model_type] = elapsed_ms if previous is None else (
+                alpha * elapsed_ms + (1 - alpha) * previous
+            )
+
+    def explain(self, model_type: str, row: np.ndarray, budget_ms: Optional[float] = None) -> Dict:
+        """
+        Tek transaction'ı bütçe dahilinde açıkla
+
+        Returns:
+            values, expected_value, prediction, method, compute_time_ms ve budget_ms içeren sözlük
+        """
+        start = time.perf_counter()
+        budget_ms = float(budget_ms or self.default_budget_ms)
+        explainers = self.explainers[model_type]
+        X = np.atleast_2d(np.asarray(row, dtype=float))
+
+        with self.lock:
+            self.stats['requests'] += 1
+            estimate = self.latency_ms.get(model_type)
+            skip_exact = estimate is not None and estimate > budget_ms
+            if skip_exact:
+                self.stats['skipped'] += 1
+                self.latency_ms[model_type] = estimate * 0.9
+
+        values = None
+        if not skip_exact:
+            future = self.executor.submit(self._timed_exact, model_type, explainers, X)
+            try:
+                values = future.result(timeout=budget_ms / 1000)
+            except FutureTimeoutError:
+                # Kuyrukta bekliyorsa iptal et; çalışıyorsa bitince gecikme yine kaydedilir
+                future.cancel()
+                with self.lock:
+                    self.stats['timeouts'] += 1
+
+        method = EXACT_METHOD
+        if values is None:
+            method = APPROXIMATE_METHOD
+            values = explainers.approximate(X)
+
+        with self.lock:
+            self.stats['exact' if method == EXACT_METHOD else 'approximate'] += 1
+
+        values = values[0]
+        return {
+            'feature_names': explainers.feature_names,
+            'feature_values': X[0],
+            'values': values,
+            'expected_value': float(explainers.expected_value),
+            'prediction': float(explainers.expected_value + np.sum(values)),
+            'method': method,
+            'compute_time_ms': (time.perf_counter() - start) * 1000,
+            'budget_ms': budget_ms
+        }
+
+    def get_stats(self) -> Dict:
+        """Havuz istatistikleri ve model başına tam yöntem gecikme tahminleri"""
+        with self.lock:
+            stats = dict(self.stats)
+            stats['models'] = sorted(self.explainers)
+            stats['exact_latency_ms'] = {k: round(v, 2) for k, v in self.latency_ms.items()}
+        stats['default_budget_ms'] = self.default_budget_ms
+        return stats
+
+    def shutdown(self):
+        """Worker pool'u kapat"""
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark - CLI entry point'lerinin başlangıç ve import süreleri
+Her entry point ayrı bir Python process'inde (-X importtime ile) çalıştırılır;
+duvar saati süresi ve en pahalı üst seviye import'lar raporlanır
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+PYTHON_DIR = os.path.dirname(os.path.abspath(__file__))
+SHAPLIME_DIR = os.path.join(PYTHON_DIR, 'ShapLıme')
+ANALIZ_DIR = os.path.join(PYTHON_DIR, 'Analiz')
+
+# (ad, çalışma dizini, argümanlar) - hafif komutlar ve .NET servisinin başlattığı script'ler
+ENTRY_POINTS = [
+    ('fraud_detection_models --help', PYTHON_DIR, ['fraud_detection_models.py', '--help']),
+    ('advanced_ml_models --help', PYTHON_DIR, ['advanced_ml_models.py', '--help']),
+    ('fraud_prediction --help', PYTHON_DIR, ['fraud_prediction.py', '--help']),
+    ('fraud_explainer_cli --help', SHAPLIME_DIR, ['fraud_explainer_cli.py', '--help']),
+    ('fraud_explainer_cli api-test --help', SHAPLIME_DIR, ['fraud_explainer_cli.py', 'api-test', '--help']),
+    ('import python_api_explainer', SHAPLIME_DIR, ['-c', 'import python_api_explainer']),
+    ('import batch_processor', ANALIZ_DIR, ['-c', 'import batch_processor']),
+]
+
+# Varsayılan başlangıç süresi sınırı (saniye)
+DEFAULT_THRESHOLD = 1.0
+
+
+def parse_importtime(stderr: str, top: int = 5) -> List[Dict]:
+    """
+    -X importtime çıktısından en pahalı üst seviye import'ları çıkar
+
+    Satır formatı: 'import time: self [us] | cumulative | imported package';
+    paket adının başında boşluk olmayan satırlar üst seviye import'lardır.
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        try:
+            _, cumulative, name = line[len('import time:'):].split('|', 2)
+        except ValueError:
+            continue
+        if name.startswith('  '):
+            continue
+        imports.append({'module': name.strip(), 'cumulative_ms': int(cumulative) / 1000})
+
+    imports.sort(key=lambda item: item['cumulative_ms'], reverse=True)
+    return imports[:top]
+
+
+def benchmark_entry_point(name: str, cwd: str, argv: List[str], repeat: int = 3) -> Dict:
+    """Entry point'i repeat kez çalıştır, medyan süre ve son çalıştırmanın import profili"""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = subprocess.run([sys.executable, '-X', 'importtime'] + argv, cwd=cwd,
+                                capture_output=True, text=True)
+        timings.append(time.perf_counter() - started)
+
+    return {
+        'name': name,
+        'returncode': result.returncode,
+        'median_seconds': statistics.median(timings),
+        'min_seconds': min(timings),
+        'top_imports': parse_importtime(result.stderr)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CLI entry point başlangıç süresi ölçümü')
+    parser.add_argument('--repeat', type=int, default=3, help='Entry point başına çalıştırma sayısı')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Uyarı verilecek başlangıç süresi (saniye, varsayılan: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--only', type=str, default=None, help='Sadece adında bu metin geçen entry point\'ler')
+    parser.add_argument('--output', type=str, default=None, help='Sonuçların yazılacağı JSON dosyası')
+    parser.add_argument('--check', action='store_true', help='Sınırı aşan entry point varsa çıkış kodu 1')
+
+    args = parser.parse_args()
+
+    results = []
+    for name, cwd, argv in ENTRY_POINTS:
+        if args.only and args.only not in name:
+            continue
+
+        result = benchmark_entry_point(name, cwd, argv, args.repeat)
+        result['over_threshold'] = result['median_seconds'] > args.threshold
+        results.append(result)
+
+        status = '⚠️ ' if result['over_threshold'] else '✅'
+        if result['returncode'] != 0:
+            status = '❌'
+        print(f"{status} {name}: {result['median_seconds']:.3f}s (min {result['min_seconds']:.3f}s)")
+        for item in result['top_imports']:
+            print(f"     {item['cumulative_ms']:8.1f} ms  {item['module']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'threshold_seconds': args.threshold, 'results': results}, f, indent=2, ensure_ascii=False)
+        print(f"📄 Sonuçlar kaydedildi: {args.output}")
+
+    slow = [r['name'] for r in results if r['over_threshold']]
+    if slow:
+        print(f"⚠️  {args.threshold}s sınırını aşan entry point'ler: {', '.join(slow)}")
+    if args.check and (slow or any(r['returncode'] != 0 for r in results)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
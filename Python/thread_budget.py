@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Thread Budget - Process genelinde thread bütçesi
+LightGBM (OpenMP), NumPy/scikit-learn (BLAS), PyTorch ve executor worker'ları
+toplamda aynı thread bütçesini paylaşır; paralel çalışan worker'lar bütçeyi böler
+"""
+
+import os
+import sys
+from typing import Dict, Optional
+
+try:
+    from threadpoolctl import threadpool_limits
+    THREADPOOLCTL_AVAILABLE = True
+except ImportError:
+    THREADPOOLCTL_AVAILABLE = False
+
+# Toplam thread bütçesi (yoksa CPU sayısı); child process'ler kendi payını bu değişkenden okur
+BUDGET_ENV = 'FRAUDSHIELD_THREAD_BUDGET'
+
+# Native kütüphanelerin ilk yüklemede okuduğu thread değişkenleri
+NATIVE_THREAD_ENVS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS',
+                      'NUMEXPR_NUM_THREADS', 'VECLIB_MAXIMUM_THREADS')
+
+# Backend'e gönderilen LightGBM konfigürasyonundaki thread alanı
+LIGHTGBM_THREADS_KEY = 'numThreads'
+
+# threadpool_limits sonucu (referans tutulmazsa limitler geri alınabilir)
+_active_limits = None
+
+
+class ThreadBudget:
+    """
+    Bir process'in (veya worker'ın) kullanabileceği thread sayısı
+
+    Bir scriptte LightGBM, BLAS ve PyTorch sırayla çalıştığından her biri process
+    payının tamamını alır; aynı anda çalışan N worker için split(N) kullanılır.
+    """
+
+    def __init__(self, total: Optional[int] = None):
+        """
+        Args:
+            total: Toplam thread sayısı (None ise FRAUDSHIELD_THREAD_BUDGET veya CPU sayısı)
+        """
+        if total is None:
+            total = os.environ.get(BUDGET_ENV) or os.cpu_count() or 1
+        self.total = max(1, int(total))
+
+    def split(self, workers: int) -> 'ThreadBudget':
+        """Aynı anda çalışan workers worker'ın her birine düşen bütçe (en az 1)"""
+        return ThreadBudget(max(1, self.total // max(1, workers)))
+
+    def allocation(self) -> Dict[str, int]:
+        """Kütüphane başına thread sayıları"""
+        return {
+            'total': self.total,
+            'lightgbm': self.total,
+            'blas': self.total,
+            'torch': self.total,
+            'torch_interop': 1
+        }
+
+    def __repr__(self):
+        return f"ThreadBudget(total={self.total})"
+
+
+def get_thread_budget() -> ThreadBudget:
+    """Ortam değişkeninden (yoksa CPU sayısından) process bütçesi"""
+    return ThreadBudget()
+
+
+def apply_thread_budget(budget: Optional[ThreadBudget] = None) -> ThreadBudget:
+    """
+    Bütçeyi process'e uygula
+
+    Ortam değişkenleri (child process'ler ve henüz yüklenmemiş native kütüphaneler için),
+    threadpoolctl ile yüklenmiş BLAS/OpenMP havuzları ve import edilmişse PyTorch
+    intra/inter-op thread sayıları ayarlanır. Entry point'lerde bir kez çağrılır.
+
+    Returns:
+        Uygulanan bütçe
+    """
+    global _active_limits
+    budget = budget or get_thread_budget()
+    allocation = budget.allocation()
+
+    os.environ[BUDGET_ENV] = str(budget.total)
+    for name in NATIVE_THREAD_ENVS:
+        os.environ[name] = str(allocation['blas'])
+
+    if THREADPOOLCTL_AVAILABLE:
+        _active_limits = threadpool_limits(limits=allocation['blas'])
+
+    torch = sys.modules.get('torch')
+    if torch is not None:
+        torch.set_num_threads(allocation['torch'])
+        try:
+            torch.set_num_interop_threads(allocation['torch_interop'])
+        except RuntimeError:
+            # Inter-op havuzu ilk paralel işten sonra değiştirilemez
+            pass
+
+    return budget
+
+
+def with_lightgbm_threads(model_type: str, config: Dict, threads: int) -> Dict:
+    """
+    Eğitim konfigürasyonunun LightGBM thread sayısı eklenmiş kopyası
+
+    Konfigürasyonda zaten bir değer varsa korunur. Ensemble'da alan iç içe
+    lightgbm bölümüne yazılır; PCA konfigürasyonu değişmez.
+    """
+    if model_type == 'lightgbm':
+        if LIGHTGBM_THREADS_KEY in config:
+            return config
+        return {**config, LIGHTGBM_THREADS_KEY: threads}
+
+    if model_type == 'ensemble':
+        lightgbm_config = config.get('lightgbm', {})
+        if LIGHTGBM_THREADS_KEY in lightgbm_config:
+            return config
+        return {**config, 'lightgbm': {**lightgbm_config, LIGHTGBM_THREADS_KEY: threads}}
+
+    return config
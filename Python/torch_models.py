@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Torch Models - Attention/AutoEncoder modelleri ve PyTorch eğitim yardımcıları
+advanced_ml_models.py bu modülü yalnızca PyTorch gerektiren yollarda import eder
+"""
+
+import math
+import time
+
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.optim as optim
+from torch.utils.data import DataLoader, TensorDataset, IterableDataset, Subset, get_worker_info
+
+
+class AttentionFraudDetector(nn.Module):
+    """Transformer-based Attention Model for Fraud Detection"""
+
+    def __init__(self, input_dim=30, hidden_dim=128, num_heads=8, num_layers=4, dropout=0.1):
+        super(AttentionFraudDetector, self).__init__()
+
+        # Input projection
+        self.input_proj = nn.Linear(input_dim, hidden_dim)
+        self.pos_encoding = PositionalEncoding(hidden_dim, dropout)
+
+        # Multi-head attention layers
+        encoder_layer = nn.TransformerEncoderLayer(
+            d_model=hidden_dim,
+            nhead=num_heads,
+            dim_feedforward=hidden_dim * 4,
+            dropout=dropout,
+            activation='relu'
+        )
+        self.transformer_encoder = nn.TransformerEncoder(encoder_layer, num_layers)
+
+        # Classification head
+        self.classifier = nn.Sequential(
+            nn.Linear(hidden_dim, hidden_dim // 2),
+            nn.ReLU(),
+            nn.Dropout(dropout),
+            nn.Linear(hidden_dim // 2, 2)
+        )
+
+    def forward(self, x):
+        batch_size = x.size(0)
+
+        # Project input
+        x = self.input_proj(x)
+        x = self.pos_encoding(x)
+
+        # Transpose for transformer
+        x = x.transpose(0, 1)
+
+        # Transformer encoding
+        encoded = self.transformer_encoder(x)
+
+        # Global pooling
+        pooled = encoded.mean(dim=0)
+
+        # Classification
+        logits = self.classifier(pooled)
+
+        return logits
+
+
+class PositionalEncoding(nn.Module):
+    def __init__(self, d_model, dropout=0.1, max_len=5000):
+        super(PositionalEncoding, self).__init__()
+        self.dropout = nn.Dropout(p=dropout)
+
+        pe = torch.zeros(max_len, d_model)
+        position = torch.arange(0, max_len, dtype=torch.float).unsqueeze(1)
+        div_term = torch.exp(torch.arange(0, d_model, 2).float() * (-math.log(10000.0) / d_model))
+        pe[:, 0::2] = torch.sin(position * div_term)
+        pe[:, 1::2] = torch.cos(position * div_term)
+        pe = pe.unsqueeze(0).transpose(0, 1)
+        self.register_buffer('pe', pe)
+
+    def forward(self, x):
+        x = x + self.pe[:x.size(0), :]
+        return self.dropout(x)
+
+
+class AutoEncoderAnomalyDetector(nn.Module):
+    """Deep AutoEncoder for Anomaly Detection"""
+
+    def __init__(self, input_dim=30, hidden_dims=[64, 32, 16], dropout=0.2):
+        super(AutoEncoderAnomalyDetector, self).__init__()
+
+        # Encoder
+        encoder_layers = []
+        prev_dim = input_dim
+        for hidden_dim in hidden_dims:
+            encoder_layers.extend([
+                nn.Linear(prev_dim, hidden_dim),
+                nn.ReLU(),
+                nn.Dropout(dropout),
+                nn.BatchNorm1d(hidden_dim)
+            ])
+            prev_dim = hidden_dim
+        self.encoder = nn.Sequential(*encoder_layers)
+
+        # Decoder
+        decoder_layers = []
+        hidden_dims_reversed = list(reversed(hidden_dims[:-1])) + [input_dim]
+        for hidden_dim in hidden_dims_reversed:
+            decoder_layers.extend([
+                nn.Linear(prev_dim, hidden_dim),
+                nn.ReLU() if hidden_dim != input_dim else nn.Sigmoid(),
+                nn.Dropout(dropout) if hidden_dim != input_dim else nn.Identity()
+            ])
+            prev_dim = hidden_dim
+        self.decoder = nn.Sequential(*decoder_layers)
+
+    def forward(self, x):
+        encoded = self.encoder(x)
+        decoded = self.decoder(encoded)
+        return decoded, encoded
+
+
+class AttentionScoringModule(nn.Module):
+    """Export için sarmalayıcı: (n, d) float32 girdi -> fraud olasılığı (n,)"""
+
+    def __init__(self, model):
+        super(AttentionScoringModule, self).__init__()
+        self.model = model
+
+    def forward(self, x):
+        logits = self.model(x.unsqueeze(1))
+        return torch.softmax(logits, dim=1)[:, 1]
+
+
+class AutoEncoderScoringModule(nn.Module):
+    """Export için sarmalayıcı: scaler + rekonstrüksiyon hatası + eşik tek grafikte"""
+
+    def __init__(self, model, scaler, threshold):
+        super(AutoEncoderScoringModule, self).__init__()
+        self.model = model
+        self.register_buffer('mean', torch.tensor(scaler.mean_, dtype=torch.float32))
+        self.register_buffer('inv_scale', torch.tensor(1.0 / scaler.scale_, dtype=torch.float32))
+        self.threshold = float(threshold) + 1e-8
+
+    def reconstruction_error(self, x):
+        """Ham girdi için satır başına rekonstrüksiyon hatası (advanced_ensemble üye skoru)"""
+        x = (x - self.mean) * self.inv_scale
+        reconstructed, _ = self.model(x)
+        return torch.mean((x - reconstructed) ** 2, dim=1)
+
+    def forward(self, x):
+        # Eğitimdeki anomaly_proba ile aynı: 1 / (1 + exp(-error / threshold + 2))
+        return torch.sigmoid(self.reconstruction_error(x) / self.threshold - 2)
+
+
+class MemmapFeatureDataset(IterableDataset):
+    """
+    Bellek eşlemeli (np.memmap) feature dosyası üzerinde akışlı eğitim dataset'i
+
+    Veri RAM'e alınmaz; her adımda bir blok okunur, float32'ye çevrilir (gerekirse
+    standartlaştırılır), blok içinde karıştırılıp hazır batch'ler halinde verilir.
+    Blok sırası her epoch'ta karıştırılır; DataLoader worker'ları blokları paylaşır.
+    """
+
+    def __init__(self, X, y=None, batch_size=64, block_size=65536, shuffle=True,
+                 mean=None, scale=None, seed=42):
+        self.X = X
+        self.y = y
+        self.batch_size = batch_size
+        self.block_size = max(block_size, batch_size)
+        self.shuffle = shuffle
+        self.mean = None if mean is None else np.asarray(mean, dtype=np.float32)
+        self.inv_scale = None if scale is None else (1.0 / np.asarray(scale)).astype(np.float32)
+        self.seed = seed
+        self.epoch = 0
+
+    def __len__(self):
+        return math.ceil(len(self.X) / self.batch_size)
+
+    def __iter__(self):
+        rng = np.random.RandomState(self.seed + self.epoch)
+        self.epoch += 1
+
+        blocks = np.arange(0, len(self.X), self.block_size)
+        if self.shuffle:
+            rng.shuffle(blocks)
+
+        worker = get_worker_info()
+        if worker is not None:
+            blocks = blocks[worker.id::worker.num_workers]
+
+        for start in blocks:
+            X_block = np.asarray(self.X[start:start + self.block_size], dtype=np.float32)
+            if self.mean is not None:
+                X_block = (X_block - self.mean) * self.inv_scale
+            y_block = None if self.y is None else np.asarray(self.y[start:start + self.block_size])
+
+            if self.shuffle:
+                order = rng.permutation(len(X_block))
+                X_block = X_block[order]
+                y_block = None if y_block is None else y_block[order]
+
+            X_tensor = torch.from_numpy(np.ascontiguousarray(X_block))
+            y_tensor = None if y_block is None else torch.from_numpy(y_block.astype(np.int64))
+
+            for i in range(0, len(X_tensor), self.batch_size):
+                if y_tensor is None:
+                    yield (X_tensor[i:i + self.batch_size],)
+                else:
+                    yield X_tensor[i:i + self.batch_size], y_tensor[i:i + self.batch_size]
+
+
+def make_loaders(X, y, batch_size, device, validation_split=0.1, mean=None, scale=None, seed=42):
+    """
+    Eğitim ve validasyon DataLoader'ları - veri kopyalanmadan beslenir
+
+    Bellekteki float32 diziler torch.from_numpy ile (kopyasız) TensorDataset'e sarılır ve
+    rastgele indekslerle (Subset) bölünür. np.memmap girdiler sondaki satırlar validasyon
+    olacak şekilde dilimlenir ve MemmapFeatureDataset ile diskten akıtılır. Veri CPU'da
+    kalır, batch'ler döngüde cihaza taşınır.
+
+    Returns:
+        (train_loader, val_loader) - validation_split 0 ise val_loader None
+    """
+    pin_memory = device.type == 'cuda'
+    n_val = int(len(X) * validation_split)
+
+    if isinstance(X, np.memmap):
+        n_train = len(X) - n_val
+        y_train, y_val = (None, None) if y is None else (y[:n_train], y[n_train:])
+        train_loader = DataLoader(
+            MemmapFeatureDataset(X[:n_train], y_train, batch_size=batch_size, mean=mean, scale=scale, seed=seed),
+            batch_size=None, pin_memory=pin_memory
+        )
+        val_loader = DataLoader(
+            MemmapFeatureDataset(X[n_train:], y_val, batch_size=batch_size, shuffle=False, mean=mean, scale=scale),
+            batch_size=None, pin_memory=pin_memory
+        ) if n_val else None
+        return train_loader, val_loader
+
+    tensors = [torch.from_numpy(X)]
+    if y is not None:
+        tensors.append(torch.from_numpy(np.asarray(y, dtype=np.int64)))
+    dataset = TensorDataset(*tensors)
+
+    if not n_val:
+        return DataLoader(dataset, batch_size=batch_size, shuffle=True, pin_memory=pin_memory), None
+
+    order = np.random.RandomState(seed).permutation(len(X))
+    train_loader = DataLoader(Subset(dataset, order[n_val:].tolist()), batch_size=batch_size,
+                              shuffle=True, pin_memory=pin_memory)
+    val_loader = DataLoader(Subset(dataset, order[:n_val].tolist()), batch_size=batch_size,
+                            shuffle=False, pin_memory=pin_memory)
+    return train_loader, val_loader
+
+
+def make_lr_scheduler(optimizer, model_config, epochs):
+    """Konfigürasyondaki LR scheduler (plateau, cosine veya none)"""
+    scheduler_type = model_config.get('lr_scheduler', 'plateau')
+    if scheduler_type == 'plateau':
+        return optim.lr_scheduler.ReduceLROnPlateau(
+            optimizer, mode='min',
+            factor=model_config.get('lr_factor', 0.5),
+            patience=model_config.get('lr_patience', 1)
+        )
+    if scheduler_type == 'cosine':
+        return optim.lr_scheduler.CosineAnnealingLR(optimizer, T_max=max(epochs, 1))
+    if scheduler_type == 'none':
+        return None
+    raise ValueError(f"Desteklenmeyen LR scheduler: {scheduler_type}")
+
+
+def fit_with_early_stopping(model, batch_loss, optimizer, train_loader, val_loader, model_config,
+                            epochs, checkpoint_path=None):
+    """
+    Attention / AutoEncoder için ortak eğitim döngüsü
+
+    Her epoch sonunda validasyon kaybı (validasyon yoksa eğitim kaybı) ölçülür, LR
+    scheduler güncellenir ve en iyi ağırlıklar saklanır (checkpoint_path verilirse diske de).
+    Kayıp patience epoch boyunca min_delta'dan fazla iyileşmezse eğitim durur ve en iyi
+    ağırlıklar geri yüklenir. Batch hataları yutulmaz.
+
+    Args:
+        model: Eğitilecek model
+        batch_loss: batch -> skaler kayıp tensörü
+        optimizer: Optimizer
+        train_loader / val_loader: DataLoader'lar (val_loader None olabilir)
+        model_config: patience, min_delta, lr_scheduler, lr_factor, lr_patience ayarları
+        epochs: Maksimum epoch sayısı
+        checkpoint_path: En iyi ağırlıkların yazılacağı dosya
+
+    Returns:
+        model_info'ya yazılacak eğitim özeti (epoch geçmişi ve süreleri dahil)
+    """
+    patience = model_config.get('patience', 3)
+    min_delta = model_config.get('min_delta', 1e-4)
+    scheduler = make_lr_scheduler(optimizer, model_config, epochs)
+
+    def run_epoch(loader, train):
+        model.train(train)
+        total_loss, total_rows = 0.0, 0
+        with torch.set_grad_enabled(train):
+            for batch in loader:
+                loss = batch_loss(batch)
+                if train:
+                    optimizer.zero_grad()
+                    loss.backward()
+                    optimizer.step()
+                rows = len(batch[0])
+                total_loss += loss.item() * rows
+                total_rows += rows
+        return total_loss / max(total_rows, 1)
+
+    best_loss, best_epoch, best_state = float('inf'), -1, None
+    bad_epochs = 0
+    history = []
+    started = time.time()
+
+    for epoch in range(epochs):
+        epoch_start = time.time()
+        train_loss = run_epoch(train_loader, train=True)
+        val_loss = run_epoch(val_loader, train=False) if val_loader is not None else train_loss
+
+        if isinstance(scheduler, optim.lr_scheduler.ReduceLROnPlateau):
+            scheduler.step(val_loss)
+        elif scheduler is not None:
+            scheduler.step()
+
+        history.append({
+            'epoch': epoch,
+            'train_loss': train_loss,
+            'val_loss': val_loss,
+            'learning_rate': optimizer.param_groups[0]['lr'],
+            'seconds': time.time() - epoch_start
+        })
+        print(f"Epoch {epoch + 1}/{epochs} - train: {train_loss:.6f}, val: {val_loss:.6f}, "
+              f"lr: {optimizer.param_groups[0]['lr']:.2e} ({history[-1]['seconds']:.1f}s)")
+
+        if val_loss < best_loss - min_delta:
+            best_loss, best_epoch, bad_epochs = val_loss, epoch, 0
+            best_state = {key: value.detach().cpu().clone() for key, value in model.state_dict().items()}
+            if checkpoint_path:
+                torch.save(best_state, checkpoint_path)
+        else:
+            bad_epochs += 1
+            if bad_epochs >= patience:
+                print(f"⏹️  Early stopping: {patience} epoch iyileşme yok (en iyi epoch {best_epoch + 1})")
+                break
+
+    if best_state is not None:
+        model.load_state_dict(best_state)
+
+    return {
+        'epochs_run': len(history),
+        'max_epochs': epochs,
+        'stopped_early': len(history) < epochs,
+        'best_epoch': best_epoch,
+        'best_val_loss': best_loss,
+        'validation': val_loader is not None,
+        'total_seconds': time.time() - started,
+        'checkpoint_path': checkpoint_path,
+        'history': history
+    }
+
+
+def build_scoring_module(model_result, model_type):
+    """
+    Eğitilmiş modeli (n, d) float32 girdi -> fraud olasılığı üreten CPU modülüne sar
+
+    Returns:
+        (modül, karar eşiği)
+    """
+    model = model_result['model'].to('cpu').eval()
+
+    if model_type == 'attention':
+        module = AttentionScoringModule(model)
+        decision_threshold = 0.5
+    else:
+        module = AutoEncoderScoringModule(model, model_result['scaler'], model_result['threshold'])
+        # error > threshold  <=>  sigmoid(error / threshold - 2) > sigmoid(-1)
+        decision_threshold = float(1 / (1 + math.exp(1)))
+
+    return module.eval(), decision_threshold
+
+
+def trace_scoring_module(module, input_dim, export_path, example_batch=64):
+    """
+    Skorlama modülünü sabit float32 (n, d) girdiyle trace edip kaydet
+
+    Returns:
+        Export edilen grafik ile eager modül arasındaki maksimum mutlak fark
+    """
+    example = torch.randn(example_batch, input_dim, dtype=torch.float32)
+    with torch.no_grad():
+        traced = torch.jit.trace(module, example, check_inputs=[(torch.randn(3, input_dim),)])
+        try:
+            traced = torch.jit.freeze(traced)
+            if hasattr(torch.jit, 'optimize_for_inference'):
+                traced = torch.jit.optimize_for_inference(traced)
+        except Exception as e:
+            print(f"⚠️  TorchScript freeze/optimize atlandı: {e}")
+
+        # Export edilen grafiğin eager modülle tutarlılığı
+        check = torch.randn(example_batch, input_dim, dtype=torch.float32)
+        max_abs_diff = float(torch.max(torch.abs(traced(check) - module(check))))
+
+    traced.save(export_path)
+    return max_abs_diff
+
+
+def score_module(module, X, batch_size=4096):
+    """Skorlama modülüyle batch'li CPU çıkarımı (fraud olasılıkları)"""
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    outputs = []
+    with torch.inference_mode():
+        for start in range(0, len(X), batch_size):
+            outputs.append(module(torch.from_numpy(X[start:start + batch_size])).numpy())
+    return np.concatenate(outputs)
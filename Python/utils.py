@@ -2,7 +2,6 @@ import os
 import json
 import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
 
 
 def load_data(csv_path):
@@ -51,6 +50,8 @@ def load_data(csv_path):
     y = df['Class']
 
     # Verileri böl
+    from sklearn.model_selection import train_test_split
+
     X_train, X_test, y_train, y_test = train_test_split(
         X, y, test_size=0.2, random_state=42, stratify=y)
 
@@ -84,6 +85,89 @@ def load_config(config_path):
     print(f"Konfigürasyon yüklendi: {list(config.keys())}")
     return config
 
+
+def summarize_background(X, y=None, n_samples=100, method='kmeans', random_state=42):
+    """
+    SHAP/LIME için gerçek eğitim verisinden ağırlıklı, kompakt background özeti çıkar
+
+    Args:
+        X: Eğitim feature'ları (DataFrame)
+        y: Etiketler (stratified yöntem için)
+        n_samples: Özet satır sayısı
+        method: kmeans (ağırlıklı merkezler) veya stratified (sınıf oranlı örnek)
+        random_state: Tekrarlanabilirlik için seed
+
+    Returns:
+        feature_names, data ve weights (toplamı 1) içeren sözlük
+    """
+    print(f"Background özeti çıkarılıyor: {method}, {n_samples} satır")
+
+    values = X.values.astype(float)
+    n_samples = min(n_samples, len(values))
+
+    if method == 'kmeans':
+        from sklearn.cluster import MiniBatchKMeans
+        from sklearn.preprocessing import StandardScaler
+
+        # Time/Amount gibi büyük ölçekli feature'lar kümelemeyi domine etmesin
+        scaler = StandardScaler()
+        kmeans = MiniBatchKMeans(n_clusters=n_samples, random_state=random_state, n_init=3)
+        labels = kmeans.fit_predict(scaler.fit_transform(values))
+        data = scaler.inverse_transform(kmeans.cluster_centers_)
+        weights = np.bincount(labels, minlength=n_samples).astype(float)
+
+        # Boş kalan merkezleri at
+        keep = weights > 0
+        data, weights = data[keep], weights[keep]
+
+    elif method == 'stratified':
+        if y is None:
+            raise ValueError("Stratified background için etiketler (y) gerekli")
+
+        rng = np.random.RandomState(random_state)
+        labels = np.asarray(y)
+        classes, counts = np.unique(labels, return_counts=True)
+
+        # Her sınıftan en az bir satır, kalanı sınıf oranında
+        per_class = np.maximum(1, np.round(n_samples * counts / counts.sum()).astype(int))
+        rows, weights = [], []
+        for cls, count, take in zip(classes, counts, per_class):
+            indices = np.flatnonzero(labels == cls)
+            take = min(take, count)
+            rows.extend(rng.choice(indices, take, replace=False))
+            weights.extend([count / take] * take)
+
+        data = values[rows]
+        weights = np.asarray(weights, dtype=float)
+
+    else:
+        raise ValueError(f"Desteklenmeyen background yöntemi: {method}")
+
+    return {
+        'method': method,
+        'source_rows': int(len(values)),
+        'feature_names': list(X.columns),
+        'data': data.tolist(),
+        'weights': (weights / weights.sum()).tolist()
+    }
+
+
+def save_background_summary(summary, model_path):
+    """
+    Background özetini model dosyasının yanına kaydet (<model>.background.json)
+
+    Returns:
+        Kaydedilen dosyanın yolu
+    """
+    background_path = f"{model_path}.background.json"
+
+    with open(background_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f)
+
+    print(f"Background özeti kaydedildi: {background_path} ({len(summary['data'])} satır)")
+    return background_path
+
+
 def prepare_features_for_training(df, model_type='lightgbm'):
     """
     Training için feature preparation - prediction ile uyumlu
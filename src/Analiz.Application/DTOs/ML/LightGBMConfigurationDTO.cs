@@ -39,6 +39,12 @@ public class LightGBMConfigurationDTO
         { "1", 75.0 }
     };
 
+    /// <summary>
+    /// Eğitimde kullanılacak thread sayısı (null ise Python tarafındaki thread bütçesi)
+    /// </summary>
+    [JsonPropertyName("numThreads")]
+    public int? NumThreads { get; set; }
+
     [JsonPropertyName("predictionThreshold")]
     public double PredictionThreshold { get; set; } = 0.5;
 
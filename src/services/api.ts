@@ -193,6 +193,9 @@ export interface ShapExplanation {
     totalPositiveImpact: number;
     totalNegativeImpact: number;
   };
+  method?: 'tree_shap' | 'saabas';
+  computeTimeMs?: number;
+  budgetMs?: number;
 }
 
 class FraudDetectionAPI {
@@ -292,7 +295,12 @@ class FraudDetectionAPI {
   }
 
   // SHAP Analysis (Python API)
-  async getShapExplanation(transactionId: string, modelName?: string): Promise<ShapExplanation> {
+  async getShapExplanation(
+    transactionId: string,
+    modelName?: string,
+    transaction?: Partial<Transaction> & { [feature: string]: any },
+    budgetMs?: number
+  ): Promise<ShapExplanation> {
     const pythonClient = {
       post: async (url: string, data?: any) => {
         const response = await fetch(`${PYTHON_API_URL}${url}`, {
@@ -309,7 +317,9 @@ class FraudDetectionAPI {
 
     return pythonClient.post('/analyze/shap', { 
       transactionId, 
-      modelName: modelName || 'default' 
+      modelName: modelName || 'default',
+      transaction,
+      budgetMs
     });
   }
 